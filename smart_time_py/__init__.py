@@ -2,23 +2,49 @@
 Smart Time Py - Uma biblioteca avançada para manipulação de datas e tempos em Python.
 """
 
-from smart_time_py.analysis import (TimeGroup, analyze_seasonality,
+from smart_time_py.analysis import (CountMinSketch, EWMADetector,
+                                    HeavyHitters, HyperLogLog, RollingWindow,
+                                    TimeGroup, aggregate, analyze_seasonality,
                                     calculate_temporal_stats,
-                                    detect_temporal_patterns, group_dates)
+                                    detect_temporal_patterns,
+                                    distinct_per_bucket, group_dates,
+                                    iter_timestamps, merge_distinct,
+                                    resample, rolling_counts,
+                                    rollup_distinct, sessionize,
+                                    sessionize_arrays, stream_group_counts,
+                                    stream_seasonality,
+                                    stream_temporal_patterns,
+                                    stream_temporal_stats, top_buckets)
 from smart_time_py.calendar_integration import (CalendarIntegration,
                                                 GoogleCalendarIntegration)
 from smart_time_py.converter import (add_time, calculate_difference,
                                      convert_with_timezone, datetime_to_string,
                                      string_to_datetime, subtract_time,
                                      validate_date_string)
-from smart_time_py.formatters import (format_iso, format_natural,
-                                      format_relative)
+from smart_time_py.core.converter import string_to_datetime_many
+from smart_time_py.core.epoch import from_epoch, to_epoch
+from smart_time_py.core.time_operations import (add_time_many,
+                                                calculate_difference_many,
+                                                subtract_time_many)
+from smart_time_py.core.validation import ValidationReport, validate_many
+from smart_time_py.core.parsing import (compile_format, disable_parse_cache,
+                                        enable_parse_cache,
+                                        extract_timestamps, infer_format,
+                                        parse_auto_many, parse_cache_info,
+                                        parse_format_many, parse_iso,
+                                        parse_iso_many)
+from smart_time_py.formatters import (format_iso, format_many,
+                                      format_natural, format_relative)
 from smart_time_py.holidays import (add_holiday, get_holidays,
                                     get_working_days, is_holiday,
                                     remove_holiday)
-from smart_time_py.periods import DateRange, TimePeriod
-from smart_time_py.timezone import (convert_timezone, get_available_timezones,
-                                    get_timezone_info, is_dst_active)
+from smart_time_py.periods import (DateRange, TimePeriod, find_gaps,
+                                   join_periods, utilization)
+from smart_time_py.timezone import (convert_timezone, epochs_to_datetimes,
+                                    from_local_epochs,
+                                    get_available_timezones,
+                                    get_timezone_info, is_dst_active,
+                                    to_local_epochs)
 
 __version__ = "1.3.1"
 __author__ = "Roberto Lima"
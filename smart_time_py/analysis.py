@@ -2,15 +2,51 @@
 Módulo para análise temporal de datas e identificação de padrões.
 """
 
-import statistics
-from collections import defaultdict
+import csv
+import hashlib
+import heapq
+import json
+import math
+import os
+from collections import OrderedDict, defaultdict, deque
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import Dict, List, Optional, Union
+from itertools import islice
+from typing import (IO, Dict, Hashable, Iterable, Iterator, List, Optional,
+                    Tuple, TypeVar, Union)
+
+import numpy as np
+
+from smart_time_py.core.epoch import (EPOCH, US_PER_DAY, US_PER_HOUR,
+                                      US_PER_SECOND, civil_from_days,
+                                      days_from_civil, from_epoch)
+from smart_time_py.core.parsing import iso_to_us, parse_epochs, parse_iso
+from smart_time_py.periods import TimePeriod
+from smart_time_py.timezone import epochs_to_datetimes, to_local_epochs
+
+T = TypeVar("T")
+
+DEFAULT_CHUNK_SIZE = 10_000
+DEFAULT_TOLERANCE = timedelta(seconds=60)
+
+# Tamanho máximo da série de contagens usada na detecção espectral
+_MAX_SPECTRAL_BINS = 1 << 22
+
+# Limite de pares de eventos e de iterações no refinamento dos períodos
+_MAX_REFINE_PAIRS = 1 << 22
+_REFINE_ROUNDS = 32
+
+# Divisão das somas de microssegundos em duas partes inteiras
+_SUM_SHIFT = 20
+_SUM_MASK = (1 << _SUM_SHIFT) - 1
+
+# Agregações suportadas por `aggregate` e `resample`
+_AGGREGATIONS = ("count", "sum", "mean", "min", "max", "std")
 
 
 class TimeGroup(Enum):
     """Enumeração para tipos de agrupamento temporal."""
+    HOURLY = "hourly"
     DAILY = "daily"
     WEEKLY = "weekly"
     MONTHLY = "monthly"
@@ -20,7 +56,9 @@ class TimeGroup(Enum):
 
 def _format_group_key(date: datetime, group_type: TimeGroup) -> str:
     """Formata a chave do grupo de acordo com o tipo de agrupamento."""
-    if group_type == TimeGroup.DAILY:
+    if group_type == TimeGroup.HOURLY:
+        return date.strftime("%Y-%m-%d %H:00")
+    elif group_type == TimeGroup.DAILY:
         return date.strftime("%Y-%m-%d")
     elif group_type == TimeGroup.WEEKLY:
         # Usar apenas o número da semana e o ano para agrupar
@@ -35,36 +73,150 @@ def _format_group_key(date: datetime, group_type: TimeGroup) -> str:
         return str(date.year)
 
 
+def _bucket_index(epochs, group_type: TimeGroup):
+    """
+    Calcula o índice inteiro do período de cada timestamp (microssegundos).
+
+    Índices consecutivos correspondem a períodos consecutivos, então a
+    distância entre dois períodos é uma simples subtração. Funciona com
+    inteiros e com arrays NumPy.
+    """
+    if group_type == TimeGroup.HOURLY:
+        return epochs // US_PER_HOUR
+    days = epochs // US_PER_DAY
+    if group_type == TimeGroup.DAILY:
+        return days
+    if group_type == TimeGroup.WEEKLY:
+        # 1970-01-01 foi uma quinta-feira; as semanas começam na segunda
+        return (days + 3) // 7
+    year, month, _ = civil_from_days(days)
+    if group_type == TimeGroup.MONTHLY:
+        return year * 12 + month - 1
+    if group_type == TimeGroup.QUARTERLY:
+        return year * 4 + (month - 1) // 3
+    return year
+
+
+def _bucket_start(index, group_type: TimeGroup):
+    """Inverso de `_bucket_index`: início do período em microssegundos."""
+    if group_type == TimeGroup.HOURLY:
+        return index * US_PER_HOUR
+    if group_type == TimeGroup.DAILY:
+        days = index
+    elif group_type == TimeGroup.WEEKLY:
+        days = index * 7 - 3
+    elif group_type == TimeGroup.MONTHLY:
+        days = days_from_civil(index // 12, index % 12 + 1, 1)
+    elif group_type == TimeGroup.QUARTERLY:
+        days = days_from_civil(index // 4, index % 4 * 3 + 1, 1)
+    else:  # YEARLY
+        days = days_from_civil(index, 1, 1)
+    return days * US_PER_DAY
+
+
+def _format_bucket_key(index: int, group_type: TimeGroup) -> str:
+    """Formata a chave de um índice de período como `_format_group_key`."""
+    if group_type == TimeGroup.QUARTERLY:
+        return f"{index // 4}-Q{index % 4 + 1}"
+    if group_type == TimeGroup.YEARLY:
+        return str(index)
+    days, remainder = divmod(_bucket_start(index, group_type), US_PER_DAY)
+    year, month, day = civil_from_days(days)
+    if group_type == TimeGroup.HOURLY:
+        return f"{year:04d}-{month:02d}-{day:02d} " \
+               f"{remainder // US_PER_HOUR:02d}:00"
+    if group_type == TimeGroup.DAILY:
+        return f"{year:04d}-{month:02d}-{day:02d}"
+    if group_type == TimeGroup.WEEKLY:
+        # O ano ISO da semana é o ano da sua quinta-feira
+        thursday = days + 3
+        year = civil_from_days(thursday)[0]
+        week = (thursday - days_from_civil(year, 1, 1)) // 7 + 1
+        return f"{year}-W{week:02d}"
+    return f"{year:04d}-{month:02d}"  # MONTHLY
+
+
+def _to_datetime(value: Union[datetime, str]) -> Optional[datetime]:
+    """Converte uma string ISO 8601 para datetime (None se for inválida)."""
+    if isinstance(value, str):
+        return parse_iso(value)
+    return value
+
+
+def _epochs_us(dates, utc: bool = True) -> np.ndarray:
+    """Converte datas (ou um array NumPy) em microssegundos válidos."""
+    epochs, valid = parse_epochs(dates, utc)
+    return epochs if valid.all() else epochs[valid]
+
+
+def _epoch_us(value: Union[datetime, str, int]) -> int:
+    """Converte uma única data (ou inteiro em microssegundos) para época."""
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    us = iso_to_us(value)
+    if us is None:
+        raise ValueError(f"Data inválida: {value!r}")
+    return us
+
+
+def _iter_chunks(items: Iterable[T], chunk_size: int) -> Iterator[List[T]]:
+    """
+    Divide um iterável em listas de no máximo `chunk_size` elementos (ou
+    em fatias, sem cópia, se for um array NumPy).
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size deve ser maior que zero")
+    if isinstance(items, np.ndarray):
+        for start in range(0, len(items), chunk_size):
+            yield items[start:start + chunk_size]
+        return
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
 def group_dates(
-    dates: List[Union[datetime, str]],
+    dates: Union[List[Union[datetime, str]], np.ndarray],
     group_type: TimeGroup = TimeGroup.DAILY,
     start_date: Optional[datetime] = None,
-    end_date: Optional[datetime] = None
+    end_date: Optional[datetime] = None,
+    tz: Optional[str] = None
 ) -> Dict[str, List[datetime]]:
     """
     Agrupa datas de acordo com o período especificado.
 
+    Sem `tz`, cada data é agrupada pelo horário do próprio `tzinfo`. Com
+    `tz`, os instantes são agrupados pelo horário local do fuso informado
+    (respeitando o horário de verão) e as datas dos grupos são devolvidas
+    nesse fuso; datas sem fuso horário são interpretadas como UTC. Arrays
+    NumPy (datetime64 ou microssegundos UTC) também são aceitos.
+
     Args:
         dates: Lista de datas para agrupar
         group_type: Tipo de agrupamento (diário, semanal, mensal, etc.)
         start_date: Data inicial para filtrar (opcional)
         end_date: Data final para filtrar (opcional)
+        tz: Fuso horário dos períodos (ex: "America/Sao_Paulo", opcional)
 
     Returns:
         Dicionário com as datas agrupadas por período
     """
-    if not dates:
+    if len(dates) == 0:
         return {}
 
+    if tz is not None or isinstance(dates, np.ndarray):
+        return _group_epochs(_epochs_us(dates), group_type,
+                             start_date, end_date, tz)
+
     # Converter strings para datetime se necessário
     processed_dates = []
     for dt in dates:
-        if isinstance(dt, str):
-            try:
-                dt = datetime.fromisoformat(dt.replace('Z', '+00:00'))
-            except ValueError:
-                continue
-        processed_dates.append(dt)
+        dt = _to_datetime(dt)
+        if dt is not None:
+            processed_dates.append(dt)
 
     # Filtrar por intervalo de datas se especificado
     if start_date:
@@ -81,165 +233,1941 @@ def group_dates(
     return dict(groups)
 
 
+def _group_epochs(
+    epochs: np.ndarray,
+    group_type: TimeGroup,
+    start_date: Optional[datetime],
+    end_date: Optional[datetime],
+    tz: Optional[str]
+) -> Dict[str, List[datetime]]:
+    """Caminho vetorizado de `group_dates` sobre microssegundos UTC."""
+    if start_date:
+        epochs = epochs[epochs >= _epoch_us(start_date)]
+    if end_date:
+        epochs = epochs[epochs <= _epoch_us(end_date)]
+    if len(epochs) == 0:
+        return {}
+
+    local = to_local_epochs(epochs, tz) if tz else epochs
+    buckets = _bucket_index(local, group_type)
+    order = np.argsort(buckets, kind="stable")
+    buckets = buckets[order]
+    bounds = np.flatnonzero(np.diff(buckets)) + 1
+
+    if tz:
+        dates = epochs_to_datetimes(epochs[order], tz)
+    else:
+        dates = epochs[order].astype("datetime64[us]").astype(object).tolist()
+
+    groups = {}
+    for start, end in zip(np.r_[0, bounds], np.r_[bounds, len(buckets)]):
+        key = _format_bucket_key(int(buckets[start]), group_type)
+        groups[key] = dates[start:end]
+    return groups
+
+
+def _bucket_moments(
+    epochs: np.ndarray,
+    buckets: np.ndarray
+) -> Dict[str, np.ndarray]:
+    """
+    Calcula, por período, contagem, soma, média, mediana, mínimo, máximo e
+    soma dos quadrados dos desvios (`m2`) de timestamps em microssegundos.
+
+    As datas são ordenadas por período e por valor, então cada período é uma
+    fatia contígua reduzida com `np.add.reduceat`. A soma é acumulada em duas
+    partes inteiras para não estourar o int64, então a média (arredondada
+    para baixo) é exata.
+    """
+    order = np.lexsort((epochs, buckets))
+    values = epochs[order]
+    buckets = buckets[order]
+    starts = np.r_[0, np.flatnonzero(np.diff(buckets)) + 1]
+    counts = np.diff(np.r_[starts, len(values)])
+    mins = values[starts]
+    offsets = values - np.repeat(mins, counts)
+
+    high = np.add.reduceat(offsets >> _SUM_SHIFT, starts)
+    low = np.add.reduceat(offsets & _SUM_MASK, starts)
+    quotient, remainder = np.divmod(high, counts)
+    means = (quotient << _SUM_SHIFT) + \
+        ((remainder << _SUM_SHIFT) + low) // counts
+    deviations = (offsets - np.repeat(means, counts)).astype(np.float64)
+
+    lower = values[starts + (counts - 1) // 2]
+    upper = values[starts + counts // 2]
+    return {
+        "buckets": buckets[starts],
+        "count": counts,
+        "sum": [count * minimum + (h << _SUM_SHIFT) + lo for count, minimum,
+                h, lo in zip(counts.tolist(), mins.tolist(), high.tolist(),
+                             low.tolist())],
+        "mean": mins + means,
+        "median": lower + (upper - lower) // 2,
+        "min": mins,
+        "max": values[starts + counts - 1],
+        "m2": np.add.reduceat(deviations ** 2, starts)
+    }
+
+
+def _stats_epochs(dates, tz: Optional[str]) -> np.ndarray:
+    """
+    Timestamps usados pelas estatísticas: instantes UTC com `tz` ou, sem
+    ele, o horário de parede de cada data (como em `group_dates`).
+    """
+    return _epochs_us(dates, utc=tz is not None)
+
+
+def _stats_dates(epochs: np.ndarray, tz: Optional[str]) -> List[datetime]:
+    """Converte timestamps das estatísticas de volta para datetimes."""
+    dates = from_epoch(epochs, "us", tz)
+    return dates.tolist() if tz is None else dates
+
+
 def calculate_temporal_stats(
-    dates: List[Union[datetime, str]],
-    group_type: TimeGroup = TimeGroup.DAILY
+    dates: Union[List[Union[datetime, str]], np.ndarray],
+    group_type: TimeGroup = TimeGroup.DAILY,
+    tz: Optional[str] = None
 ) -> Dict[str, Dict[str, float]]:
     """
     Calcula estatísticas temporais para um conjunto de datas.
 
+    Os cálculos são feitos em microssegundos int64, sem consultar o fuso
+    horário local do sistema. Sem `tz`, usam o horário de parede de cada
+    data e devolvem datas sem fuso horário; com `tz`, usam os instantes e
+    devolvem datas no fuso informado.
+
     Args:
-        dates: Lista de datas para análise
+        dates: Lista de datas (ou array NumPy) para análise
         group_type: Tipo de agrupamento temporal
+        tz: Fuso horário dos períodos (opcional, ver `group_dates`)
 
     Returns:
         Dicionário com estatísticas por grupo temporal
     """
-    date_groups = group_dates(dates, group_type)
-    stats = {}
-
-    for group_key, dt_group in date_groups.items():
-        if not dt_group:
-            continue
-
-        # Converter datas para timestamps para cálculos
-        timestamps = [d.timestamp() for d in dt_group]
-
-        # Calcular estatísticas básicas
-        std_dev = statistics.stdev(timestamps) if len(timestamps) > 1 else 0
+    if len(dates) == 0:
+        return {}
+    epochs = _stats_epochs(dates, tz)
+    if len(epochs) == 0:
+        return {}
 
-        group_stats = {
-            "count": len(timestamps),
-            "mean": statistics.mean(timestamps),
-            "median": statistics.median(timestamps),
-            "std_dev": std_dev,
-            "min": min(timestamps),
-            "max": max(timestamps)
-        }
+    local = to_local_epochs(epochs, tz) if tz else epochs
+    moments = _bucket_moments(epochs, _bucket_index(local, group_type))
+    counts = moments["count"]
+    std_devs = np.sqrt(moments["m2"] / np.maximum(counts - 1, 1))
+    converted = {name: _stats_dates(moments[name], tz)
+                 for name in ("mean", "median", "min", "max")}
 
-        # Converter timestamps de volta para datetime para melhor legibilidade
-        stats[group_key] = {
-            "count": group_stats["count"],
-            "mean": datetime.fromtimestamp(group_stats["mean"]),
-            "median": datetime.fromtimestamp(group_stats["median"]),
-            "std_dev": timedelta(seconds=group_stats["std_dev"]),
-            "min": datetime.fromtimestamp(group_stats["min"]),
-            "max": datetime.fromtimestamp(group_stats["max"])
+    stats = {}
+    for i, bucket in enumerate(moments["buckets"].tolist()):
+        stats[_format_bucket_key(bucket, group_type)] = {
+            "count": int(counts[i]),
+            "mean": converted["mean"][i],
+            "median": converted["median"][i],
+            "std_dev": timedelta(microseconds=float(std_devs[i])),
+            "min": converted["min"][i],
+            "max": converted["max"][i]
         }
-
     return stats
 
 
 def detect_temporal_patterns(
     dates: List[Union[datetime, str]],
     min_occurrences: int = 3,
-    max_interval: Optional[timedelta] = None
+    max_interval: Optional[timedelta] = None,
+    method: str = "runs",
+    tolerance: timedelta = DEFAULT_TOLERANCE,
+    min_confidence: float = 0.3
 ) -> List[Dict]:
     """
     Detecta padrões temporais em uma sequência de datas.
 
+    O método "runs" procura sequências de intervalos consecutivos iguais
+    (dentro da tolerância). O método "spectral" agrupa os eventos em uma
+    série de contagens com resolução de meia `tolerance` e conta, via FFT,
+    os pares de eventos separados por cada atraso acima dos pares ao acaso,
+    encontrando períodos dominantes mesmo com jitter ou com várias fontes
+    periódicas intercaladas, em O(n log n). Cada período é refinado pelas
+    distâncias reais entre os eventos.
+
     Args:
         dates: Lista de datas para análise
         min_occurrences: Número mínimo de ocorrências para considerar um padrão
-        max_interval: Intervalo máximo entre ocorrências (opcional)
+        max_interval: Intervalo máximo entre ocorrências (opcional); no método
+            "spectral" limita o maior período procurado
+        method: "runs" (padrão) ou "spectral"
+        tolerance: Diferença aceita entre intervalos de um mesmo padrão
+        min_confidence: Confiança mínima (0 a 1) dos períodos no método
+            "spectral"
 
     Returns:
-        Lista de padrões encontrados com suas características
+        Lista de padrões encontrados com suas características; no método
+        "spectral" cada padrão também traz a chave "confidence", a fração
+        dos eventos seguidos de outro um período depois além do acaso
     """
-    if not dates or len(dates) < min_occurrences:
-        return []
-
-    # Processar e ordenar datas
-    processed_dates = []
-    for dt in dates:
-        if isinstance(dt, str):
-            try:
-                dt = datetime.fromisoformat(dt.replace('Z', '+00:00'))
-            except ValueError:
-                continue
-        processed_dates.append(dt)
+    if method not in ("runs", "spectral"):
+        raise ValueError(f"Método '{method}' não suportado")
 
-    processed_dates.sort()
+    if len(dates) == 0 or len(dates) < min_occurrences:
+        return []
 
-    # Calcular intervalos entre datas consecutivas
-    intervals = []
-    for i in range(len(processed_dates) - 1):
-        interval = processed_dates[i + 1] - processed_dates[i]
-        if max_interval and interval > max_interval:
-            continue
-        intervals.append(interval.total_seconds())
+    if method == "spectral":
+        return _detect_periods(
+            _epochs_us(dates), min_occurrences, max_interval, tolerance,
+            min_confidence
+        )
 
-    if not intervals:
+    # Calcular intervalos entre datas consecutivas (em microssegundos)
+    intervals = np.diff(np.sort(_epochs_us(dates)))
+    if max_interval:
+        intervals = intervals[
+            intervals <= max_interval // timedelta(microseconds=1)
+        ]
+    if len(intervals) == 0:
         return []
+    intervals = (intervals / US_PER_SECOND).tolist()
 
     # Identificar padrões
-    patterns = []
-    current_pattern = {"interval": intervals[0], "occurrences": 2}
-    tolerance = 60  # 1 minuto de tolerância
+    return list(_find_interval_runs(intervals, min_occurrences,
+                                    tolerance.total_seconds()))
 
-    for interval in intervals[1:]:
-        if abs(interval - current_pattern["interval"]) <= tolerance:
+
+def _find_interval_runs(
+    intervals: Iterable[float],
+    min_occurrences: int,
+    tolerance: float = DEFAULT_TOLERANCE.total_seconds()
+) -> Iterator[Dict]:
+    """
+    Encontra sequências de intervalos consecutivos aproximadamente iguais.
+    """
+    current_pattern = None
+
+    for interval in intervals:
+        if current_pattern is None:
+            current_pattern = {"interval": interval, "occurrences": 2}
+        elif abs(interval - current_pattern["interval"]) <= tolerance:
             current_pattern["occurrences"] += 1
         else:
             if current_pattern["occurrences"] >= min_occurrences:
-                patterns.append(current_pattern.copy())
+                yield current_pattern
             current_pattern = {"interval": interval, "occurrences": 2}
 
-    if current_pattern["occurrences"] >= min_occurrences:
-        patterns.append(current_pattern)
+    if current_pattern and current_pattern["occurrences"] >= min_occurrences:
+        yield current_pattern
+
+
+def _detect_periods(
+    epochs: np.ndarray,
+    min_occurrences: int,
+    max_interval: Optional[timedelta],
+    tolerance: timedelta,
+    min_confidence: float
+) -> List[Dict]:
+    """Encontra períodos dominantes pela autocorrelação das contagens."""
+    if len(epochs) < 2:
+        return []
+
+    # Série de contagens com resolução de meia tolerância (limitada em
+    # tamanho); `radius` é a tolerância em intervalos da série
+    epochs = np.sort(epochs)
+    total = len(epochs)
+    tolerance_us = max(tolerance // timedelta(microseconds=1), 1)
+    span = int(epochs[-1] - epochs[0])
+    bin_size = max(tolerance_us // 2, 1, -(-span // _MAX_SPECTRAL_BINS))
+    radius = max(tolerance_us // bin_size, 1)
+    counts = np.bincount((epochs - epochs[0]) // bin_size).astype(float)
+    size = len(counts)
+
+    max_lag = min(size // 2, size - radius - 2)
+    if max_interval:
+        max_lag = min(max_lag, max_interval // timedelta(
+            microseconds=bin_size
+        ))
+    if max_lag < 2 * radius:
+        return []
+
+    # Pares de eventos por atraso via FFT (com zero padding para evitar
+    # circularidade)
+    fft_size = 1 << int(2 * size - 1).bit_length()
+    spectrum = np.fft.rfft(counts, fft_size)
+    pairs = np.fft.irfft(spectrum * np.conj(spectrum), fft_size)[:size]
+
+    # Pares ao acaso: a menor taxa (percentil 10) em janelas de uma
+    # tolerância, proporcional às posições disponíveis em cada atraso. Fontes
+    # periódicas não contribuem para esse fundo, então cada uma mantém seus
+    # pares mesmo intercalada com outras
+    positions = (size - np.arange(size)).astype(float)
+    pair_sums = np.concatenate([[0.0], np.cumsum(pairs)])
+    position_sums = np.concatenate([[0.0], np.cumsum(positions)])
+    starts = np.arange(1, size // 2 + 1 - radius)
+    rate = np.percentile(
+        (pair_sums[starts + radius] - pair_sums[starts])
+        / (position_sums[starts + radius] - position_sums[starts]),
+        10
+    )
+    excess = pairs - rate * positions
+    excess_sums = np.concatenate([[0.0], np.cumsum(excess)])
+
+    # Picos da soma de três atrasos vizinhos; a confiança soma o excesso
+    # em toda a tolerância para absorver o jitter
+    lags = np.arange(2 * radius - 1, max_lag + 2)
+    narrow = excess_sums[lags + 2] - excess_sums[lags - 1]
+    peaks = np.flatnonzero((narrow[1:-1] > narrow[:-2])
+                           & (narrow[1:-1] >= narrow[2:])) + 1
+    lags = lags[peaks]
+    scores = excess_sums[lags + radius + 1] - excess_sums[lags - radius]
+    strong = (scores > 0) & (scores >= min_confidence * total)
+    lags, scores = lags[strong], scores[strong]
+    if len(lags) == 0:
+        return []
+    offsets = np.arange(-radius, radius + 1)
+    weights = np.clip(excess[lags[:, None] + offsets], 0, None)
+    centers = (lags + (weights * offsets).sum(axis=1)
+               / weights.sum(axis=1)) * bin_size
+
+    patterns = []
+    accepted = []
+    candidates = np.ones(len(lags), dtype=bool)
+    for index, (center, score) in enumerate(zip(centers, scores)):
+        if not candidates[index]:
+            continue
+        occurrences = min(int(round(score)), total - 1) + 1
+        if occurrences < min_occurrences:
+            continue
+        refined = _refine_period(epochs, center, tolerance_us,
+                                 min_occurrences)
+        if refined is None:
+            continue
+        period, error = refined
+        if abs(period - center) > tolerance_us + bin_size or any(
+            abs(period - round(period / p) * p)
+            <= tolerance_us + 3 * round(period / p) * e
+            for p, e in accepted
+        ):
+            continue
+
+        # Descarta os múltiplos do período (harmônicos); a margem cresce
+        # com o múltiplo conforme a incerteza do período refinado
+        multiples = np.rint(centers / period)
+        candidates &= (np.abs(centers - multiples * period)
+                       > tolerance_us + 3 * multiples * error)
+        accepted.append((period, error))
+        patterns.append({
+            "interval": round(period / US_PER_SECOND, 6),
+            "occurrences": occurrences,
+            "confidence": float(min(score / total, 1.0))
+        })
 
+    patterns.sort(key=lambda p: p["confidence"], reverse=True)
     return patterns
 
 
+def _refine_period(
+    epochs: np.ndarray,
+    period: float,
+    tolerance_us: int,
+    min_occurrences: int
+) -> Optional[Tuple[float, float]]:
+    """
+    Refina um período pelas distâncias reais entre eventos.
+
+    Junta as distâncias entre pares de eventos perto de `k * period` e
+    move a estimativa para a média das que ficam a até uma tolerância dela
+    até estabilizar; pares ao acaso se espalham por igual e não deslocam o
+    ponto final. `k` dobra enquanto couber na série e a nova estimativa
+    concordar com a anterior, o que divide o erro do período por `k`.
+    Retorna o período e seu erro padrão estimado (ambos em microssegundos),
+    ou None sem ocorrências suficientes.
+    """
+    span = epochs[-1] - epochs[0]
+    multiple = 1
+    error = float(tolerance_us)
+    while True:
+        lag = multiple * period
+        margin = tolerance_us + multiple * error
+        low = np.searchsorted(epochs, epochs + int(lag - margin))
+        high = np.searchsorted(epochs, epochs + int(lag + margin),
+                               side="right")
+        step = -(-int((high - low).sum()) // _MAX_REFINE_PAIRS) or 1
+        low, high = low[::step], high[::step]
+        counts = high - low
+        firsts = np.repeat(epochs[::step], counts)
+        seconds = (np.repeat(low - np.cumsum(counts) + counts, counts)
+                   + np.arange(counts.sum()))
+        distances = epochs[seconds] - firsts
+        distances = distances[distances > 0]
+
+        middle = lag
+        for _ in range(_REFINE_ROUNDS):
+            near = distances[np.abs(distances - middle) <= tolerance_us]
+            if len(near) < min_occurrences:
+                return None if multiple == 1 else (period, error)
+            middle, previous = float(near.mean()), middle
+            if abs(middle - previous) < 1:
+                break
+
+        # Outra fonte perto deste múltiplo desloca a média além do erro
+        # esperado; fica a estimativa anterior
+        if multiple > 1 and abs(middle - lag) > 3 * multiple * error:
+            return period, error
+        period = middle / multiple
+        error = max(float(near.std()) / math.sqrt(len(near)), 1.0) / multiple
+        multiple *= 2
+        if multiple * period > span / 2:
+            return period, error
+
+
 def analyze_seasonality(
     dates: List[Union[datetime, str]]
-) -> Dict[str, Dict[str, int]]:
+) -> Dict[str, Union[Dict[int, int], np.ndarray]]:
     """
     Analisa padrões sazonais em uma série temporal.
 
+    Mês, dia da semana e hora são calculados aritmeticamente a partir do
+    horário de parede de cada data e contados com `np.bincount`, então o
+    resultado não depende da localidade do processo. Para exibir nomes de
+    meses e dias use `formatters.format_seasonality`.
+
     Args:
         dates: Lista de datas para análise
 
     Returns:
-        Dicionário com análise de sazonalidade por diferentes períodos
+        Dicionário com as contagens por mês ("monthly", chaves 1 a 12), por
+        dia da semana ("weekly", 0 = segunda-feira a 6 = domingo), por hora
+        ("daily", 0 a 23) e a matriz 7x24 dia da semana x hora
+        ("weekday_hour")
     """
-    if not dates:
+    if len(dates) == 0:
         return {}
 
-    # Processar datas
-    processed_dates = []
-    for dt in dates:
-        if isinstance(dt, str):
+    counts = _seasonality_counts(_epochs_us(dates, utc=False))
+    if not counts.any():
+        return {}
+
+    return _seasonality_result(counts)
+
+
+def _seasonality_counts(epochs: np.ndarray) -> np.ndarray:
+    """Conta as datas em uma matriz 12x7x24 (mês x dia da semana x hora)."""
+    days = epochs // US_PER_DAY
+    hours = (epochs - days * US_PER_DAY) // (3600 * US_PER_SECOND)
+    weekdays = (days + 3) % 7  # 1970-01-01 foi uma quinta-feira
+    _, months, _ = civil_from_days(days)
+
+    codes = ((months - 1) * 7 + weekdays) * 24 + hours
+    return np.bincount(codes, minlength=12 * 7 * 24).reshape(12, 7, 24)
+
+
+def _seasonality_result(
+    counts: np.ndarray
+) -> Dict[str, Union[Dict[int, int], np.ndarray]]:
+    """Monta o resultado de `analyze_seasonality` a partir das contagens."""
+    monthly = counts.sum(axis=(1, 2))
+    weekday_hour = counts.sum(axis=0)
+    return {
+        "monthly": dict(enumerate(monthly.tolist(), start=1)),
+        "weekly": dict(enumerate(weekday_hour.sum(axis=1).tolist())),
+        "daily": dict(enumerate(weekday_hour.sum(axis=0).tolist())),
+        "weekday_hour": weekday_hour
+    }
+
+
+def iter_timestamps(
+    source: Union[str, os.PathLike, IO[str], Iterable[str]],
+    column: Optional[Union[int, str]] = None,
+    field: Optional[str] = None,
+    delimiter: str = ",",
+    encoding: str = "utf-8"
+) -> Iterator[str]:
+    """
+    Lê timestamps de um arquivo (ou iterável de linhas) sob demanda.
+
+    Suporta arquivos com um timestamp por linha, uma coluna de CSV
+    (`column`, por índice ou pelo nome do cabeçalho) ou um campo de
+    JSONL (`field`). As linhas são lidas uma a uma, sem carregar o
+    arquivo inteiro em memória.
+
+    Args:
+        source: Caminho do arquivo, arquivo aberto ou iterável de linhas
+        column: Coluna do CSV com os timestamps (opcional)
+        field: Campo do JSONL com os timestamps (opcional)
+        delimiter: Separador das colunas do CSV
+        encoding: Codificação usada ao abrir `source` pelo caminho
+
+    Returns:
+        Iterador sobre as strings de timestamp encontradas
+    """
+    if column is not None and field is not None:
+        raise ValueError("Informe apenas um entre 'column' e 'field'")
+
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "r", encoding=encoding, newline="") as file:
+            yield from iter_timestamps(file, column, field, delimiter)
+        return
+
+    if column is not None:
+        reader = csv.reader(source, delimiter=delimiter)
+        if isinstance(column, str):
+            header = next(reader, None)
+            if header is None:
+                return
             try:
-                dt = datetime.fromisoformat(dt.replace('Z', '+00:00'))
+                column = header.index(column)
             except ValueError:
+                raise ValueError(f"Coluna '{column}' não encontrada no CSV")
+        for row in reader:
+            if len(row) > column and row[column].strip():
+                yield row[column].strip()
+    elif field is not None:
+        for line in source:
+            line = line.strip()
+            if not line:
+                continue
+            value = json.loads(line).get(field)
+            if isinstance(value, str):
+                yield value
+    else:
+        for line in source:
+            line = line.strip()
+            if line:
+                yield line
+
+
+def stream_group_counts(
+    dates: Iterable[Union[datetime, str]],
+    group_type: TimeGroup = TimeGroup.DAILY,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Dict[str, int]:
+    """
+    Versão em streaming de `group_dates` que conta as datas por período.
+
+    Consome qualquer iterável em blocos de `chunk_size` elementos, de modo
+    que a memória usada não depende do tamanho da entrada.
+
+    Args:
+        dates: Iterável de datas (datetime ou strings ISO 8601)
+        group_type: Tipo de agrupamento (diário, semanal, mensal, etc.)
+        start_date: Data inicial para filtrar (opcional)
+        end_date: Data final para filtrar (opcional)
+        chunk_size: Quantidade de datas processadas por bloco
+
+    Returns:
+        Dicionário com a quantidade de datas por período
+    """
+    counts = defaultdict(int)
+
+    for chunk in _iter_chunks(dates, chunk_size):
+        if isinstance(chunk, np.ndarray):
+            # Arrays de timestamps: contagem vetorizada por índice de período
+            epochs = _epochs_us(chunk)
+            if start_date:
+                epochs = epochs[epochs >= _epoch_us(start_date)]
+            if end_date:
+                epochs = epochs[epochs <= _epoch_us(end_date)]
+            buckets, bucket_counts = np.unique(
+                _bucket_index(epochs, group_type), return_counts=True
+            )
+            for bucket, count in zip(buckets.tolist(),
+                                     bucket_counts.tolist()):
+                counts[_format_bucket_key(bucket, group_type)] += count
+            continue
+        for dt in chunk:
+            dt = _to_datetime(dt)
+            if dt is None:
+                continue
+            if start_date and dt < start_date:
+                continue
+            if end_date and dt > end_date:
+                continue
+            counts[_format_group_key(dt, group_type)] += 1
+
+    return dict(counts)
+
+
+def stream_temporal_stats(
+    dates: Iterable[Union[datetime, str]],
+    group_type: TimeGroup = TimeGroup.DAILY,
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Dict[str, Dict[str, float]]:
+    """
+    Versão em streaming de `calculate_temporal_stats`.
+
+    As estatísticas de cada bloco são combinadas aos agregados acumulados
+    (soma exata e variância pelo método de Chan), então apenas um bloco fica
+    em memória por vez. A mediana não é calculada, pois exigiria guardar
+    todas as datas.
+
+    Args:
+        dates: Iterável de datas (datetime ou strings ISO 8601) ou array
+            NumPy
+        group_type: Tipo de agrupamento temporal
+        chunk_size: Quantidade de datas processadas por bloco
+
+    Returns:
+        Dicionário com count, mean, std_dev, min e max por grupo temporal
+    """
+    # Agregados por período: [count, sum, m2, min, max]
+    aggregates: Dict[int, List[int]] = {}
+
+    for chunk in _iter_chunks(dates, chunk_size):
+        epochs = _stats_epochs(chunk, None)
+        if len(epochs) == 0:
+            continue
+        moments = _bucket_moments(epochs, _bucket_index(epochs, group_type))
+        for bucket, count, total, m2, minimum, maximum in zip(
+            moments["buckets"].tolist(), moments["count"].tolist(),
+            moments["sum"], moments["m2"].tolist(),
+            moments["min"].tolist(), moments["max"].tolist()
+        ):
+            current = aggregates.get(bucket)
+            if current is None:
+                aggregates[bucket] = [count, total, m2, minimum, maximum]
+                continue
+
+            # Diferença entre as médias, calculada com inteiros exatos
+            delta = (total * current[0] - current[1] * count) / \
+                (current[0] * count)
+            current[2] += m2 + delta ** 2 * current[0] * count / \
+                (current[0] + count)
+            current[0] += count
+            current[1] += total
+            current[3] = min(current[3], minimum)
+            current[4] = max(current[4], maximum)
+
+    stats = {}
+    for bucket in sorted(aggregates):
+        count, total, m2, minimum, maximum = aggregates[bucket]
+        std_dev = math.sqrt(m2 / (count - 1)) if count > 1 else 0
+        stats[_format_bucket_key(bucket, group_type)] = {
+            "count": count,
+            "mean": from_epoch(total // count, "us"),
+            "std_dev": timedelta(microseconds=std_dev),
+            "min": from_epoch(minimum, "us"),
+            "max": from_epoch(maximum, "us")
+        }
+
+    return stats
+
+
+def stream_temporal_patterns(
+    dates: Iterable[Union[datetime, str]],
+    min_occurrences: int = 3,
+    max_interval: Optional[timedelta] = None,
+    tolerance: timedelta = DEFAULT_TOLERANCE
+) -> Iterator[Dict]:
+    """
+    Versão em streaming de `detect_temporal_patterns`.
+
+    Como não é possível ordenar um fluxo sem materializá-lo, as datas devem
+    chegar em ordem cronológica (como em arquivos de log). Os padrões são
+    devolvidos assim que cada sequência termina.
+
+    Args:
+        dates: Iterável de datas em ordem cronológica
+        min_occurrences: Número mínimo de ocorrências para considerar um padrão
+        max_interval: Intervalo máximo entre ocorrências (opcional)
+        tolerance: Diferença aceita entre intervalos de um mesmo padrão
+
+    Returns:
+        Iterador sobre os padrões encontrados
+
+    Raises:
+        ValueError: Se as datas não estiverem em ordem cronológica
+    """
+    def array_intervals() -> Iterator[float]:
+        # Arrays de timestamps: intervalos por bloco com np.diff
+        previous = None
+        for chunk in _iter_chunks(dates, DEFAULT_CHUNK_SIZE):
+            epochs = _epochs_us(chunk)
+            if len(epochs) == 0:
                 continue
-        processed_dates.append(dt)
+            if previous is not None:
+                epochs = np.r_[previous, epochs]
+            previous = epochs[-1]
+            deltas = np.diff(epochs)
+            if (deltas < 0).any():
+                raise ValueError("As datas devem estar em ordem cronológica")
+            if max_interval:
+                deltas = deltas[
+                    deltas <= max_interval // timedelta(microseconds=1)
+                ]
+            yield from (deltas / US_PER_SECOND).tolist()
+
+    def intervals() -> Iterator[float]:
+        if isinstance(dates, np.ndarray):
+            yield from array_intervals()
+            return
+        previous = None
+        for dt in dates:
+            dt = _to_datetime(dt)
+            if dt is None:
+                continue
+            if previous is not None:
+                interval = dt - previous
+                if interval < timedelta(0):
+                    raise ValueError(
+                        "As datas devem estar em ordem cronológica"
+                    )
+                if not (max_interval and interval > max_interval):
+                    yield interval.total_seconds()
+            previous = dt
+
+    return _find_interval_runs(intervals(), min_occurrences,
+                               tolerance.total_seconds())
+
+
+def stream_seasonality(
+    dates: Iterable[Union[datetime, str]],
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Dict[str, Union[Dict[int, int], np.ndarray]]:
+    """
+    Versão em streaming de `analyze_seasonality`.
+
+    Args:
+        dates: Iterável de datas (datetime ou strings ISO 8601)
+        chunk_size: Quantidade de datas processadas por bloco
+
+    Returns:
+        Dicionário com análise de sazonalidade por diferentes períodos
+    """
+    counts = np.zeros((12, 7, 24), dtype=np.int64)
+
+    for chunk in _iter_chunks(dates, chunk_size):
+        counts += _seasonality_counts(_epochs_us(chunk, utc=False))
 
-    if not processed_dates:
+    if not counts.any():
         return {}
 
-    # Inicializar contadores
-    monthly_counts = defaultdict(int)
-    weekly_counts = defaultdict(int)
-    daily_counts = defaultdict(int)
+    return _seasonality_result(counts)
 
-    # Analisar padrões
-    for dt in processed_dates:
-        # Padrão mensal
-        month_key = dt.strftime("%B")  # Nome do mês
-        monthly_counts[month_key] += 1
 
-        # Padrão semanal
-        week_key = dt.strftime("%A")  # Nome do dia da semana
-        weekly_counts[week_key] += 1
+class RollingWindow:
+    """
+    Janela deslizante para métricas do tipo "eventos nos últimos N minutos".
+
+    Os eventos ficam em uma deque de pares (timestamp, quantidade), então
+    cada inclusão e cada descarte custam O(1) amortizado. Os timestamps
+    devem chegar em ordem não decrescente; inteiros são interpretados como
+    microssegundos desde a época Unix.
+    """
+
+    def __init__(self, window: timedelta):
+        """
+        Inicializa a janela.
+
+        Args:
+            window (timedelta): Tamanho da janela
+        """
+        if window <= timedelta(0):
+            raise ValueError("A janela deve ser positiva")
+        self.window = window
+        self._window_us = window // timedelta(microseconds=1)
+        self._events = deque()
+        self._total = 0
+        self._latest = None
+
+    def __len__(self) -> int:
+        """Retorna a quantidade de eventos na janela."""
+        return self._total
+
+    def _evict(self, now: int) -> None:
+        """Descarta os eventos que saíram da janela (now - window, now]."""
+        cutoff = now - self._window_us
+        while self._events and self._events[0][0] <= cutoff:
+            self._total -= self._events.popleft()[1]
+
+    def add(
+        self,
+        timestamp: Union[datetime, str, int],
+        count: int = 1
+    ) -> int:
+        """
+        Registra eventos e retorna a contagem atual da janela.
+
+        Args:
+            timestamp: Momento dos eventos
+            count (int): Quantidade de eventos nesse momento
+
+        Returns:
+            int: Quantidade de eventos na janela após a inclusão
+
+        Raises:
+            ValueError: Se o timestamp for anterior ao último registrado
+        """
+        now = _epoch_us(timestamp)
+        if self._latest is not None and now < self._latest:
+            raise ValueError("Os eventos devem estar em ordem cronológica")
+        self._latest = now
+
+        if self._events and self._events[-1][0] == now:
+            self._events[-1][1] += count
+        else:
+            self._events.append([now, count])
+        self._total += count
+        self._evict(now)
+        return self._total
+
+    def count(self, now: Optional[Union[datetime, str, int]] = None) -> int:
+        """
+        Retorna a quantidade de eventos na janela terminada em `now`.
+
+        Args:
+            now: Fim da janela (padrão: último evento registrado)
+
+        Returns:
+            int: Quantidade de eventos na janela
+        """
+        if now is not None:
+            now = _epoch_us(now)
+            if self._latest is None or now > self._latest:
+                self._latest = now
+            self._evict(now)
+        return self._total
+
+    def rate(
+        self,
+        now: Optional[Union[datetime, str, int]] = None,
+        per: timedelta = timedelta(seconds=1)
+    ) -> float:
+        """
+        Retorna a taxa de eventos da janela.
+
+        Args:
+            now: Fim da janela (padrão: último evento registrado)
+            per (timedelta): Unidade da taxa (padrão: eventos por segundo)
+
+        Returns:
+            float: Eventos por `per`
+        """
+        return self.count(now) * (per / self.window)
+
+
+def rolling_counts(
+    timestamps: Union[List[Union[datetime, str]], np.ndarray],
+    window: timedelta,
+    step: timedelta,
+    start: Optional[Union[datetime, str, int]] = None,
+    end: Optional[Union[datetime, str, int]] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Conta os eventos em janelas deslizantes de uma só vez.
+
+    Para cada instante `t` entre `start` e `end` (de `step` em `step`)
+    conta os eventos em (t - window, t]. Com os timestamps ordenados, as
+    bordas das janelas avançam juntas sobre o array (busca vetorizada com
+    `np.searchsorted`), sem reagrupar os eventos a cada passo.
+
+    Args:
+        timestamps: Datas (ou array NumPy de datetime64/microssegundos)
+        window (timedelta): Tamanho da janela
+        step (timedelta): Distância entre os instantes avaliados
+        start: Primeiro instante avaliado (padrão: primeiro evento)
+        end: Último instante avaliado (padrão: último evento)
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Instantes avaliados (datetime64[us],
+        UTC) e a contagem de eventos de cada janela
+    """
+    if window <= timedelta(0) or step <= timedelta(0):
+        raise ValueError("A janela e o passo devem ser positivos")
+
+    epochs = _epochs_us(timestamps)
+    if len(epochs) > 1 and (np.diff(epochs) < 0).any():
+        epochs = np.sort(epochs)
+
+    if len(epochs) == 0 and (start is None or end is None):
+        return (np.array([], dtype="datetime64[us]"),
+                np.array([], dtype=np.int64))
+
+    first = epochs[0] if start is None else _epoch_us(start)
+    last = epochs[-1] if end is None else _epoch_us(end)
+    step_us = step // timedelta(microseconds=1)
+    ends = np.arange(first, last + 1, step_us, dtype=np.int64)
+
+    window_us = window // timedelta(microseconds=1)
+    counts = (np.searchsorted(epochs, ends, side="right")
+              - np.searchsorted(epochs, ends - window_us, side="right"))
+    return ends.astype("datetime64[us]"), counts.astype(np.int64)
+
+
+class _SeriesState:
+    """Estado do detector para uma série (tamanho constante)."""
+
+    __slots__ = ("bucket", "count", "baseline", "seasonal")
+
+    def __init__(self, bucket: int):
+        self.bucket = bucket
+        self.count = 0
+        # [média, variância, períodos vistos]
+        self.baseline = [0.0, 0.0, 0]
+        # No máximo 7 x 24 linhas de base, por (dia da semana, hora)
+        self.seasonal: Dict[int, List[float]] = {}
+
+
+def _ewma_update(stats: List[float], value: float, alpha: float) -> None:
+    """Atualiza média e variância exponencialmente ponderadas."""
+    if stats[2] == 0:
+        stats[0] = float(value)
+    else:
+        diff = value - stats[0]
+        increment = alpha * diff
+        stats[0] += increment
+        stats[1] = (1 - alpha) * (stats[1] + diff * increment)
+    stats[2] += 1
+
+
+class EWMADetector:
+    """
+    Detector online de anomalias nas contagens de eventos por período.
+
+    Os eventos são contados por período (`TimeGroup`) e, quando um período
+    se fecha, sua contagem é comparada à média e à variância exponencialmente
+    ponderadas (EWMA) da série. Para agrupamentos horários e diários também
+    é mantida uma linha de base sazonal por dia da semana e hora, usada assim
+    que tiver `warmup` períodos. Períodos sem eventos contam como zero.
+
+    Cada série guarda apenas um estado de tamanho fixo, então um único
+    detector acompanha milhares de séries. Os eventos de uma mesma série
+    devem chegar em ordem cronológica; inteiros são interpretados como
+    microssegundos desde a época Unix.
+    """
+
+    def __init__(
+        self,
+        group_type: TimeGroup = TimeGroup.HOURLY,
+        alpha: float = 0.1,
+        threshold: float = 3.0,
+        warmup: int = 8,
+        seasonal: bool = True
+    ):
+        """
+        Inicializa o detector.
+
+        Args:
+            group_type (TimeGroup): Tamanho dos períodos contados
+            alpha (float): Peso de cada novo período na EWMA (0 < alpha <= 1)
+            threshold (float): Desvios padrão a partir dos quais o período é
+                considerado anômalo
+            warmup (int): Períodos necessários antes de pontuar uma linha de
+                base
+            seasonal (bool): Se True, usa linhas de base por dia da semana e
+                hora (apenas para agrupamentos horários e diários)
+        """
+        if not 0 < alpha <= 1:
+            raise ValueError("alpha deve estar entre 0 e 1")
+        if threshold <= 0:
+            raise ValueError("threshold deve ser positivo")
+        if warmup < 1:
+            raise ValueError("warmup deve ser maior que zero")
+        self.group_type = group_type
+        self.alpha = alpha
+        self.threshold = threshold
+        self.warmup = warmup
+        self.seasonal = seasonal and group_type in (TimeGroup.HOURLY,
+                                                    TimeGroup.DAILY)
+        self._series: Dict[Hashable, _SeriesState] = {}
+
+    def __len__(self) -> int:
+        """Retorna a quantidade de séries acompanhadas."""
+        return len(self._series)
+
+    def add(
+        self,
+        timestamp: Union[datetime, str, int],
+        series: Hashable = None,
+        count: int = 1
+    ) -> List[Dict]:
+        """
+        Registra eventos e retorna as anomalias dos períodos que se fecharam.
+
+        Args:
+            timestamp: Momento dos eventos
+            series (Hashable): Identificador da série (opcional)
+            count (int): Quantidade de eventos nesse momento
+
+        Returns:
+            List[Dict]: Anomalias com series, start, count, expected e score
+
+        Raises:
+            ValueError: Se o evento for anterior ao período aberto da série
+        """
+        bucket = _bucket_index(_epoch_us(timestamp), self.group_type)
+        state = self._series.get(series)
+        if state is None:
+            state = self._series[series] = _SeriesState(bucket)
+        elif bucket != state.bucket:
+            if bucket < state.bucket:
+                raise ValueError("Os eventos devem estar em ordem cronológica")
+            anomalies = self._close(series, state, bucket)
+            state.count = count
+            return anomalies
+        state.count += count
+        return []
+
+    def flush(
+        self,
+        now: Optional[Union[datetime, str, int]] = None
+    ) -> List[Dict]:
+        """
+        Fecha os períodos abertos de todas as séries.
+
+        Sem `now`, fecha todos os períodos (fim do fluxo). Com `now`, fecha
+        apenas os períodos anteriores ao de `now`, preenchendo com zero os
+        períodos em que uma série ficou em silêncio.
+
+        Args:
+            now: Momento atual (opcional)
+
+        Returns:
+            List[Dict]: Anomalias encontradas nos períodos fechados
+        """
+        anomalies = []
+        for series, state in self._series.items():
+            if now is None:
+                until = state.bucket + 1
+            else:
+                until = _bucket_index(_epoch_us(now), self.group_type)
+            if until > state.bucket:
+                anomalies.extend(self._close(series, state, until))
+        return anomalies
+
+    def _close(
+        self,
+        series: Hashable,
+        state: _SeriesState,
+        until: int
+    ) -> List[Dict]:
+        """Pontua o período aberto e os períodos vazios até `until`."""
+        anomalies = []
+        count = state.count
+        for bucket in range(state.bucket, until):
+            anomaly = self._score(series, state, bucket, count)
+            if anomaly is not None:
+                anomalies.append(anomaly)
+            count = 0
+        state.bucket = until
+        state.count = 0
+        return anomalies
+
+    def _score(
+        self,
+        series: Hashable,
+        state: _SeriesState,
+        bucket: int,
+        count: int
+    ) -> Optional[Dict]:
+        """Compara a contagem com a linha de base e atualiza as médias."""
+        start = _bucket_start(bucket, self.group_type)
+        seasonal = None
+        if self.seasonal:
+            days, remainder = divmod(start, US_PER_DAY)
+            slot = (days + 3) % 7 * 24 + remainder // US_PER_HOUR
+            seasonal = state.seasonal.setdefault(slot, [0.0, 0.0, 0])
+
+        if seasonal is not None and seasonal[2] >= self.warmup:
+            reference = seasonal
+        elif state.baseline[2] >= self.warmup:
+            reference = state.baseline
+        else:
+            reference = None
+
+        anomaly = None
+        if reference is not None:
+            # Desvio mínimo de um evento para séries quase constantes
+            std_dev = max(math.sqrt(reference[1]), 1.0)
+            score = (count - reference[0]) / std_dev
+            if abs(score) >= self.threshold:
+                anomaly = {
+                    "series": series,
+                    "start": EPOCH + timedelta(microseconds=start),
+                    "count": count,
+                    "expected": reference[0],
+                    "score": score
+                }
+
+        _ewma_update(state.baseline, count, self.alpha)
+        if seasonal is not None:
+            _ewma_update(seasonal, count, self.alpha)
+        return anomaly
+
+
+def _freq_index(epochs, freq: Union[TimeGroup, timedelta]):
+    """Índice do período para um `TimeGroup` ou uma largura fixa."""
+    if isinstance(freq, TimeGroup):
+        return _bucket_index(epochs, freq)
+    width = freq // timedelta(microseconds=1)
+    if width <= 0:
+        raise ValueError("A frequência deve ser positiva")
+    return epochs // width
+
+
+def _freq_start(index, freq: Union[TimeGroup, timedelta]):
+    """Inverso de `_freq_index`: início do período em microssegundos."""
+    if isinstance(freq, TimeGroup):
+        return _bucket_start(index, freq)
+    return index * (freq // timedelta(microseconds=1))
+
+
+def _bincount_buckets(
+    offsets: np.ndarray,
+    values: Optional[np.ndarray],
+    aggs: List[str],
+    low: int,
+    span: int
+) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """Soma e conta por período com `np.bincount`, sem ordenar os dados."""
+    counts = np.bincount(offsets, minlength=span)
+    present = np.flatnonzero(counts)
+    counts = counts[present]
+    results = {}
+    if values is not None and aggs != ["count"]:
+        sums = np.bincount(offsets, weights=values, minlength=span)[present]
+    for agg in aggs:
+        if agg == "count":
+            results[agg] = counts
+        elif agg == "sum":
+            results[agg] = sums
+        else:  # mean
+            results[agg] = sums / counts
+    return present + low, results
+
+
+def _reduce_buckets(
+    index: np.ndarray,
+    values: Optional[np.ndarray],
+    aggs: Iterable[str]
+) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """
+    Reduz os valores de cada índice de período com `np.*.reduceat`.
+
+    Retorna os índices não vazios, em ordem, e um array por agregação.
+    """
+    aggs = list(aggs)
+    for agg in aggs:
+        if agg not in _AGGREGATIONS:
+            raise ValueError(f"Agregação '{agg}' não suportada")
+        if agg != "count" and values is None:
+            raise ValueError(f"A agregação '{agg}' exige valores")
+
+    unsorted = len(index) > 1 and (np.diff(index) < 0).any()
+    # `np.bincount` soma em float64, então só serve para valores de ponto
+    # flutuante; inteiros seguem exatos pelo `np.add.reduceat`
+    if unsorted and set(aggs) <= {"count", "sum", "mean"} and (
+        values is None or (values.ndim == 1 and
+                           np.issubdtype(values.dtype, np.floating))
+    ):
+        low = int(index.min())
+        span = int(index.max()) - low + 1
+        if span <= 4 * len(index):
+            return _bincount_buckets(index - low, values, aggs, low, span)
+
+    if unsorted:
+        order = np.argsort(index, kind="stable")
+        index = index[order]
+        values = values[order] if values is not None else None
+    if len(index) == 0:
+        offsets = np.zeros(0, dtype=np.int64)
+    else:
+        offsets = np.r_[0, np.flatnonzero(np.diff(index)) + 1]
+    counts = np.diff(np.r_[offsets, len(index)])
+
+    if values is None:
+        return index[offsets], {agg: counts for agg in aggs}
+
+    # Contagens em formato compatível com valores de várias colunas
+    per_bucket = counts.reshape((-1,) + (1,) * (values.ndim - 1))
+    results = {}
+    sums = means = None
+    for agg in aggs:
+        if agg == "count":
+            results[agg] = counts
+        elif agg == "min":
+            results[agg] = np.minimum.reduceat(values, offsets, axis=0)
+        elif agg == "max":
+            results[agg] = np.maximum.reduceat(values, offsets, axis=0)
+        else:
+            if sums is None:
+                sums = np.add.reduceat(values, offsets, axis=0)
+                means = sums / per_bucket
+            if agg == "sum":
+                results[agg] = sums
+            elif agg == "mean":
+                results[agg] = means
+            else:  # std, amostral como em calculate_temporal_stats
+                group = np.repeat(np.arange(len(offsets)), counts)
+                squares = np.add.reduceat((values - means[group]) ** 2,
+                                          offsets, axis=0)
+                results[agg] = np.sqrt(
+                    squares / np.maximum(per_bucket - 1, 1)
+                )
+    return index[offsets], results
+
+
+def aggregate(
+    timestamps: Union[List[Union[datetime, str]], np.ndarray],
+    values,
+    group_type: Union[TimeGroup, timedelta] = TimeGroup.DAILY,
+    aggs: Iterable[str] = ("sum",),
+    tz: Optional[str] = None
+) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """
+    Agrega valores numéricos associados às datas por período.
+
+    Enquanto `calculate_temporal_stats` descreve as próprias datas, esta
+    função reduz os valores de cada evento (ex.: faturamento por dia). Os
+    eventos são ordenados pelo índice inteiro do período e cada agregação
+    é feita de uma vez com `np.add.reduceat`, `np.minimum.reduceat` etc.
+    Linhas com datas inválidas são ignoradas.
+
+    Args:
+        timestamps: Datas (ou array NumPy de datetime64/microssegundos)
+        values: Valores de cada data (array 1D ou 2D com uma coluna por
+            métrica)
+        group_type: Tipo de agrupamento ou largura fixa dos períodos
+        aggs: Agregações ('count', 'sum', 'mean', 'min', 'max' e 'std')
+        tz: Fuso horário dos períodos (opcional, ver `group_dates`)
+
+    Returns:
+        Tuple[np.ndarray, Dict[str, np.ndarray]]: Início de cada período não
+        vazio (datetime64[us]) e um array de resultados por agregação
+
+    Raises:
+        ValueError: Se os tamanhos forem diferentes ou a agregação não for
+        suportada
+    """
+    epochs, valid = parse_epochs(timestamps)
+    values = np.asarray(values)
+    if len(values) != len(valid):
+        raise ValueError("timestamps e values devem ter o mesmo tamanho")
+    if not valid.all():
+        epochs, values = epochs[valid], values[valid]
+    if tz:
+        epochs = to_local_epochs(epochs, tz)
+
+    index, results = _reduce_buckets(_freq_index(epochs, group_type),
+                                     values, aggs)
+    starts = _freq_start(index, group_type).astype("datetime64[us]")
+    return starts, results
+
+
+def resample(
+    timestamps: Union[List[Union[datetime, str]], np.ndarray],
+    freq: Union[TimeGroup, timedelta] = TimeGroup.DAILY,
+    start: Optional[Union[datetime, str, int]] = None,
+    end: Optional[Union[datetime, str, int]] = None,
+    agg: str = "count",
+    fill_value: Union[int, float] = 0,
+    tz: Optional[str] = None,
+    values=None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Agrega os eventos por período em uma série densa e ordenada.
+
+    Diferente de `group_dates`, todos os períodos entre `start` e `end`
+    aparecem no resultado, inclusive os vazios, que recebem `fill_value`.
+    Os períodos são endereçados por índices inteiros, sem formatar chaves.
+
+    Args:
+        timestamps: Datas (ou array NumPy de datetime64/microssegundos)
+        freq: Tipo de agrupamento ou largura fixa dos períodos (timedelta)
+        start: Início do intervalo (padrão: primeiro evento)
+        end: Fim do intervalo, inclusivo (padrão: último evento)
+        agg (str): Agregação de cada período ('count' ou, com `values`,
+            'sum', 'mean', 'min', 'max' e 'std')
+        fill_value: Valor dos períodos sem eventos
+        tz: Fuso horário dos períodos (opcional, ver `group_dates`)
+        values: Valores de cada data, para agregações além de 'count'
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Início de cada período (datetime64[us],
+        no horário local de `tz` ou em UTC) e o valor de cada período
+
+    Raises:
+        ValueError: Se a agregação ou a frequência não forem suportadas
+    """
+    if agg not in _AGGREGATIONS:
+        raise ValueError(f"Agregação '{agg}' não suportada")
+    if agg != "count" and values is None:
+        raise ValueError(f"A agregação '{agg}' exige valores")
+
+    epochs, keep = parse_epochs(timestamps)
+    if values is not None and agg != "count":
+        values = np.asarray(values)
+        if len(values) != len(keep):
+            raise ValueError("timestamps e values devem ter o mesmo tamanho")
+    else:
+        values = None
+    if start is not None:
+        keep &= epochs >= _epoch_us(start)
+    if end is not None:
+        keep &= epochs <= _epoch_us(end)
+    if not keep.all():
+        epochs = epochs[keep]
+        values = values[keep] if values is not None else None
+    if len(epochs) == 0 and (start is None or end is None):
+        return (np.array([], dtype="datetime64[us]"),
+                np.array([], dtype=np.int64))
+
+    bounds = np.array([
+        epochs.min() if start is None else _epoch_us(start),
+        epochs.max() if end is None else _epoch_us(end)
+    ], dtype=np.int64)
+    if tz:
+        epochs = to_local_epochs(epochs, tz)
+        bounds = to_local_epochs(bounds, tz)
+        if len(epochs):
+            # Na volta do horário de verão o horário local recua, então um
+            # evento dentro de [start, end] pode cair antes do início local
+            # (ou depois do fim); os períodos são estendidos para incluí-lo
+            bounds[0] = min(bounds[0], epochs.min())
+            bounds[1] = max(bounds[1], epochs.max())
+
+    first, last = (int(i) for i in _freq_index(bounds, freq))
+    size = max(last - first + 1, 0)
+    index = _freq_index(epochs, freq) - first
+    starts = _freq_start(np.arange(first, first + size, dtype=np.int64), freq)
+
+    if values is None:
+        counts = np.bincount(index, minlength=size)[:size]
+        result = np.where(counts > 0, counts, fill_value)
+    else:
+        index, reduced = _reduce_buckets(index, values, [agg])
+        reduced = reduced[agg]
+        result = np.full((size,) + reduced.shape[1:], fill_value,
+                         dtype=np.result_type(reduced, fill_value))
+        result[index] = reduced
+    return starts.astype("datetime64[us]"), result
+
+
+def _key_digest(key: Hashable, size: int, salt: bytes = b"") -> bytes:
+    """
+    Hash BLAKE2b estável da representação da chave.
+
+    Diferente de `hash()`, não depende do processo, então estados de
+    sketches calculados em workers diferentes podem ser combinados.
+    """
+    if isinstance(key, np.generic):
+        key = key.item()
+    return hashlib.blake2b(repr(key).encode("utf-8"), digest_size=size,
+                           salt=salt).digest()
+
+
+class CountMinSketch:
+    """
+    Contador aproximado de memória fixa (Count-Min Sketch).
+
+    Cada chave incrementa uma célula em cada uma das `depth` linhas de uma
+    tabela `depth x width`; a estimativa é o menor desses contadores, então
+    nunca fica abaixo da contagem real. Os índices vêm de um hash BLAKE2b da
+    representação da chave, o que torna o estado independente do processo e
+    permite somar sketches de vários workers com `merge`.
+    """
+
+    def __init__(self, width: int = 2048, depth: int = 5, seed: int = 0):
+        """
+        Inicializa o sketch.
+
+        Args:
+            width (int): Células por linha (erro ~ total * e / width)
+            depth (int): Quantidade de linhas (confiança ~ 1 - e^-depth)
+            seed (int): Semente do hash; sketches combinados devem usar a
+                mesma
+        """
+        if width < 1 or depth < 1:
+            raise ValueError("width e depth devem ser positivos")
+        self.width = width
+        self.depth = depth
+        self.seed = seed
+        self.table = np.zeros((depth, width), dtype=np.int64)
+        self.total = 0
+        self._rows = np.arange(depth)
+        self._salt = seed.to_bytes(16, "little", signed=True)
+
+    def _indexes(self, key: Hashable) -> List[int]:
+        """Calcula a coluna da chave em cada linha (hash duplo)."""
+        digest = _key_digest(key, 16, self._salt)
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return [(first + row * second) % self.width
+                for row in range(self.depth)]
+
+    def add(self, key: Hashable, count: int = 1) -> int:
+        """
+        Incrementa a contagem de uma chave.
+
+        Args:
+            key (Hashable): Chave contada
+            count (int): Incremento
+
+        Returns:
+            int: Contagem estimada da chave após o incremento
+        """
+        columns = self._indexes(key)
+        self.table[self._rows, columns] += count
+        self.total += count
+        return int(self.table[self._rows, columns].min())
+
+    def estimate(self, key: Hashable) -> int:
+        """Retorna a contagem estimada (nunca menor que a real) da chave."""
+        return int(self.table[self._rows, self._indexes(key)].min())
+
+    def merge(self, other: "CountMinSketch") -> "CountMinSketch":
+        """
+        Soma outro sketch a este.
+
+        Raises:
+            ValueError: Se os sketches tiverem dimensões ou sementes
+            diferentes
+        """
+        if (self.width, self.depth, self.seed) != (
+            other.width, other.depth, other.seed
+        ):
+            raise ValueError("Os sketches devem ter as mesmas dimensões")
+        self.table += other.table
+        self.total += other.total
+        return self
+
+
+class HeavyHitters:
+    """
+    Mantém as `k` chaves mais frequentes de um fluxo em memória fixa.
+
+    As contagens ficam em um `CountMinSketch` e as candidatas em um heap de
+    mínimo com no máximo `k` chaves: uma chave nova só entra quando sua
+    estimativa supera a menor do heap.
+    """
+
+    def __init__(self, k: int = 10, width: int = 2048, depth: int = 5,
+                 seed: int = 0):
+        """
+        Inicializa o contador.
+
+        Args:
+            k (int): Quantidade de chaves mantidas
+            width (int): Células por linha do sketch
+            depth (int): Linhas do sketch
+            seed (int): Semente do hash do sketch
+        """
+        if k < 1:
+            raise ValueError("k deve ser maior que zero")
+        self.k = k
+        self.sketch = CountMinSketch(width, depth, seed)
+        self._top: Dict[Hashable, int] = {}
+        # Entradas (estimativa, sequência, chave); as desatualizadas são
+        # descartadas ao chegar ao topo do heap
+        self._heap: List[Tuple[int, int, Hashable]] = []
+        self._sequence = 0
+
+    def _push(self, key: Hashable, estimate: int) -> None:
+        """Registra a estimativa atual de uma candidata no heap."""
+        self._top[key] = estimate
+        self._sequence += 1
+        heapq.heappush(self._heap, (estimate, self._sequence, key))
+        if len(self._heap) > 4 * self.k + 16:
+            self._heap = [(value, i, item) for i, (item, value)
+                          in enumerate(self._top.items())]
+            heapq.heapify(self._heap)
+
+    def _minimum(self) -> Tuple[int, Hashable]:
+        """Retorna a menor candidata, limpando entradas desatualizadas."""
+        while True:
+            estimate, _, key = self._heap[0]
+            if self._top.get(key) == estimate:
+                return estimate, key
+            heapq.heappop(self._heap)
+
+    def add(self, key: Hashable, count: int = 1) -> None:
+        """
+        Conta uma ocorrência (ou `count`) de uma chave.
+
+        Args:
+            key (Hashable): Chave contada
+            count (int): Incremento
+        """
+        estimate = self.sketch.add(key, count)
+        if key in self._top or len(self._top) < self.k:
+            self._push(key, estimate)
+            return
+        smallest, smallest_key = self._minimum()
+        if estimate > smallest:
+            heapq.heappop(self._heap)
+            del self._top[smallest_key]
+            self._push(key, estimate)
+
+    def top(self, n: Optional[int] = None) -> List[Tuple[Hashable, int]]:
+        """
+        Retorna as chaves mais frequentes, da maior para a menor.
+
+        Args:
+            n (int): Quantidade de chaves (padrão: k)
+
+        Returns:
+            List[Tuple[Hashable, int]]: Pares (chave, contagem estimada)
+        """
+        ranked = sorted(self._top.items(), key=lambda item: -item[1])
+        return ranked[:n or self.k]
+
+    def merge(self, other: "HeavyHitters") -> "HeavyHitters":
+        """
+        Combina outro contador a este (ex.: resultados de vários workers).
+
+        As candidatas dos dois lados são reavaliadas no sketch combinado.
+        """
+        self.sketch.merge(other.sketch)
+        candidates = set(self._top) | set(other._top)
+        ranked = sorted(
+            ((key, self.sketch.estimate(key)) for key in candidates),
+            key=lambda item: -item[1]
+        )[:self.k]
+        self._top = {}
+        self._heap = []
+        for key, estimate in ranked:
+            self._push(key, estimate)
+        return self
+
+
+def top_buckets(
+    dates: Iterable[Union[datetime, str]],
+    group_type: TimeGroup = TimeGroup.HOURLY,
+    k: int = 10,
+    keys: Optional[Iterable[Hashable]] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    width: int = 2048,
+    depth: int = 5
+) -> List[Tuple[Hashable, int]]:
+    """
+    Encontra os períodos mais movimentados de um fluxo em memória fixa.
+
+    Ao contrário de `stream_group_counts`, que guarda um contador por chave,
+    as contagens ficam em um Count-Min Sketch, então a memória não cresce
+    com a quantidade de períodos (ou de pares chave/período). As contagens
+    devolvidas são estimativas que nunca ficam abaixo do valor real.
+
+    Args:
+        dates: Iterável de datas (datetime ou strings ISO 8601)
+        group_type: Tipo de agrupamento dos períodos
+        k (int): Quantidade de períodos devolvidos
+        keys: Iterável opcional com a chave de cada data (ex.: cliente);
+            nesse caso cada período é identificado por (chave, período)
+        chunk_size: Quantidade de datas processadas por bloco
+        width (int): Células por linha do sketch
+        depth (int): Linhas do sketch
+
+    Returns:
+        List[Tuple[Hashable, int]]: Períodos (no formato de `group_dates`)
+        e contagens estimadas, do mais movimentado para o menos
+    """
+    hitters = HeavyHitters(k, width, depth)
+    items = dates if keys is None else zip(dates, keys)
+
+    for chunk in _iter_chunks(items, chunk_size):
+        if keys is None:
+            epochs, valid = parse_epochs(chunk)
+            chunk_keys = None
+        else:
+            epochs, valid = parse_epochs([date for date, _ in chunk])
+            chunk_keys = [key for _, key in chunk]
+        buckets = _bucket_index(epochs, group_type).tolist()
+
+        # Conta o bloco antes de consultar o sketch: um hash por par
+        counts = defaultdict(int)
+        for i in np.flatnonzero(valid).tolist():
+            bucket = buckets[i]
+            counts[bucket if chunk_keys is None
+                   else (chunk_keys[i], bucket)] += 1
+        for item, count in counts.items():
+            hitters.add(item, count)
+
+    result = []
+    for item, count in hitters.top():
+        if keys is None:
+            result.append((_format_bucket_key(item, group_type), count))
+        else:
+            key, bucket = item
+            result.append(((key, _format_bucket_key(bucket, group_type)),
+                           count))
+    return result
+
+
+class HyperLogLog:
+    """
+    Contador aproximado de valores distintos (HyperLogLog).
+
+    Guarda `2 ** precision` registradores de um byte com o maior número de
+    zeros à esquerda visto em cada um. O erro padrão é de cerca de
+    `1.04 / sqrt(2 ** precision)` (1,6% com a precisão padrão) e dois
+    contadores com a mesma precisão são combinados pelo máximo de cada
+    registrador, sem revisitar os dados.
+    """
+
+    def __init__(self, precision: int = 12):
+        """
+        Inicializa o contador.
+
+        Args:
+            precision (int): Bits usados para escolher o registrador (4-18)
+        """
+        if not 4 <= precision <= 18:
+            raise ValueError("precision deve estar entre 4 e 18")
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def _positions(
+        self,
+        keys: Iterable[Hashable]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Calcula o registrador e a posição do primeiro bit 1 de cada chave.
+        """
+        hashes = np.array(
+            [int.from_bytes(_key_digest(key, 8), "little") for key in keys],
+            dtype=np.uint64
+        )
+        bits = 64 - self.precision
+        index = (hashes >> np.uint64(bits)).astype(np.int64)
+        # Só os 52 bits mais altos do restante cabem exatos em um float64
+        shift = max(bits - 52, 0)
+        rest = (hashes & np.uint64((1 << bits) - 1)) >> np.uint64(shift)
+        _, length = np.frexp(rest.astype(np.float64))
+        rank = (bits - shift) - length + 1
+        return index, rank.astype(np.uint8)
+
+    def add(self, key: Hashable) -> None:
+        """Registra uma chave."""
+        self.add_many([key])
+
+    def add_many(self, keys: Iterable[Hashable]) -> None:
+        """Registra várias chaves de uma vez."""
+        index, rank = self._positions(keys)
+        np.maximum.at(self.registers, index, rank)
+
+    def count(self) -> float:
+        """Retorna a quantidade estimada de chaves distintas."""
+        m = len(self.registers)
+        alpha = {16: 0.673, 32: 0.697, 64: 0.709}.get(
+            m, 0.7213 / (1 + 1.079 / m)
+        )
+        estimate = alpha * m * m / np.ldexp(
+            1.0, -self.registers.astype(np.int64)
+        ).sum()
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            # Contagem linear para cardinalidades pequenas
+            estimate = m * math.log(m / zeros)
+        return float(estimate)
+
+    def __len__(self) -> int:
+        """Retorna a estimativa arredondada."""
+        return int(round(self.count()))
+
+    def copy(self) -> "HyperLogLog":
+        """Retorna uma cópia independente do contador."""
+        other = HyperLogLog(self.precision)
+        other.registers[:] = self.registers
+        return other
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        """
+        Combina outro contador a este (união dos conjuntos).
+
+        Raises:
+            ValueError: Se as precisões forem diferentes
+        """
+        if self.precision != other.precision:
+            raise ValueError("Os contadores devem ter a mesma precisão")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+
+# Agrupamentos em que cada período está inteiramente contido em um período
+# do agrupamento de destino
+_NESTED_GROUPS = {
+    TimeGroup.HOURLY: set(TimeGroup),
+    TimeGroup.DAILY: set(TimeGroup) - {TimeGroup.HOURLY},
+    TimeGroup.WEEKLY: {TimeGroup.WEEKLY},
+    TimeGroup.MONTHLY: {TimeGroup.MONTHLY, TimeGroup.QUARTERLY,
+                        TimeGroup.YEARLY},
+    TimeGroup.QUARTERLY: {TimeGroup.QUARTERLY, TimeGroup.YEARLY},
+    TimeGroup.YEARLY: {TimeGroup.YEARLY},
+}
+
+
+def _parse_bucket_key(key: str, group_type: TimeGroup) -> int:
+    """Inverso de `_format_bucket_key`: índice do período de uma chave."""
+    if group_type == TimeGroup.QUARTERLY:
+        year, quarter = key.split("-Q")
+        return int(year) * 4 + int(quarter) - 1
+    if group_type == TimeGroup.YEARLY:
+        return int(key)
+    if group_type == TimeGroup.MONTHLY:
+        year, month = key.split("-")
+        return int(year) * 12 + int(month) - 1
+    if group_type == TimeGroup.WEEKLY:
+        year, week = key.split("-W")
+        start = datetime.fromisocalendar(int(year), int(week), 1)
+    else:
+        start = datetime.fromisoformat(key)
+    return _bucket_index(_epoch_us(start), group_type)
+
+
+def distinct_per_bucket(
+    dates: Iterable[Union[datetime, str]],
+    keys: Iterable[Hashable],
+    group_type: TimeGroup = TimeGroup.DAILY,
+    precision: int = 12,
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Dict[str, HyperLogLog]:
+    """
+    Estima quantas chaves distintas (ex.: usuários) há em cada período.
+
+    Em vez de um conjunto por período, cada período guarda um HyperLogLog
+    de tamanho fixo. A entrada é consumida em blocos, então funciona com
+    fluxos; resultados de vários workers são combinados com
+    `merge_distinct` e períodos maiores são obtidos com `rollup_distinct`.
+
+    Args:
+        dates: Iterável de datas (datetime ou strings ISO 8601)
+        keys: Iterável com a chave de cada data
+        group_type: Tipo de agrupamento temporal
+        precision (int): Precisão dos contadores (4-18)
+        chunk_size: Quantidade de datas processadas por bloco
+
+    Returns:
+        Dict[str, HyperLogLog]: Contador por período, com as chaves de
+        `group_dates`; use `len(contador)` para a estimativa
+    """
+    sketches: Dict[int, HyperLogLog] = {}
+
+    for chunk in _iter_chunks(zip(dates, keys), chunk_size):
+        epochs, valid = parse_epochs([date for date, _ in chunk])
+        buckets = _bucket_index(epochs[valid], group_type)
+        chunk_keys = [key for (_, key), ok in zip(chunk, valid) if ok]
+        if not chunk_keys:
+            continue
+
+        sketch = HyperLogLog(precision)
+        index, rank = sketch._positions(chunk_keys)
+        order = np.argsort(buckets, kind="stable")
+        buckets, index, rank = buckets[order], index[order], rank[order]
+        bounds = np.r_[0, np.flatnonzero(np.diff(buckets)) + 1, len(order)]
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            bucket = int(buckets[start])
+            if bucket not in sketches:
+                sketches[bucket] = HyperLogLog(precision)
+            np.maximum.at(sketches[bucket].registers, index[start:end],
+                          rank[start:end])
+
+    return {
+        _format_bucket_key(bucket, group_type): sketches[bucket]
+        for bucket in sorted(sketches)
+    }
+
+
+def merge_distinct(
+    *results: Dict[str, HyperLogLog]
+) -> Dict[str, HyperLogLog]:
+    """
+    Combina resultados de `distinct_per_bucket` (ex.: de vários workers).
+
+    Returns:
+        Dict[str, HyperLogLog]: Novos contadores com a união de cada período
+    """
+    merged: Dict[str, HyperLogLog] = {}
+    for result in results:
+        for key, sketch in result.items():
+            if key in merged:
+                merged[key].merge(sketch)
+            else:
+                merged[key] = sketch.copy()
+    return dict(sorted(merged.items()))
 
-        # Padrão diário
-        hour_key = dt.strftime("%H:00")  # Hora do dia
-        daily_counts[hour_key] += 1
+
+def rollup_distinct(
+    sketches: Dict[str, HyperLogLog],
+    source_type: TimeGroup,
+    target_type: TimeGroup
+) -> Dict[str, HyperLogLog]:
+    """
+    Agrega contadores de períodos menores em períodos maiores.
+
+    Por exemplo, os contadores diários viram semanais ou mensais apenas
+    combinando registradores, sem ler os dados novamente.
+
+    Args:
+        sketches: Resultado de `distinct_per_bucket`
+        source_type: Agrupamento dos contadores recebidos
+        target_type: Agrupamento desejado
+
+    Returns:
+        Dict[str, HyperLogLog]: Contadores por período de `target_type`
+
+    Raises:
+        ValueError: Se os períodos de origem não couberem nos de destino
+    """
+    if target_type not in _NESTED_GROUPS[source_type]:
+        raise ValueError(
+            f"Não é possível agregar {source_type.value} em "
+            f"{target_type.value}"
+        )
+
+    rolled: Dict[int, HyperLogLog] = {}
+    for key, sketch in sketches.items():
+        start = _bucket_start(_parse_bucket_key(key, source_type),
+                              source_type)
+        bucket = _bucket_index(start, target_type)
+        if bucket in rolled:
+            rolled[bucket].merge(sketch)
+        else:
+            rolled[bucket] = sketch.copy()
 
     return {
-        "monthly": dict(monthly_counts),
-        "weekly": dict(weekly_counts),
-        "daily": dict(daily_counts)
-    } 
\ No newline at end of file
+        _format_bucket_key(bucket, target_type): rolled[bucket]
+        for bucket in sorted(rolled)
+    }
+
+
+def _close_session(
+    key: Hashable,
+    session: list
+) -> Tuple[Hashable, TimePeriod, int]:
+    """Converte o estado de uma sessão aberta no resultado de `sessionize`."""
+    return key, TimePeriod(start=session[0], end=session[1]), session[3]
+
+
+def sessionize(
+    events: Iterable[Union[datetime, str]],
+    gap: timedelta,
+    keys: Optional[Iterable[Hashable]] = None,
+    order: str = "time"
+) -> Iterator[Tuple[Hashable, TimePeriod, int]]:
+    """
+    Divide um fluxo de eventos em sessões separadas por inatividade.
+
+    Uma sessão termina quando o próximo evento da mesma chave chega mais
+    de `gap` depois do anterior. O fluxo é lido uma única vez e só as
+    sessões abertas ficam em memória: com `order="time"` (eventos em ordem
+    cronológica, chaves intercaladas) as sessões inativas há mais de `gap`
+    são fechadas à medida que o tempo avança; com `order="key"` (eventos
+    agrupados por chave) a sessão aberta é fechada quando a chave muda.
+
+    Args:
+        events: Iterável de datas (datetime ou strings ISO 8601)
+        gap (timedelta): Inatividade máxima dentro de uma sessão
+        keys: Iterável opcional com a chave de cada evento (ex.: usuário)
+        order (str): Ordem do fluxo ('time' ou 'key')
+
+    Returns:
+        Iterador de tuplas (chave, período, quantidade de eventos), na ordem
+        em que as sessões se fecham (a chave é None sem `keys`)
+
+    Raises:
+        ValueError: Se os eventos de uma chave não estiverem em ordem
+        cronológica ou se os parâmetros forem inválidos
+    """
+    if gap <= timedelta(0):
+        raise ValueError("O intervalo de inatividade deve ser positivo")
+    if order not in ("time", "key"):
+        raise ValueError(f"Ordem '{order}' não suportada")
+    gap_us = gap // timedelta(microseconds=1)
+    items = zip(events, keys) if keys is not None else (
+        (event, None) for event in events
+    )
+
+    # Chave -> [início, último evento, último evento em µs, quantidade],
+    # da sessão com atividade mais antiga para a mais recente
+    active: "OrderedDict[Hashable, list]" = OrderedDict()
+    for event, key in items:
+        dt = _to_datetime(event)
+        if dt is None:
+            continue
+        now = iso_to_us(dt)
+
+        if order == "time":
+            while active:
+                first_key, first = next(iter(active.items()))
+                if now - first[2] <= gap_us:
+                    break
+                del active[first_key]
+                yield _close_session(first_key, first)
+        elif active and key not in active:
+            yield _close_session(*active.popitem())
+
+        session = active.get(key)
+        if session is not None:
+            if now < session[2]:
+                raise ValueError("Os eventos devem estar em ordem cronológica")
+            if now - session[2] <= gap_us:
+                session[1], session[2] = dt, now
+                session[3] += 1
+                active.move_to_end(key)
+                continue
+            del active[key]
+            yield _close_session(key, session)
+        active[key] = [dt, dt, now, 1]
+
+    for key, session in active.items():
+        yield _close_session(key, session)
+
+
+def sessionize_arrays(
+    timestamps: Union[List[Union[datetime, str]], np.ndarray],
+    gap: timedelta,
+    keys=None
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, Optional[np.ndarray]]:
+    """
+    Versão vetorizada de `sessionize` para dados já em memória.
+
+    Os eventos são ordenados por chave e horário (`np.lexsort`) e uma nova
+    sessão começa onde a chave muda ou o intervalo passa de `gap`. A
+    entrada não precisa estar ordenada.
+
+    Args:
+        timestamps: Datas (ou array NumPy de datetime64/microssegundos)
+        gap (timedelta): Inatividade máxima dentro de uma sessão
+        keys: Chave de cada evento (opcional)
+
+    Returns:
+        Tuple: Início (datetime64[us], UTC), fim e quantidade de eventos de
+        cada sessão, e a chave de cada sessão (None sem `keys`)
+    """
+    if gap <= timedelta(0):
+        raise ValueError("O intervalo de inatividade deve ser positivo")
+    epochs, valid = parse_epochs(timestamps)
+    codes = uniques = None
+    if keys is not None:
+        keys = np.asarray(keys)
+        if len(keys) != len(valid):
+            raise ValueError("timestamps e keys devem ter o mesmo tamanho")
+        uniques, codes = np.unique(keys[valid], return_inverse=True)
+    epochs = epochs[valid]
+
+    if codes is None:
+        order = np.argsort(epochs, kind="stable")
+        new_key = np.zeros(max(len(epochs) - 1, 0), dtype=bool)
+    else:
+        low = int(epochs.min()) if len(epochs) else 0
+        span = int(epochs.max()) - low + 1 if len(epochs) else 1
+        if len(uniques) * span < 1 << 62:
+            # Chave e horário cabem em um único int64: uma ordenação simples
+            # é bem mais rápida que np.lexsort
+            order = np.argsort(codes.astype(np.int64) * span + (epochs - low))
+        else:
+            order = np.lexsort((epochs, codes))
+        codes = codes[order]
+        new_key = codes[1:] != codes[:-1]
+    epochs = epochs[order]
+
+    new_session = np.ones(len(epochs), dtype=bool)
+    new_session[1:] = new_key | (
+        np.diff(epochs) > gap // timedelta(microseconds=1)
+    )
+    first = np.flatnonzero(new_session)
+    counts = np.diff(np.r_[first, len(epochs)])
+    last = first + counts - 1
+
+    session_keys = uniques[codes[first]] if codes is not None else None
+    return (epochs[first].astype("datetime64[us]"),
+            epochs[last].astype("datetime64[us]"),
+            counts, session_keys)
@@ -4,12 +4,30 @@ import pytz
 from dateutil import parser
 from dateutil.relativedelta import relativedelta
 
+from smart_time_py.core.parsing import (ISO_FORMAT, cached_parse,
+                                        compile_format, parse_iso)
+
 
 def string_to_datetime(date_str: str, date_format: str) -> datetime:
     """
     🕒 Converte uma string para um objeto datetime com o formato especificado.
+
+    Use `date_format="iso"` para ler strings ISO 8601/RFC 3339.
     """
+    if date_format == ISO_FORMAT:
+        date_obj = parse_iso(date_str)
+        if date_obj is None:
+            raise ValueError(
+                f"❌ Erro na conversão: '{date_str}' não está no formato ISO 8601" # noqa501
+            )
+        return date_obj
+    date_obj = cached_parse(
+        date_str, date_format, compile_format(date_format)
+    )
+    if date_obj is not None:
+        return date_obj
     try:
+        # Repete com o strptime só para obter a mensagem de erro original
         return datetime.strptime(date_str, date_format)
     except ValueError as e:
         raise ValueError(f"❌ Erro na conversão: {str(e)}")
@@ -28,11 +46,7 @@ def validate_date_string(date_str: str, date_format: str) -> bool:
     """
     ✅ Valida se uma string de data/hora corresponde ao formato especificado.
     """
-    try:
-        datetime.strptime(date_str, date_format)
-        return True
-    except ValueError:
-        return False
+    return compile_format(date_format)(date_str) is not None
 
 
 # 🔄 Novos formatos de data/hora
@@ -45,8 +59,8 @@ def convert_to_format(date_str, from_format, to_format):
         return None
 
 
-def convert_with_timezone(date_str, timezone):
-    """🌐 Converte uma data para o fuso horário especificado."""
+def _convert_with_timezone(date_str, timezone):
+    """`convert_with_timezone` sem o cache de parsing."""
     try:
         date_obj = parser.parse(date_str)
         target_timezone = pytz.timezone(timezone)
@@ -55,6 +69,14 @@ def convert_with_timezone(date_str, timezone):
         return None
 
 
+def convert_with_timezone(date_str, timezone):
+    """🌐 Converte uma data para o fuso horário especificado."""
+    return cached_parse(
+        date_str, None, lambda value: _convert_with_timezone(value, timezone),
+        timezone
+    )
+
+
 # ⏳ Manipulações de tempo
 def add_time(date_obj, days=0, months=0, years=0):
     """➕ Adiciona dias, meses e anos a uma data."""
@@ -84,11 +106,7 @@ def calculate_difference(date1, date2, unit='days'):
 # 🕐 Validações aprimoradas
 def is_valid_date(date_str, date_format):
     """✅ Verifica se a string corresponde ao formato de data especificado."""
-    try:
-        datetime.strptime(date_str, date_format)
-        return True
-    except ValueError:
-        return False
+    return compile_format(date_format)(date_str) is not None
 
 
 def auto_validate_date(date_str):
@@ -1,11 +1,28 @@
 """
 Módulo de conversão de datas e tempos
 """
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
 from datetime import datetime
+from functools import partial
+from itertools import count, islice
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
 import pytz
 from dateutil import parser
 from dateutil.relativedelta import relativedelta
 
+from smart_time_py.core.parsing import (ISO_FORMAT, cached_parse,
+                                        compile_format, parse_format_many,
+                                        parse_iso)
+
+# Modos de tratamento de valores inválidos em `string_to_datetime_many`
+_ERROR_MODES = ("mask", "raise", "coerce")
+_MANY_CHUNK_SIZE = 65_536
+# Blocos enviados aos workers e ainda não consumidos, por worker
+_CHUNKS_PER_WORKER = 2
+
 
 def string_to_datetime(date_str: str, date_format: str) -> datetime:
     """
@@ -13,7 +30,8 @@ def string_to_datetime(date_str: str, date_format: str) -> datetime:
     
     Args:
         date_str (str): String contendo a data
-        date_format (str): Formato da data (ex: "%Y-%m-%d %H:%M:%S")
+        date_format (str): Formato da data (ex: "%Y-%m-%d %H:%M:%S") ou
+            "iso" para strings ISO 8601/RFC 3339
         
     Returns:
         datetime: Objeto datetime convertido
@@ -21,12 +39,142 @@ def string_to_datetime(date_str: str, date_format: str) -> datetime:
     Raises:
         ValueError: Se a string não puder ser convertida para o formato especificado
     """
+    if date_format == ISO_FORMAT:
+        date_obj = parse_iso(date_str)
+        if date_obj is None:
+            raise ValueError(
+                f"❌ Erro na conversão: '{date_str}' não está no "
+                "formato ISO 8601"
+            )
+        return date_obj
+    date_obj = cached_parse(
+        date_str, date_format, compile_format(date_format)
+    )
+    if date_obj is not None:
+        return date_obj
     try:
+        # Repete com o strptime só para obter a mensagem de erro original
         return datetime.strptime(date_str, date_format)
     except ValueError as e:
         raise ValueError(f"❌ Erro na conversão: {str(e)}")
 
 
+def _convert_chunk(
+    offset: int,
+    chunk: list,
+    date_format: str,
+    errors: str,
+    unit: str
+):
+    """Converte um bloco de `string_to_datetime_many` (também nos workers)."""
+    if errors == "mask":
+        return parse_format_many(chunk, date_format, unit)
+    if date_format == ISO_FORMAT:
+        parse = parse_iso
+    else:
+        parse = compile_format(date_format)
+    results = []
+    for i, value in enumerate(chunk):
+        date_obj = None
+        if isinstance(value, str):
+            date_obj = cached_parse(value, date_format, parse)
+        if date_obj is None and errors == "raise":
+            try:
+                date_obj = string_to_datetime(value, date_format)
+            except ValueError as e:
+                raise ValueError(f"{e} (linha {offset + i})") from None
+        results.append(date_obj)
+    return results
+
+
+def _map_bounded(
+    executor: Executor,
+    function: Callable,
+    offsets: Iterable[int],
+    chunks: Iterable[list],
+    window: int
+) -> Iterator:
+    """
+    Como `executor.map`, mas com no máximo `window` blocos em andamento, para
+    não ler toda a entrada de uma vez. Os resultados saem em ordem.
+    """
+    pending = deque()
+    for offset, chunk in zip(offsets, chunks):
+        if len(pending) >= window:
+            yield pending.popleft().result()
+        pending.append(executor.submit(function, offset, chunk))
+    while pending:
+        yield pending.popleft().result()
+
+
+def string_to_datetime_many(
+    strings: Iterable[str],
+    date_format: str,
+    errors: str = "mask",
+    unit: str = "us",
+    chunk_size: int = _MANY_CHUNK_SIZE,
+    workers: Optional[int] = None
+) -> Union[Tuple[np.ndarray, np.ndarray], List[Optional[datetime]]]:
+    """
+    📦 Converte muitas strings de uma vez para o formato especificado.
+
+    Ao contrário de `string_to_datetime`, valores inválidos não geram uma
+    exceção por linha: com `errors="mask"` o resultado é um array int64 de
+    timestamps com uma máscara de validade (calculado por
+    `parse_format_many`), com `errors="coerce"` é uma lista de datetimes com
+    None nas linhas inválidas e com `errors="raise"` a primeira linha
+    inválida gera um ValueError. As strings são processadas em blocos de
+    `chunk_size`; com `workers` maior que 1, os blocos são distribuídos
+    entre processos, com no máximo dois blocos por worker lidos à frente.
+
+    Args:
+        strings (Iterable[str]): Strings contendo as datas
+        date_format (str): Formato da data (ex: "%Y-%m-%d %H:%M:%S") ou
+            "iso" para strings ISO 8601/RFC 3339
+        errors (str): 'mask', 'coerce' ou 'raise'
+        unit (str): Unidade dos timestamps no modo 'mask' ('s', 'ms', 'us'
+            ou 'ns')
+        chunk_size (int): Quantidade de strings por bloco
+        workers (Optional[int]): Número de processos (None ou 1 processa
+            no processo atual)
+
+    Returns:
+        Union[Tuple[np.ndarray, np.ndarray], List[Optional[datetime]]]:
+        (timestamps, máscara) no modo 'mask' ou lista de datetimes nos demais
+
+    Raises:
+        ValueError: Se o modo de erro for inválido ou, no modo 'raise', se
+            alguma string não puder ser convertida
+    """
+    if errors not in _ERROR_MODES:
+        raise ValueError(f"Modo de erro '{errors}' não suportado")
+    if chunk_size <= 0:
+        raise ValueError("chunk_size deve ser maior que zero")
+
+    iterator = iter(strings)
+    chunks = iter(lambda: list(islice(iterator, chunk_size)), [])
+    convert = partial(
+        _convert_chunk, date_format=date_format, errors=errors, unit=unit
+    )
+    offsets = count(0, chunk_size)
+    if workers is not None and workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(_map_bounded(
+                executor, convert, offsets, chunks,
+                workers * _CHUNKS_PER_WORKER
+            ))
+    else:
+        results = map(convert, offsets, chunks)
+
+    if errors != "mask":
+        return [date_obj for chunk in results for date_obj in chunk]
+    results = list(results)
+    if not results:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=bool)
+    epochs, valid = zip(*results)
+    return np.concatenate(epochs), np.concatenate(valid)
+
+
 def datetime_to_string(date_obj: datetime, date_format: str) -> str:
     """
     📝 Converte um objeto datetime para uma string com o formato especificado.
@@ -57,11 +205,7 @@ def validate_date_string(date_str: str, date_format: str) -> bool:
     Returns:
         bool: True se a string for válida, False caso contrário
     """
-    try:
-        datetime.strptime(date_str, date_format)
-        return True
-    except ValueError:
-        return False
+    return compile_format(date_format)(date_str) is not None
 
 
 def convert_to_format(date_str: str, from_format: str, to_format: str) -> str:
@@ -83,6 +227,16 @@ def convert_to_format(date_str: str, from_format: str, to_format: str) -> str:
         return None
 
 
+def _convert_with_timezone(date_str: str, timezone: str) -> Optional[datetime]:
+    """`convert_with_timezone` sem o cache de parsing."""
+    try:
+        date_obj = parser.parse(date_str)
+        target_timezone = pytz.timezone(timezone)
+        return date_obj.astimezone(target_timezone)
+    except Exception:
+        return None
+
+
 def convert_with_timezone(date_str: str, timezone: str) -> datetime:
     """
     🌐 Converte uma data para o fuso horário especificado.
@@ -94,9 +248,7 @@ def convert_with_timezone(date_str: str, timezone: str) -> datetime:
     Returns:
         datetime: Objeto datetime convertido ou None se a conversão falhar
     """
-    try:
-        date_obj = parser.parse(date_str)
-        target_timezone = pytz.timezone(timezone)
-        return date_obj.astimezone(target_timezone)
-    except Exception:
-        return None 
\ No newline at end of file
+    return cached_parse(
+        date_str, None, lambda value: _convert_with_timezone(value, timezone),
+        timezone
+    ) 
\ No newline at end of file
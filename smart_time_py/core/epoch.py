@@ -0,0 +1,296 @@
+"""
+Módulo de aritmética de timestamps em época Unix
+"""
+from datetime import date, datetime, timedelta, timezone
+from typing import List, Optional, Union
+
+import numpy as np
+
+US_PER_SECOND = 1_000_000
+US_PER_HOUR = 3_600 * US_PER_SECOND
+US_PER_DAY = 86_400 * US_PER_SECOND
+
+EPOCH = datetime(1970, 1, 1)
+EPOCH_UTC = EPOCH.replace(tzinfo=timezone.utc)
+
+# Microssegundos por unidade suportada (ns é tratado à parte)
+_US_PER_UNIT = {"s": US_PER_SECOND, "ms": 1_000, "us": 1}
+
+_ONE_US = timedelta(microseconds=1)
+
+
+def days_from_civil(year, month, day):
+    """
+    📅 Converte ano, mês e dia em dias desde 1970-01-01.
+
+    Usa apenas aritmética inteira (algoritmo de Howard Hinnant), então
+    funciona tanto com inteiros quanto com arrays NumPy.
+
+    Args:
+        year: Ano (proléptico gregoriano)
+        month: Mês (1-12)
+        day: Dia do mês
+
+    Returns:
+        Número de dias desde a época Unix
+    """
+    year = year - (month <= 2)
+    era = year // 400
+    yoe = year - era * 400
+    doy = (153 * ((month + 9) % 12) + 2) // 5 + day - 1
+    doe = yoe * 365 + yoe // 4 - yoe // 100 + doy
+    return era * 146097 + doe - 719468
+
+
+def civil_from_days(days):
+    """
+    📅 Converte dias desde 1970-01-01 em (ano, mês, dia).
+
+    Inverso de `days_from_civil`; também aceita inteiros ou arrays NumPy.
+
+    Args:
+        days: Número de dias desde a época Unix
+
+    Returns:
+        Tupla (ano, mês, dia)
+    """
+    days = days + 719468
+    era = days // 146097
+    doe = days - era * 146097
+    yoe = (doe - doe // 1460 + doe // 36524 - doe // 146096) // 365
+    doy = doe - (365 * yoe + yoe // 4 - yoe // 100)
+    mp = (5 * doy + 2) // 153
+    day = doy - (153 * mp + 2) // 5 + 1
+    month = (mp + 2) % 12 + 1
+    year = yoe + era * 400 + (month <= 2)
+    return year, month, day
+
+
+def datetime_to_us(value: Union[date, datetime]) -> int:
+    """
+    🕒 Converte uma data em microssegundos desde a época Unix.
+
+    Datas sem fuso horário são interpretadas como UTC, então o resultado
+    nunca depende do fuso horário local do sistema.
+
+    Args:
+        value (Union[date, datetime]): Data a ser convertida
+
+    Returns:
+        int: Microssegundos desde 1970-01-01T00:00:00Z
+    """
+    if not isinstance(value, datetime):
+        return days_from_civil(value.year, value.month, value.day) * US_PER_DAY
+    if value.tzinfo is None or value.utcoffset() is None:
+        return (value.replace(tzinfo=None) - EPOCH) // _ONE_US
+    return (value - EPOCH_UTC) // _ONE_US
+
+
+def us_to_unit(values, unit: str = "us"):
+    """
+    🔢 Converte microssegundos desde a época para a unidade informada.
+
+    Args:
+        values: Inteiro ou array NumPy em microssegundos
+        unit (str): Unidade de destino ('s', 'ms', 'us' ou 'ns')
+
+    Returns:
+        Valor(es) na unidade pedida, arredondados para baixo
+
+    Raises:
+        ValueError: Se a unidade não for suportada
+    """
+    if unit == "ns":
+        return values * 1_000
+    if unit not in _US_PER_UNIT:
+        raise ValueError(f"Unidade '{unit}' não suportada")
+    factor = _US_PER_UNIT[unit]
+    return values // factor if factor != 1 else values
+
+
+def unit_to_us(values, unit: str = "us"):
+    """
+    🔢 Converte valores na unidade informada em microssegundos.
+
+    Inverso de `us_to_unit`: inteiros são convertidos de forma exata
+    (nanossegundos arredondados para baixo) e valores fracionários são
+    arredondados para o microssegundo mais próximo.
+
+    Args:
+        values: Número ou array NumPy na unidade informada
+        unit (str): Unidade de origem ('s', 'ms', 'us' ou 'ns')
+
+    Returns:
+        Valor(es) em microssegundos
+
+    Raises:
+        ValueError: Se a unidade não for suportada
+    """
+    if unit != "ns" and unit not in _US_PER_UNIT:
+        raise ValueError(f"Unidade '{unit}' não suportada")
+    if isinstance(values, np.ndarray):
+        fractional = np.issubdtype(values.dtype, np.floating)
+    else:
+        fractional = isinstance(values, (float, np.floating))
+    if fractional:
+        scaled = values / 1_000 if unit == "ns" else \
+            values * _US_PER_UNIT[unit]
+        if isinstance(values, np.ndarray):
+            return np.rint(scaled).astype(np.int64)
+        return int(round(scaled))
+    if unit == "ns":
+        return values // 1_000
+    return values * _US_PER_UNIT[unit]
+
+
+def datetimes_to_us(values: list, utc: bool = True) -> Optional[np.ndarray]:
+    """
+    ⚡ Converte uma lista só de datetimes em microssegundos de uma vez.
+
+    Caminho rápido, com uma subtração por valor e sem consultar fusos
+    horários, para listas em que todas as datas são sem fuso horário (ou,
+    com `utc`, todas com fuso horário).
+
+    Args:
+        values (list): Datas a converter
+        utc (bool): Se False, só aceita datas sem fuso horário
+
+    Returns:
+        Optional[np.ndarray]: Microssegundos int64, ou None se a lista
+        tiver outros valores
+    """
+    for epoch in (EPOCH, EPOCH_UTC) if utc else (EPOCH,):
+        try:
+            return np.fromiter(
+                ((value - epoch) // _ONE_US for value in values),
+                dtype=np.int64, count=len(values)
+            )
+        except TypeError:
+            continue
+    return None
+
+
+def _is_naive(value: date) -> bool:
+    """Indica se a data não tem fuso horário (objetos `date` nunca têm)."""
+    return not isinstance(value, datetime) or value.utcoffset() is None
+
+
+def _local_to_utc(epochs, tz: str):
+    """Converte horários de parede de `tz` em microssegundos UTC."""
+    # Importação tardia: o módulo timezone depende deste módulo
+    from smart_time_py.timezone import from_local_epochs
+    return from_local_epochs(epochs, tz)
+
+
+def _sequence_to_us(values, tz: Optional[str]) -> np.ndarray:
+    """Caminho de `to_epoch` para listas e arrays."""
+    if isinstance(values, np.ndarray) and values.dtype != object:
+        if not np.issubdtype(values.dtype, np.datetime64):
+            raise ValueError(
+                f"Array com dtype '{values.dtype}' não contém datas"
+            )
+        if np.isnat(values).any():
+            raise ValueError("Data inválida: NaT")
+        epochs = values.astype("datetime64[us]").astype(np.int64)
+        return _local_to_utc(epochs, tz) if tz else epochs
+
+    values = list(values)
+    if tz:
+        epochs = datetimes_to_us(values, utc=False)
+        if epochs is not None:
+            return _local_to_utc(epochs, tz)
+    # Sem `tz`, ou todas as datas já com fuso horário
+    epochs = datetimes_to_us(values)
+    if epochs is not None:
+        return epochs
+
+    epochs = np.zeros(len(values), dtype=np.int64)
+    naive = np.zeros(len(values), dtype=bool)
+    for i, value in enumerate(values):
+        if not isinstance(value, date):
+            raise ValueError(f"Data inválida: {value!r}")
+        epochs[i] = datetime_to_us(value)
+        naive[i] = _is_naive(value)
+    if tz and naive.any():
+        epochs[naive] = _local_to_utc(epochs[naive], tz)
+    return epochs
+
+
+def to_epoch(value, unit: str = "s", tz: Optional[str] = None):
+    """
+    🕒 Converte datas em timestamps de época Unix na unidade informada.
+
+    Datas sem fuso horário são interpretadas no fuso `tz` (UTC por padrão)
+    e o fuso horário local do sistema nunca é consultado. Listas e arrays
+    são convertidos de uma vez, sem uma chamada de fuso horário por data.
+    Horários ambíguos ou inexistentes em `tz` seguem `from_local_epochs`.
+
+    Args:
+        value: Data, lista de datas ou array NumPy datetime64
+        unit (str): Unidade do resultado ('s', 'ms', 'us' ou 'ns'),
+            arredondada para baixo
+        tz (Optional[str]): Fuso horário das datas sem fuso horário
+            (ex: "America/Sao_Paulo")
+
+    Returns:
+        int para uma data, ou np.ndarray int64 para listas e arrays
+
+    Raises:
+        ValueError: Se um valor não for uma data, se a unidade não for
+            suportada ou se o fuso horário não existir
+    """
+    if isinstance(value, date):
+        us = datetime_to_us(value)
+        if tz and _is_naive(value):
+            us = int(_local_to_utc(us, tz))
+        return us_to_unit(us, unit)
+    if isinstance(value, (str, bytes)):
+        raise ValueError(f"Data inválida: {value!r}")
+    return us_to_unit(_sequence_to_us(value, tz), unit)
+
+
+def from_epoch(
+    value,
+    unit: str = "s",
+    tz: Optional[str] = None
+) -> Union[datetime, np.ndarray, List[datetime]]:
+    """
+    🕒 Converte timestamps de época Unix em datas.
+
+    Sem `tz`, devolve o horário UTC em datas sem fuso horário (o fuso
+    horário local do sistema nunca é consultado); com `tz`, devolve datas
+    com o `tzinfo` do pytz no fuso informado.
+
+    Args:
+        value: Número ou lista/array de timestamps na unidade informada
+        unit (str): Unidade dos timestamps ('s', 'ms', 'us' ou 'ns')
+        tz (Optional[str]): Fuso horário do resultado
+
+    Returns:
+        datetime para um número; para listas e arrays, um array
+        datetime64[us] (sem `tz`) ou uma lista de datetimes (com `tz`)
+
+    Raises:
+        ValueError: Se os valores não forem numéricos, se a unidade não for
+            suportada ou se o fuso horário não existir
+    """
+    # Importação tardia: o módulo timezone depende deste módulo
+    from smart_time_py.timezone import epochs_to_datetimes
+
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        us = int(unit_to_us(value, unit))
+        if tz is None:
+            return EPOCH + timedelta(microseconds=us)
+        return epochs_to_datetimes(np.array([us], dtype=np.int64), tz)[0]
+
+    values = np.asarray(value)
+    if np.issubdtype(values.dtype, np.integer):
+        values = values.astype(np.int64)
+    elif not np.issubdtype(values.dtype, np.floating):
+        raise ValueError(
+            f"Timestamps devem ser numéricos, não '{values.dtype}'"
+        )
+    epochs = unit_to_us(values, unit)
+    if tz is None:
+        return epochs.astype("datetime64[us]")
+    return epochs_to_datetimes(epochs, tz)
@@ -0,0 +1,1128 @@
+"""
+Módulo de parsing rápido de datas
+"""
+import re
+import sys
+from collections import OrderedDict
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+from itertools import chain, islice
+from typing import (Callable, Dict, Hashable, Iterable, List, Optional,
+                    Pattern, Tuple, Union)
+
+import numpy as np
+from dateutil import parser
+
+from smart_time_py.core.epoch import (US_PER_DAY, US_PER_SECOND,
+                                      datetime_to_us, datetimes_to_us,
+                                      days_from_civil, us_to_unit)
+
+# Valor especial aceito por `string_to_datetime` no lugar de um formato
+ISO_FORMAT = "iso"
+
+# A partir do Python 3.11 o fromisoformat aceita o sufixo "Z" diretamente
+_NATIVE_Z = sys.version_info >= (3, 11)
+
+# Gramática do caminho rápido de `parse_iso_many`, também usada por
+# `parse_iso` para que os dois concordem em todas as versões do Python
+_ISO_PATTERN = re.compile(
+    r"(\d{4})-(\d\d)-(\d\d)(?:[T ](\d\d):(\d\d):(\d\d)"
+    r"(?:[.,](\d+))?(Z|[+-]\d\d:?\d\d)?)?",
+    re.ASCII
+)
+
+# Maior string do formato rápido: YYYY-MM-DDTHH:MM:SS.fffffffff+HH:MM
+_MAX_FAST_LENGTH = 35
+_ISO_CHUNK_SIZE = 65_536
+# Tamanho de cada bloco lido por `extract_timestamps` (1 MiB)
+_EXTRACT_CHUNK_BYTES = 1 << 20
+
+_DAYS_IN_MONTH = np.array(
+    [0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31], dtype=np.int64
+)
+
+# Status de cada linha no caminho vetorizado
+_OK, _INVALID, _FALLBACK = 0, 1, 2
+
+# Diretivas numéricas que `compile_format` traduz, com as mesmas expressões
+# regulares usadas internamente pelo `datetime.strptime`
+_FORMAT_DIRECTIVES = {
+    "Y": r"(\d\d\d\d)",
+    "y": r"(\d\d)",
+    "m": r"(1[0-2]|0[1-9]|[1-9])",
+    "d": r"(3[0-1]|[1-2]\d|0[1-9]|[1-9]| [1-9])",
+    "H": r"(2[0-3]|[0-1]\d|\d)",
+    "M": r"([0-5]\d|\d)",
+    "S": r"(6[0-1]|[0-5]\d|\d)",
+    "f": r"([0-9]{1,6})",
+}
+_FORMAT_TOKEN = re.compile(r"%(.)|(\s+)|([^%\s]+)", re.DOTALL)
+
+# Largura de cada diretiva no caminho vetorizado de `parse_format_many`
+# (%f usa de 1 a 6 dígitos, conforme o comprimento das strings)
+_FIXED_WIDTHS = {"Y": 4, "y": 2, "m": 2, "d": 2, "H": 2, "M": 2, "S": 2}
+
+# Layouts testados por `infer_format`, em ordem de preferência. Os formatos
+# ambíguos (dia/mês) aparecem nas duas ordens e `dayfirst` decide qual vem
+# primeiro.
+_YEAR_FIRST_DATES = ("%Y-%m-%d", "%Y/%m/%d", "%Y.%m.%d", "%Y%m%d")
+_MONTH_FIRST_DATES = ("%m/%d/%Y", "%m-%d-%Y", "%m.%d.%Y", "%m/%d/%y")
+_DAY_FIRST_DATES = ("%d/%m/%Y", "%d-%m-%Y", "%d.%m.%Y", "%d/%m/%y")
+_NAMED_DATES = ("%d %b %Y", "%b %d %Y", "%b %d, %Y", "%d %B %Y",
+                "%B %d, %Y")
+_TIME_SUFFIXES = ("", " %H:%M:%S", " %H:%M", " %H:%M:%S.%f",
+                  " %H:%M:%S,%f", "T%H:%M:%S", "T%H:%M", "T%H:%M:%S.%f")
+_INFER_SAMPLE_SIZE = 100
+
+
+class _ParseCache:
+    """Cache LRU limitado de resultados de parsing, com contadores."""
+
+    __slots__ = ("maxsize", "hits", "misses", "_data")
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+
+    def lookup(self, key: Hashable, compute: Callable[[], object]):
+        data = self._data
+        try:
+            result = data[key]
+        except KeyError:
+            self.misses += 1
+            result = data[key] = compute()
+            if len(data) > self.maxsize:
+                data.popitem(last=False)
+            return result
+        data.move_to_end(key)
+        self.hits += 1
+        return result
+
+
+# Cache opcional compartilhado pelos parsers (desativado por padrão)
+_PARSE_CACHE: Optional[_ParseCache] = None
+
+
+def enable_parse_cache(maxsize: int = 65_536) -> None:
+    """
+    🧠 Ativa o cache LRU de parsing para strings repetidas.
+
+    Com o cache ativo, `string_to_datetime`, `string_to_datetime_many`
+    (modos 'coerce' e 'raise') e `convert_with_timezone` guardam o
+    resultado de cada combinação (string, formato, fuso horário), inclusive
+    as inválidas: strings repetidas custam apenas uma consulta ao
+    dicionário. Strings ISO 8601 não passam pelo cache, pois `parse_iso`
+    já as lê sem `strptime` nem `dateutil`. Chamar novamente recria o
+    cache, zerando os contadores.
+
+    Args:
+        maxsize (int): Quantidade máxima de entradas guardadas
+
+    Raises:
+        ValueError: Se maxsize não for positivo
+    """
+    global _PARSE_CACHE
+    if maxsize < 1:
+        raise ValueError("maxsize deve ser maior que zero")
+    _PARSE_CACHE = _ParseCache(maxsize)
+
+
+def disable_parse_cache() -> None:
+    """🧠 Desativa o cache de parsing e libera as entradas guardadas."""
+    global _PARSE_CACHE
+    _PARSE_CACHE = None
+
+
+def parse_cache_info() -> Dict[str, Union[bool, int]]:
+    """
+    🧠 Informa o estado do cache de parsing.
+
+    Returns:
+        Dict[str, Union[bool, int]]: enabled, hits, misses, size e maxsize
+    """
+    cache = _PARSE_CACHE
+    if cache is None:
+        return {"enabled": False, "hits": 0, "misses": 0, "size": 0,
+                "maxsize": 0}
+    return {"enabled": True, "hits": cache.hits, "misses": cache.misses,
+            "size": len(cache._data), "maxsize": cache.maxsize}
+
+
+def cached_parse(
+    value,
+    fmt: Optional[str],
+    parse: Callable,
+    tz: Optional[str] = None
+):
+    """
+    Aplica `parse(value)` passando pelo cache de parsing, se estiver ativo.
+
+    Args:
+        value: String a ser convertida (outros tipos não são guardados)
+        fmt (Optional[str]): Formato usado, parte da chave do cache
+        parse (Callable): Função de parsing sem cache
+        tz (Optional[str]): Fuso horário usado, parte da chave do cache
+
+    Returns:
+        O resultado de `parse(value)`
+    """
+    cache = _PARSE_CACHE
+    if cache is None or type(value) is not str:
+        return parse(value)
+    return cache.lookup((value, fmt, tz), lambda: parse(value))
+
+
+def parse_iso(value: str) -> Optional[datetime]:
+    """
+    ⚡ Converte uma string ISO 8601/RFC 3339 para datetime.
+
+    Lê a mesma gramática do caminho rápido de `parse_iso_many`
+    (`YYYY-MM-DD[( |T)HH:MM:SS[(.|,)fff…][Z|±HH[:]MM]]`, com a fração
+    truncada em microssegundos), então o resultado é igual em todas as
+    versões do Python suportadas. Os demais formatos ISO caem no
+    `datetime.fromisoformat` nativo.
+
+    Args:
+        value (str): String no formato ISO 8601
+
+    Returns:
+        Optional[datetime]: Data convertida ou None se a string for inválida
+    """
+    match = _ISO_PATTERN.fullmatch(value)
+    if match is None:
+        if not _NATIVE_Z and value.endswith("Z"):
+            value = value[:-1] + "+00:00"
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            return None
+
+    year, month, day, hour, minute, second, fraction, offset = match.groups()
+    microsecond = int(fraction[:6].ljust(6, "0")) if fraction else 0
+    try:
+        tzinfo = None
+        if offset == "Z":
+            tzinfo = timezone.utc
+        elif offset:
+            if int(offset[-2:]) > 59:
+                return None
+            minutes = int(offset[1:3]) * 60 + int(offset[-2:])
+            tzinfo = timezone(timedelta(
+                minutes=-minutes if offset[0] == "-" else minutes
+            ))
+        return datetime(int(year), int(month), int(day), int(hour or 0),
+                        int(minute or 0), int(second or 0), microsecond,
+                        tzinfo)
+    except ValueError:
+        return None
+
+
+def _format_tokens(fmt: str) -> Optional[List[Tuple[str, str]]]:
+    """
+    Divide um formato strftime em tokens ("field", diretiva), ("space",
+    texto) e ("literal", texto), ou devolve None se o formato tiver
+    diretivas não suportadas (nomes de mês, %z, %j...) ou repetidas.
+    """
+    tokens, fields = [], ""
+    position = 0
+    for match in _FORMAT_TOKEN.finditer(fmt):
+        if match.start() != position:
+            # "%" sozinho no final do formato
+            return None
+        position = match.end()
+        directive, space, literal = match.groups()
+        if directive is not None:
+            if directive == "%":
+                tokens.append(("literal", "%"))
+            elif directive in _FORMAT_DIRECTIVES and directive not in fields:
+                tokens.append(("field", directive))
+                fields += directive
+            else:
+                return None
+        elif space is not None:
+            tokens.append(("space", space))
+        else:
+            tokens.append(("literal", literal))
+    if position != len(fmt) or ("Y" in fields and "y" in fields):
+        return None
+    return tokens
+
+
+def _compile_pattern(fmt: str) -> Optional[Tuple[str, str]]:
+    """
+    Traduz um formato strftime em (regex, campos) ou None se o formato não
+    for suportado.
+    """
+    tokens = _format_tokens(fmt)
+    if tokens is None:
+        return None
+    parts, fields = [], ""
+    for kind, value in tokens:
+        if kind == "field":
+            parts.append(_FORMAT_DIRECTIVES[value])
+            fields += value
+        elif kind == "space":
+            parts.append(r"\s+")
+        else:
+            parts.append(re.escape(value))
+    return "".join(parts), fields
+
+
+@lru_cache(maxsize=128)
+def format_regex(fmt: str) -> Optional[Pattern]:
+    """
+    🔎 Devolve a regex equivalente à do `strptime` para um formato.
+
+    Args:
+        fmt (str): Formato da data (ex: "%Y-%m-%d %H:%M:%S")
+
+    Returns:
+        Optional[Pattern]: Regex pré-compilada (em cache), ou None se o
+        formato tiver diretivas não suportadas por `compile_format`
+    """
+    compiled = _compile_pattern(fmt)
+    if compiled is None:
+        return None
+    return re.compile(compiled[0], re.IGNORECASE)
+
+
+@lru_cache(maxsize=128)
+def compile_format(fmt: str) -> Callable[[str], Optional[datetime]]:
+    """
+    ⚡ Compila um formato strftime em uma função de parsing especializada.
+
+    Formatos compostos apenas por diretivas numéricas (`%Y`, `%y`, `%m`,
+    `%d`, `%H`, `%M`, `%S`, `%f`) e literais viram uma única expressão
+    regular pré-compilada, equivalente à do `datetime.strptime`, cujos grupos
+    são convertidos direto para datetime. Os demais formatos usam o próprio
+    `strptime`. O resultado fica em cache (LRU) por formato.
+
+    Args:
+        fmt (str): Formato da data (ex: "%Y-%m-%d %H:%M:%S")
+
+    Returns:
+        Callable[[str], Optional[datetime]]: Função que converte uma string
+        no formato, devolvendo None se ela for inválida
+    """
+    compiled = _compile_pattern(fmt)
+    if compiled is None:
+        def parse(value: str) -> Optional[datetime]:
+            try:
+                return datetime.strptime(value, fmt)
+            except ValueError:
+                return None
+        return parse
+
+    fields = compiled[1]
+    fullmatch = format_regex(fmt).fullmatch
+
+    def at(field):
+        return fields.index(field) if field in fields else None
+
+    year_at, short_year_at = at("Y"), at("y")
+    month_at, day_at = at("m"), at("d")
+    hour_at, minute_at, second_at = at("H"), at("M"), at("S")
+    fraction_at = at("f")
+
+    def parse(value: str) -> Optional[datetime]:
+        match = fullmatch(value)
+        if match is None:
+            return None
+        groups = match.groups()
+        if year_at is not None:
+            year = int(groups[year_at])
+        elif short_year_at is not None:
+            year = int(groups[short_year_at])
+            year += 2000 if year <= 68 else 1900
+        else:
+            year = 1900
+        try:
+            return datetime(
+                year,
+                int(groups[month_at]) if month_at is not None else 1,
+                int(groups[day_at]) if day_at is not None else 1,
+                int(groups[hour_at]) if hour_at is not None else 0,
+                int(groups[minute_at]) if minute_at is not None else 0,
+                int(groups[second_at]) if second_at is not None else 0,
+                (int(groups[fraction_at].ljust(6, "0"))
+                 if fraction_at is not None else 0),
+            )
+        except ValueError:
+            return None
+    return parse
+
+
+def iso_to_us(value, utc: bool = True) -> Optional[int]:
+    """
+    ⚡ Converte uma string ISO 8601 (ou datetime) em microssegundos.
+
+    Args:
+        value: String ISO 8601, datetime ou date
+        utc (bool): Se False, ignora o offset e usa o horário de parede
+
+    Returns:
+        Optional[int]: Microssegundos desde a época Unix ou None se o valor
+        for inválido
+    """
+    if isinstance(value, str):
+        value = parse_iso(value)
+    if isinstance(value, datetime) and not utc:
+        value = value.replace(tzinfo=None)
+    if isinstance(value, (date, datetime)):
+        return datetime_to_us(value)
+    return None
+
+
+def _gather_codes(
+    data: np.ndarray,
+    starts: np.ndarray,
+    lengths: np.ndarray,
+    width: int
+) -> np.ndarray:
+    """
+    Copia os primeiros `width` bytes de cada token de `data` para uma
+    matriz uint8 (width x tokens), uma linha por posição, com zeros depois
+    do fim de cada token.
+    """
+    columns = np.arange(width)[:, None]
+    if not len(data):
+        return np.zeros((width, len(starts)), dtype=np.uint8)
+    codes = data[np.minimum(starts + columns, len(data) - 1)]
+    codes[columns >= lengths] = 0
+    return codes
+
+
+def _iso_width(lengths: np.ndarray) -> int:
+    """Quantidade de posições lidas pelo caminho vetorizado ISO."""
+    if not len(lengths):
+        return 1
+    return int(min(max(lengths.max(), 1), _MAX_FAST_LENGTH))
+
+
+def _parse_iso_block(
+    strings: List[str],
+    utc: bool = True
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Caminho vetorizado de `parse_iso_many`: as strings são unidas em um
+    único buffer de bytes e lidas por `_parse_iso_codes`.
+    """
+    n = len(strings)
+    data = np.frombuffer(
+        "\n".join(strings).encode("utf-8", "replace"), dtype=np.uint8
+    )
+    breaks = np.flatnonzero(data == 10)
+    if len(breaks) != n - 1:
+        # Alguma string contém quebra de linha: nenhuma é ISO válida
+        return np.zeros(n, dtype=np.int64), np.full(n, _FALLBACK)
+
+    starts = np.empty(n, dtype=np.int64)
+    starts[0] = 0
+    starts[1:] = breaks + 1
+    ends = np.append(breaks, len(data))
+    lengths = ends - starts
+    codes = _gather_codes(data, starts, lengths, _iso_width(lengths))
+    return _parse_iso_codes(codes, lengths, utc)
+
+
+def _parse_iso_codes(
+    codes: np.ndarray,
+    lengths: np.ndarray,
+    utc: bool = True
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Caminho vetorizado para `YYYY-MM-DD[( |T)HH:MM:SS[.fff…][Z|±HH[:]MM]]`.
+
+    Cada coluna de `codes` traz os bytes de um valor (veja
+    `_gather_codes`) e cada campo é lido por posição fixa, com operações
+    NumPy. Retorna os microssegundos (UTC,
+    ou horário de parede se `utc` for False) e o status de cada linha (_OK,
+    _INVALID ou _FALLBACK para formatos que o caminho rápido não cobre).
+    """
+    n = codes.shape[1]
+    columns = np.arange(n)
+    last = len(codes) - 1
+    blank = np.zeros(n, dtype=np.int32)
+
+    def char(offset):
+        if np.isscalar(offset):
+            return codes[offset].astype(np.int32) if offset <= last else blank
+        return codes[np.minimum(offset, last), columns].astype(np.int32)
+
+    def digit(offset):
+        value = char(offset) - 48
+        return value, (value >= 0) & (value <= 9)
+
+    def number(*offsets):
+        result, ok = digit(offsets[0])
+        for offset in offsets[1:]:
+            value, value_ok = digit(offset)
+            result = result * 10 + value
+            ok &= value_ok
+        return result, ok
+
+    year, year_ok = number(0, 1, 2, 3)
+    month, month_digits = number(5, 6)
+    day, day_digits = number(8, 9)
+    shape_ok = ((lengths >= 10) & (char(4) == 45) & (char(7) == 45)
+                & year_ok & month_digits & day_digits)
+
+    has_time = lengths > 10
+    hour, hour_ok = number(11, 12)
+    minute, minute_ok = number(14, 15)
+    second, second_ok = number(17, 18)
+    separator = char(10)
+    shape_ok &= ~has_time | (
+        (lengths >= 19) & ((separator == 84) | (separator == 32))
+        & (char(13) == 58) & (char(16) == 58)
+        & hour_ok & minute_ok & second_ok
+    )
+
+    # Fração de segundos com quantidade variável de dígitos
+    mark = char(19)
+    has_fraction = (lengths > 19) & ((mark == 46) | (mark == 44))
+    run = np.zeros(n, dtype=np.int32)
+    fraction = np.zeros(n, dtype=np.int64)
+    alive = has_fraction.copy()
+    for offset in range(20, _MAX_FAST_LENGTH):
+        value, value_ok = digit(offset)
+        alive &= value_ok & (offset < lengths)
+        run += alive
+        if offset < 26:
+            fraction += np.where(alive, value * 10 ** (25 - offset), 0)
+    shape_ok &= ~has_fraction | (run > 0)
+
+    # Sufixo de fuso horário: vazio, Z ou ±HH:MM / ±HHMM
+    pos = np.where(has_fraction, 20 + run, 19)
+    rest = np.where(has_time, lengths - pos, 0)
+    sign = char(pos)
+    is_utc = (rest == 1) & (sign == 90)
+    colon = (rest == 6) & (char(pos + 3) == 58)
+    minute_at = pos + np.where(colon, 4, 3)
+    offset_hours, hours_ok = number(pos + 1, pos + 2)
+    offset_minutes, minutes_ok = number(minute_at, minute_at + 1)
+    has_offset = (((sign == 43) | (sign == 45)) & hours_ok & minutes_ok
+                  & (colon | (rest == 5)))
+    shape_ok &= (rest == 0) | is_utc | has_offset
+    offset = np.where(has_offset, offset_hours * 60 + offset_minutes, 0)
+    offset = np.where(sign == 45, -offset, offset)
+
+    # Validação dos intervalos sem criar objetos datetime
+    leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+    month_ok = (month >= 1) & (month <= 12)
+    days_in_month = _DAYS_IN_MONTH[np.where(month_ok, month, 0)] + (
+        leap & (month == 2)
+    )
+    values_ok = (
+        month_ok & (year >= 1) & (day >= 1) & (day <= days_in_month)
+        & (~has_time | ((hour <= 23) & (minute <= 59) & (second <= 59)))
+        & (np.abs(offset) < 24 * 60) & (~has_offset | (offset_minutes <= 59))
+    )
+
+    seconds = np.where(has_time, hour * 3600 + minute * 60 + second, 0)
+    if utc:
+        seconds = seconds - offset * 60
+    days = days_from_civil(year.astype(np.int64), month, day)
+    epochs = (days * US_PER_DAY
+              + seconds.astype(np.int64) * US_PER_SECOND
+              + fraction)
+    shape_ok &= lengths <= _MAX_FAST_LENGTH
+    status = np.where(shape_ok, np.where(values_ok, _OK, _INVALID), _FALLBACK)
+    return np.where(status == _OK, epochs, 0), status
+
+
+def _parse_iso_chunk(
+    values: list,
+    utc: bool = True
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Converte um bloco de valores em (microssegundos, máscara)."""
+    if values and isinstance(values[0], datetime):
+        epochs = datetimes_to_us(values, utc)
+        if epochs is not None:
+            return epochs, np.ones(len(values), dtype=bool)
+
+    fast = [
+        i for i, value in enumerate(values)
+        if isinstance(value, str) and len(value) <= _MAX_FAST_LENGTH
+    ]
+    epochs = np.zeros(len(values), dtype=np.int64)
+    status = np.full(len(values), _FALLBACK, dtype=np.int64)
+    if fast:
+        index = np.array(fast, dtype=np.int64)
+        epochs[index], status[index] = _parse_iso_block(
+            [values[i] for i in fast], utc
+        )
+
+    for i in np.flatnonzero(status == _FALLBACK):
+        us = iso_to_us(values[i], utc)
+        if us is not None:
+            epochs[i] = us
+            status[i] = _OK
+    return epochs, status == _OK
+
+
+def _parse_chunks(values, parse_chunk, unit: str):
+    """Aplica `parse_chunk` em blocos e concatena (timestamps, máscara)."""
+    iterator = iter(values)
+    epochs, valid = [], []
+    while True:
+        chunk = list(islice(iterator, _ISO_CHUNK_SIZE))
+        if not chunk:
+            break
+        chunk_epochs, chunk_valid = parse_chunk(chunk)
+        epochs.append(chunk_epochs)
+        valid.append(chunk_valid)
+
+    if not epochs:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=bool)
+    return us_to_unit(np.concatenate(epochs), unit), np.concatenate(valid)
+
+
+def parse_iso_many(
+    values: Iterable[Union[str, datetime]],
+    unit: str = "us",
+    utc: bool = True
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    ⚡ Converte muitas strings ISO 8601 de uma vez para timestamps.
+
+    Os formatos mais comuns (`YYYY-MM-DD`, `YYYY-MM-DDTHH:MM:SS`, com fração
+    de segundos e `Z`/`±HH:MM` opcionais) são lidos em blocos por posição
+    fixa com NumPy, sem criar objetos datetime nem lançar exceções. Os demais
+    formatos ISO caem no `fromisoformat`. Valores inválidos ficam marcados
+    como False na máscara e com 0 no array de timestamps. Datas sem fuso
+    horário são interpretadas como UTC.
+
+    Args:
+        values (Iterable[Union[str, datetime]]): Strings ISO 8601 (objetos
+            datetime também são aceitos)
+        unit (str): Unidade dos timestamps ('s', 'ms', 'us' ou 'ns')
+        utc (bool): Se False, ignora o offset de cada valor e devolve o
+            horário de parede (útil para análises por hora do dia)
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Timestamps int64 desde a época Unix e
+        máscara booleana com True para os valores válidos
+    """
+    return _parse_chunks(
+        values, lambda chunk: _parse_iso_chunk(chunk, utc), unit
+    )
+
+
+@lru_cache(maxsize=128)
+def _fixed_layout(fmt: str, fraction_width: int = 6, encoded: bool = False):
+    """
+    Posições fixas de um formato: (comprimento, [(posição, código)] dos
+    literais, {diretiva: (início, largura)}), ou None se não for suportado.
+    Com `encoded`, as posições e códigos dos literais são dos bytes UTF-8.
+    """
+    tokens = _format_tokens(fmt)
+    if tokens is None:
+        return None
+    position, literals, fields = 0, [], {}
+    for kind, value in tokens:
+        if kind == "field":
+            width = _FIXED_WIDTHS.get(value, fraction_width)
+            fields[value] = (position, width)
+            position += width
+        else:
+            codes = value.encode("utf-8") if encoded else map(ord, value)
+            for code in codes:
+                literals.append((position, code))
+                position += 1
+    return position, literals, fields
+
+
+def _parse_format_block(
+    strings: List[str],
+    layout
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Caminho vetorizado de `parse_format_many` para strings com exatamente o
+    comprimento do layout, lidas pelos códigos Unicode de cada caractere.
+    """
+    length = layout[0]
+    codes = np.array(strings, dtype=f"<U{length}").view(np.uint32)
+    codes = codes.reshape(len(strings), length).astype(np.int64)
+    return _parse_format_codes(codes, layout)
+
+
+def _parse_format_codes(
+    codes: np.ndarray,
+    layout
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Confere os literais e dígitos de cada linha de `codes` por posição fixa
+    e calcula os campos com operações NumPy. Retorna os microssegundos e a
+    máscara das linhas aceitas.
+    """
+    length, literals, fields = layout
+    n = len(codes)
+    codes = codes.astype(np.int64, copy=False)
+    ok = np.ones(n, dtype=bool)
+    for position, code in literals:
+        ok &= codes[:, position] == code
+
+    values = {}
+    for name, (start, width) in fields.items():
+        digits = codes[:, start:start + width] - 48
+        ok &= ((digits >= 0) & (digits <= 9)).all(axis=1)
+        values[name] = digits @ (10 ** np.arange(width - 1, -1, -1))
+
+    def field(name, default):
+        return values.get(name, np.full(n, default, dtype=np.int64))
+
+    if "y" in values:
+        year = values["y"] + np.where(values["y"] <= 68, 2000, 1900)
+    else:
+        year = field("Y", 1900)
+    month, day = field("m", 1), field("d", 1)
+    hour, minute, second = field("H", 0), field("M", 0), field("S", 0)
+    fraction = field("f", 0)
+    if "f" in fields:
+        fraction = fraction * 10 ** (6 - fields["f"][1])
+
+    # Mesmas faixas validadas pelo construtor do datetime
+    leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+    month_ok = (month >= 1) & (month <= 12)
+    days_in_month = _DAYS_IN_MONTH[np.where(month_ok, month, 0)] + (
+        leap & (month == 2)
+    )
+    ok &= (month_ok & (year >= 1) & (day >= 1) & (day <= days_in_month)
+           & (hour <= 23) & (minute <= 59) & (second <= 59))
+
+    days = days_from_civil(year, month, day)
+    epochs = (days * US_PER_DAY
+              + (hour * 3600 + minute * 60 + second) * US_PER_SECOND
+              + fraction)
+    return np.where(ok, epochs, 0), ok
+
+
+def _parse_format_chunk(
+    values: list,
+    fmt: str,
+    utc: bool = True
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Converte um bloco de strings no formato `fmt` em (us, máscara)."""
+    n = len(values)
+    epochs = np.zeros(n, dtype=np.int64)
+    valid = np.zeros(n, dtype=bool)
+    layout = _fixed_layout(fmt)
+    if layout is not None and layout[0] > 0:
+        lengths = np.fromiter(
+            (len(value) if isinstance(value, str) else -1
+             for value in values),
+            dtype=np.int64, count=n
+        )
+        # Com %f, cada comprimento corresponde a uma quantidade de dígitos
+        widths = range(1, 7) if "f" in layout[2] else (6,)
+        for width in widths:
+            fixed = _fixed_layout(fmt, width)
+            index = np.flatnonzero(lengths == fixed[0])
+            if len(index):
+                epochs[index], valid[index] = _parse_format_block(
+                    [values[i] for i in index], fixed
+                )
+
+    # Linhas fora do layout fixo (larguras variáveis, espaços extras,
+    # dígitos não ASCII, formatos com nomes...) usam o parser compilado
+    parse = compile_format(fmt)
+    for i in np.flatnonzero(~valid):
+        value = values[i]
+        date_obj = parse(value) if isinstance(value, str) else None
+        if date_obj is None:
+            continue
+        if not utc:
+            date_obj = date_obj.replace(tzinfo=None)
+        epochs[i] = datetime_to_us(date_obj)
+        valid[i] = True
+    return epochs, valid
+
+
+def parse_format_many(
+    values: Iterable[str],
+    fmt: str,
+    unit: str = "us",
+    utc: bool = True
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    ⚡ Converte muitas strings em um formato strftime para timestamps.
+
+    As strings com o layout fixo do formato (ex: `2025-02-24 14:30:05` para
+    `%Y-%m-%d %H:%M:%S`) são lidas por posição com NumPy, sem criar objetos
+    datetime nem lançar exceções; as demais passam pelo parser de
+    `compile_format`, aceitando exatamente o mesmo que o `strptime`. Valores
+    inválidos ficam marcados como False na máscara e com 0 no array de
+    timestamps. Datas sem fuso horário são interpretadas como UTC.
+
+    Args:
+        values (Iterable[str]): Strings de data
+        fmt (str): Formato da data (ex: "%Y-%m-%d %H:%M:%S") ou "iso"
+        unit (str): Unidade dos timestamps ('s', 'ms', 'us' ou 'ns')
+        utc (bool): Se False, ignora o offset (%z) e usa o horário de parede
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Timestamps int64 desde a época Unix e
+        máscara booleana com True para os valores válidos
+    """
+    if fmt == ISO_FORMAT:
+        return parse_iso_many(values, unit, utc)
+    return _parse_chunks(
+        values, lambda chunk: _parse_format_chunk(chunk, fmt, utc), unit
+    )
+
+
+def _format_candidates(dayfirst: bool) -> List[str]:
+    """Formatos testados por `infer_format`, em ordem de preferência."""
+    if dayfirst:
+        ambiguous = _DAY_FIRST_DATES + _MONTH_FIRST_DATES
+    else:
+        ambiguous = _MONTH_FIRST_DATES + _DAY_FIRST_DATES
+    return [
+        date_part + time_part
+        for date_part in _YEAR_FIRST_DATES + ambiguous + _NAMED_DATES
+        for time_part in _TIME_SUFFIXES
+    ]
+
+
+def infer_format(
+    sample: Iterable[str],
+    dayfirst: bool = False
+) -> Optional[str]:
+    """
+    🔎 Detecta o formato strftime mais provável de uma amostra de strings.
+
+    Cada formato candidato (datas com ano, mês ou dia primeiro, nomes de
+    mês e horas opcionais) é testado com `compile_format` e vence o que
+    aceitar mais valores da amostra. Em empates, como `01/02/2025`, vale a
+    ordem indicada por `dayfirst`. Se nenhum candidato servir mas os valores
+    forem ISO 8601 (ex: com fuso horário), devolve "iso".
+
+    Args:
+        sample (Iterable[str]): Amostra de strings de data (ex: as primeiras
+            linhas de uma coluna)
+        dayfirst (bool): Se True, prefere dia antes do mês nos formatos
+            ambíguos
+
+    Returns:
+        Optional[str]: Formato detectado, "iso" ou None se nenhum formato
+        reconhecer a amostra
+    """
+    values = [
+        value.strip() for value in sample
+        if isinstance(value, str) and value.strip()
+    ]
+    if not values:
+        return None
+
+    best, best_count = None, 0
+    for candidate in _format_candidates(dayfirst):
+        parse = compile_format(candidate)
+        matched = sum(parse(value) is not None for value in values)
+        if matched > best_count:
+            best, best_count = candidate, matched
+            if matched == len(values):
+                break
+
+    iso_count = sum(parse_iso(value) is not None for value in values)
+    if iso_count > best_count:
+        return ISO_FORMAT
+    return best
+
+
+def _parse_auto_chunk(
+    values: list,
+    fmt: Optional[str],
+    dayfirst: bool,
+    utc: bool
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Converte um bloco no formato inferido, com dateutil como fallback."""
+    if fmt is None:
+        epochs = np.zeros(len(values), dtype=np.int64)
+        valid = np.zeros(len(values), dtype=bool)
+    elif fmt == ISO_FORMAT:
+        epochs, valid = _parse_iso_chunk(values, utc)
+    else:
+        epochs, valid = _parse_format_chunk(values, fmt, utc)
+
+    for i in np.flatnonzero(~valid):
+        value = values[i]
+        if not isinstance(value, str) or not value.strip():
+            continue
+        try:
+            date_obj = parser.parse(value, dayfirst=dayfirst)
+        except (ValueError, OverflowError):
+            continue
+        if not utc:
+            date_obj = date_obj.replace(tzinfo=None)
+        epochs[i] = datetime_to_us(date_obj)
+        valid[i] = True
+    return epochs, valid
+
+
+def parse_auto_many(
+    values: Iterable[str],
+    dayfirst: bool = False,
+    sample_size: int = _INFER_SAMPLE_SIZE,
+    unit: str = "us",
+    utc: bool = True
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    ⚡ Converte uma coluna de datas em formato desconhecido para timestamps.
+
+    O formato é detectado uma única vez por `infer_format` a partir das
+    primeiras `sample_size` strings e aplicado ao restante da coluna com
+    `parse_format_many`. Só as linhas que não seguem o formato detectado
+    passam pelo `dateutil.parser.parse`, bem mais lento.
+
+    Args:
+        values (Iterable[str]): Strings de data
+        dayfirst (bool): Se True, prefere dia antes do mês nas datas
+            ambíguas
+        sample_size (int): Quantidade de valores usados para detectar o
+            formato
+        unit (str): Unidade dos timestamps ('s', 'ms', 'us' ou 'ns')
+        utc (bool): Se False, ignora o fuso horário de cada valor e usa o
+            horário de parede
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Timestamps int64 desde a época Unix e
+        máscara booleana com True para os valores válidos
+    """
+    iterator = iter(values)
+    sample = list(islice(iterator, sample_size))
+    fmt = infer_format(sample, dayfirst)
+    return _parse_chunks(
+        chain(sample, iterator),
+        lambda chunk: _parse_auto_chunk(chunk, fmt, dayfirst, utc),
+        unit
+    )
+
+
+def _line_bounds(chunk: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Início e fim (sem "\\n" nem "\\r") de cada linha de um bloco."""
+    breaks = np.flatnonzero(chunk == 10)
+    if len(chunk) and chunk[-1] != 10:
+        breaks = np.append(breaks, len(chunk))
+    starts = np.empty(len(breaks), dtype=np.int64)
+    starts[:1] = 0
+    starts[1:] = breaks[:-1] + 1
+    ends = breaks.astype(np.int64)
+    carriage = (ends > starts) & (chunk[np.maximum(ends - 1, 0)] == 13)
+    return starts, ends - carriage
+
+
+def _token_bounds(
+    chunk: np.ndarray,
+    starts: np.ndarray,
+    ends: np.ndarray,
+    offset: int,
+    width: Optional[int],
+    field: Optional[int],
+    delimiter: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Início e comprimento do timestamp em cada linha de um bloco."""
+    separators = np.flatnonzero(chunk == delimiter)
+
+    def separator_at(index, limit):
+        """Posição do separador `index` (ou `limit` se passar da linha)."""
+        if not len(separators):
+            return limit
+        position = separators[np.minimum(index, len(separators) - 1)]
+        return np.where(
+            (index < len(separators)) & (position < limit), position, limit
+        )
+
+    if field is None:
+        begins = np.minimum(starts + offset, ends)
+    elif field == 0:
+        begins = starts
+    else:
+        at = np.searchsorted(separators, starts) + field - 1
+        begins = separator_at(at, ends)
+        begins = np.where(begins < ends, begins + 1, ends)
+
+    if width is not None:
+        stops = np.minimum(begins + width, ends)
+    else:
+        # O timestamp termina no próximo separador ou no fim da linha
+        stops = separator_at(np.searchsorted(separators, begins), ends)
+    return begins, stops - begins
+
+
+def _parse_tokens(
+    chunk: np.ndarray,
+    begins: np.ndarray,
+    lengths: np.ndarray,
+    fmt: str,
+    utc: bool
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Converte os tokens de um bloco de bytes em (microssegundos, máscara)."""
+    n = len(begins)
+    epochs = np.zeros(n, dtype=np.int64)
+    valid = np.zeros(n, dtype=bool)
+    if fmt == ISO_FORMAT:
+        codes = _gather_codes(chunk, begins, lengths, _iso_width(lengths))
+        epochs, status = _parse_iso_codes(codes, lengths, utc)
+        valid = status == _OK
+        pending = np.flatnonzero(status == _FALLBACK)
+        parse = parse_iso
+    else:
+        layout = _fixed_layout(fmt, 6, True)
+        if layout is not None and layout[0] > 0:
+            widths = range(1, 7) if "f" in layout[2] else (6,)
+            for fraction_width in widths:
+                fixed = _fixed_layout(fmt, fraction_width, True)
+                index = np.flatnonzero(lengths == fixed[0])
+                if len(index):
+                    codes = _gather_codes(
+                        chunk, begins[index], lengths[index], fixed[0]
+                    )
+                    epochs[index], valid[index] = _parse_format_codes(
+                        codes.T, fixed
+                    )
+        pending = np.flatnonzero(~valid)
+        parse = compile_format(fmt)
+
+    # Tokens fora do caminho vetorizado: decodifica só esses valores
+    for i in pending.tolist():
+        begin = int(begins[i])
+        if lengths[i] <= 0:
+            continue
+        text = chunk[begin:begin + int(lengths[i])].tobytes().decode(
+            "utf-8", "replace"
+        )
+        date_obj = parse(text)
+        if date_obj is None:
+            continue
+        if not utc:
+            date_obj = date_obj.replace(tzinfo=None)
+        epochs[i] = datetime_to_us(date_obj)
+        valid[i] = True
+    return epochs, valid
+
+
+def extract_timestamps(
+    buffer,
+    fmt: str = ISO_FORMAT,
+    offset: int = 0,
+    width: Optional[int] = None,
+    field: Optional[int] = None,
+    delimiter: Union[bytes, str] = b" ",
+    unit: str = "us",
+    utc: bool = True,
+    chunk_size: int = _EXTRACT_CHUNK_BYTES
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    📜 Extrai um timestamp por linha de um buffer de bytes (ex: log em mmap).
+
+    O buffer (`bytes`, `memoryview` ou `mmap`) é lido sem cópia com
+    `np.frombuffer`, em blocos de `chunk_size` bytes terminados em quebra
+    de linha, e as linhas nunca são decodificadas para `str`: o timestamp
+    de cada linha é localizado e convertido por posição fixa com NumPy
+    (mesmos caminhos de `parse_iso_many` e `parse_format_many`). Só os
+    valores fora desses caminhos são decodificados e passam pelo parser de
+    `compile_format`. A memória usada, além do resultado, fica limitada ao
+    tamanho do bloco.
+
+    Sem `field`, o timestamp começa no byte `offset` de cada linha; com
+    `field`, é o campo de número `field` (a partir de 0) separado por
+    `delimiter`. O timestamp ocupa `width` bytes ou, se `width` não for
+    informado, vai até o próximo `delimiter` (sem `field`, formatos de
+    largura fixa como "%Y-%m-%d %H:%M:%S" usam a própria largura, com 6
+    dígitos para %f).
+
+    Args:
+        buffer: Buffer de bytes com uma entrada por linha
+        fmt (str): Formato strftime ou "iso"
+        offset (int): Posição (em bytes) do timestamp em cada linha
+        width (Optional[int]): Largura (em bytes) do timestamp
+        field (Optional[int]): Número do campo com o timestamp
+        delimiter (Union[bytes, str]): Separador de campos (um byte)
+        unit (str): Unidade dos timestamps ('s', 'ms', 'us' ou 'ns')
+        utc (bool): Se False, ignora o offset de cada valor e usa o
+            horário de parede
+        chunk_size (int): Tamanho aproximado dos blocos lidos, em bytes
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Timestamps int64 (um por linha) e
+        máscara booleana com True para as linhas com timestamp válido; use
+        `timestamps[mascara]` nas funções de análise
+
+    Raises:
+        ValueError: Se o separador não tiver exatamente um byte ou se
+            chunk_size não for positivo
+    """
+    if isinstance(delimiter, str):
+        delimiter = delimiter.encode("utf-8")
+    if len(delimiter) != 1:
+        raise ValueError("O separador deve ter exatamente um byte")
+    if chunk_size < 1:
+        raise ValueError("chunk_size deve ser maior que zero")
+    if width is None and field is None and fmt != ISO_FORMAT:
+        layout = _fixed_layout(fmt, 6, True)
+        if layout is not None and layout[0] > 0:
+            width = layout[0]
+
+    data = np.frombuffer(buffer, dtype=np.uint8)
+    epochs, valid = [], []
+    position = 0
+    while position < len(data):
+        end = min(position + chunk_size, len(data))
+        while end < len(data):
+            # Estende o bloco até o fim da última linha completa
+            breaks = np.flatnonzero(data[end - 1:end - 1 + chunk_size] == 10)
+            if len(breaks):
+                end += int(breaks[0])
+                break
+            end = min(end + chunk_size, len(data))
+        chunk = data[position:end]
+        starts, ends = _line_bounds(chunk)
+        begins, lengths = _token_bounds(
+            chunk, starts, ends, offset, width, field, delimiter[0]
+        )
+        chunk_epochs, chunk_valid = _parse_tokens(
+            chunk, begins, lengths, fmt, utc
+        )
+        epochs.append(chunk_epochs)
+        valid.append(chunk_valid)
+        position = end
+
+    if not epochs:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=bool)
+    return us_to_unit(np.concatenate(epochs), unit), np.concatenate(valid)
+
+
+def parse_epochs(values, utc: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    ⚡ Converte datas, strings ISO 8601 ou arrays NumPy em microssegundos.
+
+    Arrays datetime64 são convertidos diretamente (NaT fica inválido) e
+    arrays de inteiros são tratados como microssegundos desde a época Unix;
+    os demais valores passam por `parse_iso_many`.
+
+    Args:
+        values: Datas, strings ISO 8601 ou array NumPy
+        utc (bool): Se False, usa o horário de parede de cada data
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Microssegundos int64 e máscara com
+        True para os valores válidos
+    """
+    if isinstance(values, list) and values and isinstance(
+        values[0], (np.integer, np.datetime64)
+    ):
+        # Listas de escalares NumPy (ex: blocos de um array) viram arrays
+        array = np.asarray(values)
+        if array.dtype != object:
+            values = array
+    if isinstance(values, np.ndarray):
+        if np.issubdtype(values.dtype, np.datetime64):
+            valid = ~np.isnat(values)
+            epochs = values.astype("datetime64[us]").astype(np.int64)
+            return np.where(valid, epochs, 0), valid
+        if np.issubdtype(values.dtype, np.integer):
+            return values.astype(np.int64), np.ones(len(values), dtype=bool)
+    return parse_iso_many(values, utc=utc)
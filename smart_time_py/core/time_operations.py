@@ -1,9 +1,26 @@
 """
 Módulo de operações temporais
 """
-from datetime import datetime
+from datetime import date, datetime
 from dateutil.relativedelta import relativedelta
-from typing import Union, Literal
+from typing import Iterable, List, Literal, Optional, Tuple, Union
+
+import numpy as np
+
+from smart_time_py.core.epoch import (US_PER_DAY, US_PER_HOUR,
+                                      US_PER_SECOND, civil_from_days,
+                                      datetime_to_us, datetimes_to_us,
+                                      days_from_civil, to_epoch)
+
+# Dias de cada mês em anos não bissextos
+_MONTH_DAYS = np.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+
+# Divisores de `calculate_difference_many` aplicados aos segundos
+_SECONDS_PER_UNIT = {"seconds": 1, "minutes": 60, "hours": 3600}
+
+# Limites de `datetime` em microssegundos desde a época
+_MIN_US = datetime_to_us(datetime.min)
+_MAX_US = datetime_to_us(datetime.max)
 
 
 def add_time(
@@ -74,6 +91,174 @@ def subtract_time(
     )
 
 
+def _days_in_months(year, month):
+    """Número de dias de cada mês (arrays de ano e mês)."""
+    leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+    return _MONTH_DAYS[month - 1] + ((month == 2) & leap)
+
+
+def _shift_epochs(epochs: np.ndarray, days, months, years, hours, minutes,
+                  seconds) -> np.ndarray:
+    """
+    Aplica a aritmética do `relativedelta` a microssegundos de parede.
+
+    Anos e meses são somados aos componentes (ano, mês) e o dia é limitado
+    ao fim do mês resultante; dias, horas, minutos e segundos são somados
+    depois, como inteiros.
+    """
+    day_index, time_of_day = np.divmod(epochs, US_PER_DAY)
+    total_months = np.asarray(years, dtype=np.int64) * 12 + \
+        np.asarray(months, dtype=np.int64)
+    if np.any(total_months != 0):
+        year, month, day = civil_from_days(day_index)
+        index = year * 12 + month - 1 + total_months
+        year, month = index // 12, index % 12 + 1
+        day = np.minimum(day, _days_in_months(year, month))
+        day_index = days_from_civil(year, month, day)
+
+    offset = np.asarray(days, dtype=np.int64) * US_PER_DAY + \
+        np.asarray(hours, dtype=np.int64) * US_PER_HOUR + \
+        np.asarray(minutes, dtype=np.int64) * 60 * US_PER_SECOND + \
+        np.asarray(seconds, dtype=np.int64) * US_PER_SECOND
+    return day_index * US_PER_DAY + time_of_day + offset
+
+
+def _wall_epochs(values: list) -> np.ndarray:
+    """Converte datas em microssegundos pelo horário de parede."""
+    epochs = datetimes_to_us(values, utc=False)
+    if epochs is not None:
+        return epochs
+    epochs = np.zeros(len(values), dtype=np.int64)
+    for i, value in enumerate(values):
+        if not isinstance(value, date):
+            raise ValueError(f"Data inválida: {value!r}")
+        if isinstance(value, datetime):
+            value = value.replace(tzinfo=None)
+        epochs[i] = datetime_to_us(value)
+    return epochs
+
+
+def _restore_dates(values: list, epochs: np.ndarray,
+                   has_time: bool) -> List[datetime]:
+    """
+    Converte os resultados de volta para o tipo de cada data original,
+    mantendo o `tzinfo` (como faz o `relativedelta`).
+    """
+    if len(epochs) and (epochs.min() < _MIN_US or epochs.max() > _MAX_US):
+        raise ValueError("Data fora do intervalo suportado")
+    shifted = epochs.astype("datetime64[us]").astype(object).tolist()
+    if all(type(value) is datetime and value.tzinfo is None
+           for value in values):
+        return shifted
+    restored = []
+    for value, result in zip(values, shifted):
+        if isinstance(value, datetime):
+            result = result.replace(tzinfo=value.tzinfo)
+        elif not has_time:
+            result = result.date()
+        restored.append(result)
+    return restored
+
+
+def add_time_many(
+    dates: Union[Iterable[datetime], np.ndarray],
+    days: Union[int, np.ndarray] = 0,
+    months: Union[int, np.ndarray] = 0,
+    years: Union[int, np.ndarray] = 0,
+    hours: Union[int, np.ndarray] = 0,
+    minutes: Union[int, np.ndarray] = 0,
+    seconds: Union[int, np.ndarray] = 0
+) -> Union[List[datetime], np.ndarray]:
+    """
+    ⚡ Adiciona tempo a muitas datas de uma vez.
+
+    Equivale a `add_time` em cada data (mesma semântica do `relativedelta`,
+    inclusive o limite no fim do mês: 31/01 + 1 mês = 28/02), mas sem criar
+    um `relativedelta` por data: anos e meses são somados aos componentes
+    ano/mês com NumPy e o restante como inteiros. Os deslocamentos podem
+    ser números ou arrays com um valor por data.
+
+    Args:
+        dates: Datas, array datetime64 ou array int64 em microssegundos
+        days: Dias a adicionar
+        months: Meses a adicionar
+        years: Anos a adicionar
+        hours: Horas a adicionar
+        minutes: Minutos a adicionar
+        seconds: Segundos a adicionar
+
+    Returns:
+        Array do mesmo tipo para arrays NumPy (datetime64[us] ou int64, NaT
+        preservado) ou lista de datas, com o `tzinfo` original, para os
+        demais iteráveis
+
+    Raises:
+        ValueError: Se um valor não for uma data ou se o resultado sair do
+            intervalo suportado por `datetime`
+    """
+    offsets = (days, months, years, hours, minutes, seconds)
+    if isinstance(dates, np.ndarray) and dates.dtype != object:
+        if np.issubdtype(dates.dtype, np.integer):
+            return _shift_epochs(dates.astype(np.int64), *offsets)
+        if not np.issubdtype(dates.dtype, np.datetime64):
+            raise ValueError(
+                f"Array com dtype '{dates.dtype}' não contém datas"
+            )
+        missing = np.isnat(dates)
+        epochs = dates.astype("datetime64[us]").astype(np.int64)
+        shifted = _shift_epochs(epochs, *offsets).astype("datetime64[us]")
+        if missing.any():
+            shifted[missing] = np.datetime64("NaT")
+        return shifted
+
+    values = list(dates)
+    shifted = _shift_epochs(_wall_epochs(values), *offsets)
+    has_time = any(np.any(np.asarray(offset) != 0)
+                   for offset in (hours, minutes, seconds))
+    return _restore_dates(values, shifted, has_time)
+
+
+def subtract_time_many(
+    dates: Union[Iterable[datetime], np.ndarray],
+    days: Union[int, np.ndarray] = 0,
+    months: Union[int, np.ndarray] = 0,
+    years: Union[int, np.ndarray] = 0,
+    hours: Union[int, np.ndarray] = 0,
+    minutes: Union[int, np.ndarray] = 0,
+    seconds: Union[int, np.ndarray] = 0
+) -> Union[List[datetime], np.ndarray]:
+    """
+    ⚡ Subtrai tempo de muitas datas de uma vez.
+
+    Equivale a `subtract_time` em cada data; ver `add_time_many`.
+
+    Args:
+        dates: Datas, array datetime64 ou array int64 em microssegundos
+        days: Dias a subtrair
+        months: Meses a subtrair
+        years: Anos a subtrair
+        hours: Horas a subtrair
+        minutes: Minutos a subtrair
+        seconds: Segundos a subtrair
+
+    Returns:
+        Mesmo tipo de retorno de `add_time_many`
+
+    Raises:
+        ValueError: Se um valor não for uma data ou se o resultado sair do
+            intervalo suportado por `datetime`
+    """
+    return add_time_many(
+        dates,
+        days=-np.asarray(days),
+        months=-np.asarray(months),
+        years=-np.asarray(years),
+        hours=-np.asarray(hours),
+        minutes=-np.asarray(minutes),
+        seconds=-np.asarray(seconds)
+    )
+
+
 def calculate_difference(
     date1: datetime,
     date2: datetime,
@@ -102,13 +287,116 @@ def calculate_difference(
         return delta.total_seconds() / 3600
     elif unit == 'weeks':
         return delta.days / 7
-    elif unit == 'months':
-        return (date2.year - date1.year) * 12 + (date2.month - date1.month)
-    elif unit == 'years':
-        return date2.year - date1.year
+    elif unit in ('months', 'years'):
+        # Meses inteiros de calendário, contados como o relativedelta
+        diff = relativedelta(max(date1, date2), min(date1, date2))
+        return diff.years * 12 + diff.months if unit == 'months' \
+            else diff.years
+    else:
+        raise ValueError(f"Unidade '{unit}' não suportada")
+
+
+def _difference_epochs(
+    values,
+    wall: bool = False
+) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    Converte um lado de `calculate_difference_many` em microssegundos (UTC,
+    ou horário de parede com `wall`) e devolve também a máscara de NaT.
+    """
+    if isinstance(values, np.ndarray) and values.dtype != object:
+        if np.issubdtype(values.dtype, np.integer):
+            return values.astype(np.int64), None
+        if not np.issubdtype(values.dtype, np.datetime64):
+            raise ValueError(
+                f"Array com dtype '{values.dtype}' não contém datas"
+            )
+        missing = np.isnat(values)
+        epochs = values.astype("datetime64[us]").astype(np.int64)
+        return np.where(missing, 0, epochs), missing
+    if not wall:
+        return to_epoch(values, "us"), None
+    if isinstance(values, date):
+        return _wall_epochs([values])[0], None
+    return _wall_epochs(list(values)), None
+
+
+def _whole_months(start: np.ndarray, end: np.ndarray) -> np.ndarray:
+    """Meses inteiros de calendário de `start` até `end` (start <= end)."""
+    start_days, start_time = np.divmod(start, US_PER_DAY)
+    end_days, end_time = np.divmod(end, US_PER_DAY)
+    start_year, start_month, start_day = civil_from_days(start_days)
+    end_year, end_month, end_day = civil_from_days(end_days)
+    months = (end_year - start_year) * 12 + end_month - start_month
+
+    # `start` deslocado de `months` meses cai no mês de `end`, com o dia
+    # limitado ao fim do mês; se passar de `end`, o último mês não fechou
+    day = np.minimum(start_day, _days_in_months(end_year, end_month))
+    incomplete = (day > end_day) | \
+        ((day == end_day) & (start_time > end_time))
+    return months - incomplete
+
+
+def calculate_difference_many(
+    dates1: Union[Iterable[datetime], np.ndarray],
+    dates2: Union[Iterable[datetime], np.ndarray],
+    unit: Literal['days', 'seconds', 'minutes', 'hours', 'weeks', 'months', 'years'] = 'days'  # noqa501
+) -> np.ndarray:
+    """
+    ⚡ Calcula a diferença entre muitos pares de datas de uma vez.
+
+    Equivale a `calculate_difference` em cada par, com NumPy. Meses e anos
+    são diferenças exatas de calendário (31/01 a 28/02 de 2023 é 1 mês,
+    mas 31/01 a 28/02 de 2024 é 0), calculadas como no `relativedelta`
+    sobre o horário de parede de cada data, com o mesmo limite de fim de
+    mês de `add_time_many`. NaT em arrays datetime64 vira NaN no resultado,
+    como `add_time_many` preserva o NaT.
+
+    Args:
+        dates1: Primeiras datas (array datetime64, array int64 em
+            microssegundos, lista de datas ou uma única data)
+        dates2: Segundas datas, no mesmo formato
+        unit (str): Unidade de medida ('days', 'seconds', 'minutes',
+            'hours', 'weeks', 'months', 'years')
+
+    Returns:
+        np.ndarray: Diferenças absolutas; int64 para dias, meses e anos e
+        float64 para as demais unidades (ou se houver NaT)
+
+    Raises:
+        ValueError: Se a unidade não for suportada ou se um valor não for
+            uma data
+    """
+    wall = unit in ('months', 'years')
+    first, first_missing = _difference_epochs(dates1, wall)
+    second, second_missing = _difference_epochs(dates2, wall)
+    delta = np.abs(second - first)
+
+    if unit == 'days':
+        result = delta // US_PER_DAY
+    elif unit == 'weeks':
+        result = delta // US_PER_DAY / 7
+    elif unit in _SECONDS_PER_UNIT:
+        result = delta / US_PER_SECOND
+        if _SECONDS_PER_UNIT[unit] != 1:
+            result = result / _SECONDS_PER_UNIT[unit]
+    elif wall:
+        months = _whole_months(np.minimum(first, second),
+                               np.maximum(first, second))
+        result = months if unit == 'months' else months // 12
     else:
         raise ValueError(f"Unidade '{unit}' não suportada")
 
+    result = np.asarray(result)
+    missing = np.zeros(result.shape, dtype=bool)
+    for side in (first_missing, second_missing):
+        if side is not None:
+            missing |= side
+    if missing.any():
+        result = result.astype(np.float64)
+        result[missing] = np.nan
+    return result
+
 
 def get_week_number(date_obj: datetime) -> int:
     """
@@ -1,9 +1,18 @@
 """
 Módulo de validação de datas e tempos
 """
+from dataclasses import dataclass, field
 from datetime import datetime
 from dateutil import parser
-from typing import Optional, Union
+from itertools import islice
+from typing import Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from smart_time_py.core.parsing import (ISO_FORMAT, compile_format,
+                                        format_regex, parse_format_many)
+
+DEFAULT_VALIDATION_CHUNK = 65_536
 
 
 def is_valid_date(date_str: str, date_format: str) -> bool:
@@ -17,11 +26,7 @@ def is_valid_date(date_str: str, date_format: str) -> bool:
     Returns:
         bool: True se a string for válida, False caso contrário
     """
-    try:
-        datetime.strptime(date_str, date_format)
-        return True
-    except ValueError:
-        return False
+    return compile_format(date_format)(date_str) is not None
 
 
 def auto_validate_date(date_str: str) -> bool:
@@ -84,11 +89,7 @@ def validate_time_string(time_str: str, time_format: str = "%H:%M:%S") -> bool:
     Returns:
         bool: True se o horário for válido, False caso contrário
     """
-    try:
-        datetime.strptime(time_str, time_format)
-        return True
-    except ValueError:
-        return False
+    return compile_format(time_format)(time_str) is not None
 
 
 def validate_datetime_string(
@@ -105,8 +106,107 @@ def validate_datetime_string(
     Returns:
         bool: True se a data e hora forem válidas, False caso contrário
     """
-    try:
-        datetime.strptime(datetime_str, datetime_format)
-        return True
-    except ValueError:
-        return False 
\ No newline at end of file
+    return compile_format(datetime_format)(datetime_str) is not None
+
+
+@dataclass
+class ValidationReport:
+    """
+    Resultado de `validate_many`.
+
+    A validade de cada linha fica em um bitmap compacto (`np.packbits`, um
+    bit por linha, 1 para válida) e as primeiras linhas inválidas ficam em
+    `errors` como pares (posição, motivo).
+    """
+    total: int = 0
+    valid: int = 0
+    bitmap: np.ndarray = field(
+        default_factory=lambda: np.zeros(0, dtype=np.uint8)
+    )
+    errors: List[Tuple[int, Optional[str]]] = field(default_factory=list)
+
+    @property
+    def invalid(self) -> int:
+        """Retorna a quantidade de linhas inválidas."""
+        return self.total - self.valid
+
+    def mask(self) -> np.ndarray:
+        """Retorna a máscara booleana (True para as linhas válidas)."""
+        return np.unpackbits(self.bitmap, count=self.total).astype(bool)
+
+    def invalid_positions(self) -> np.ndarray:
+        """Retorna as posições de todas as linhas inválidas."""
+        return np.flatnonzero(~self.mask())
+
+
+def _invalid_reason(value, date_format: str) -> str:
+    """Explica por que um valor foi rejeitado, sem lançar exceções."""
+    if not isinstance(value, str):
+        return f"Valor do tipo '{type(value).__name__}' não é uma string"
+    if date_format == ISO_FORMAT:
+        return "Não é uma data ISO 8601 válida"
+    regex = format_regex(date_format)
+    if regex is not None and regex.fullmatch(value):
+        return "Data ou hora inexistente"
+    return f"Não corresponde ao formato '{date_format}'"
+
+
+def validate_many(
+    values: Iterable[str],
+    date_format: str = "%Y-%m-%d",
+    max_errors: Optional[int] = 1000,
+    reasons: bool = True,
+    chunk_size: int = DEFAULT_VALIDATION_CHUNK
+) -> ValidationReport:
+    """
+    ✅ Valida muitas strings de data de uma vez, em streaming.
+
+    A entrada é lida em blocos e validada com `parse_format_many` (leitura
+    por posição com NumPy e o parser de `compile_format`), sem uma exceção
+    por linha inválida. Só o bitmap de validade (um bit por linha) e as
+    primeiras `max_errors` linhas inválidas ficam em memória.
+
+    Args:
+        values (Iterable[str]): Strings de data (ex: linhas de um arquivo,
+            sem a quebra de linha)
+        date_format (str): Formato esperado (ex: "%Y-%m-%d") ou "iso"
+        max_errors (Optional[int]): Quantidade máxima de erros guardados
+            em `errors` (None para todos)
+        reasons (bool): Se False, guarda só a posição de cada erro
+        chunk_size (int): Quantidade de linhas validadas por bloco
+
+    Returns:
+        ValidationReport: Totais, bitmap de validade e linhas inválidas
+
+    Raises:
+        ValueError: Se chunk_size não for positivo
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size deve ser maior que zero")
+    # Blocos múltiplos de 8 mantêm os bytes do bitmap alinhados
+    chunk_size += -chunk_size % 8
+
+    report = ValidationReport()
+    bitmaps = []
+    iterator = iter(values)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            break
+        valid = parse_format_many(chunk, date_format)[1]
+        bitmaps.append(np.packbits(valid))
+
+        invalid = np.flatnonzero(~valid)
+        room = len(invalid) if max_errors is None else \
+            max_errors - len(report.errors)
+        for i in invalid[:max(room, 0)].tolist():
+            reason = _invalid_reason(chunk[i], date_format) \
+                if reasons else None
+            report.errors.append((report.total + i, reason))
+
+        report.total += len(chunk)
+        report.valid += len(chunk) - len(invalid)
+
+    if bitmaps:
+        report.bitmap = np.concatenate(bitmaps)
+    return report
\ No newline at end of file
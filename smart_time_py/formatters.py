@@ -2,9 +2,29 @@
 Módulo de formatação de datas e tempos
 """
 from datetime import datetime, date, timedelta
-from typing import Optional, Union
+from functools import lru_cache
+from itertools import islice
+from typing import IO, Dict, Iterable, List, Optional, Tuple, Union
+import io
 import locale
-from babel.dates import format_date, format_datetime, format_time
+import re
+
+import numpy as np
+from babel.dates import (format_date, format_datetime, format_time,
+                         get_day_names, get_month_names)
+
+from smart_time_py.core.epoch import (EPOCH, US_PER_DAY, US_PER_HOUR,
+                                      US_PER_SECOND, civil_from_days,
+                                      datetime_to_us, datetimes_to_us,
+                                      days_from_civil)
+from smart_time_py.core.parsing import ISO_FORMAT, parse_epochs
+
+# Diretivas numéricas escritas de forma vetorizada por `format_many`
+_FIELD_WIDTHS = {"Y": 4, "y": 2, "m": 2, "d": 2, "j": 3, "H": 2, "M": 2,
+                 "S": 2, "f": 6}
+_FORMAT_TOKEN = re.compile(r"%(.)|([^%]+)", re.DOTALL)
+_ISO_SECONDS = "%Y-%m-%dT%H:%M:%S"
+_FORMAT_CHUNK_SIZE = 65_536
 
 
 def format_relative(
@@ -157,4 +177,273 @@ def format_short(
     if include_time:
         return format_datetime(date_obj, format="short", locale=locale_str)
     else:
-        return format_date(date_obj, format="short", locale=locale_str) 
\ No newline at end of file
+        return format_date(date_obj, format="short", locale=locale_str)
+
+
+def format_seasonality(
+    seasonality: Dict,
+    locale_str: str = "pt_BR"
+) -> Dict[str, Dict[str, int]]:
+    """
+    Aplica nomes localizados ao resultado de `analyze_seasonality`.
+
+    Args:
+        seasonality (Dict): Resultado de `analyze_seasonality`
+        locale_str (str): Localidade para formatação
+
+    Returns:
+        Dict[str, Dict[str, int]]: Contagens com nomes de meses, dias da semana
+        e horas ("HH:00") como chaves
+    """
+    if not seasonality:
+        return {}
+
+    months = get_month_names("wide", locale=locale_str)
+    days = get_day_names("wide", locale=locale_str)
+
+    def hour_label(hour: int) -> str:
+        return f"{hour:02d}:00"
+
+    weekday_hour = seasonality["weekday_hour"]
+    return {
+        "monthly": {
+            months[month]: count
+            for month, count in seasonality["monthly"].items()
+        },
+        "weekly": {
+            days[day]: count for day, count in seasonality["weekly"].items()
+        },
+        "daily": {
+            hour_label(hour): count
+            for hour, count in seasonality["daily"].items()
+        },
+        "weekday_hour": {
+            days[day]: {
+                hour_label(hour): int(count)
+                for hour, count in enumerate(weekday_hour[day])
+            }
+            for day in range(len(weekday_hour))
+        }
+    }
+
+
+@lru_cache(maxsize=128)
+def _compile_writers(fmt: str) -> Optional[Tuple[tuple, int]]:
+    """
+    Compila um formato strftime em uma sequência de escritores de campo
+    (diretiva, posição, largura) e literais (bytes UTF-8, posição), com a
+    largura total de cada linha. Devolve None para formatos com diretivas
+    não numéricas (nomes de mês, %z, %p...).
+    """
+    if "\n" in fmt:
+        return None
+    writers, position = [], 0
+    end = 0
+    for match in _FORMAT_TOKEN.finditer(fmt):
+        if match.start() != end:
+            return None
+        end = match.end()
+        directive, literal = match.groups()
+        if directive == "%":
+            literal = "%"
+        elif directive is not None:
+            if directive not in _FIELD_WIDTHS:
+                return None
+            width = _FIELD_WIDTHS[directive]
+            writers.append((directive, position, width))
+            position += width
+            continue
+        data = literal.encode("utf-8")
+        writers.append((data, position, len(data)))
+        position += len(data)
+    if end != len(fmt):
+        return None
+    return tuple(writers), position
+
+
+def _epoch_fields(epochs: np.ndarray) -> Dict[str, np.ndarray]:
+    """Calcula os campos numéricos de strftime a partir de microssegundos."""
+    days, rest = np.divmod(epochs, US_PER_DAY)
+    year, month, day = civil_from_days(days)
+    return {
+        "Y": year,
+        "y": year % 100,
+        "m": month,
+        "d": day,
+        "j": days - days_from_civil(year, 1, 1) + 1,
+        "H": rest // US_PER_HOUR,
+        "M": rest // 60_000_000 % 60,
+        "S": rest // US_PER_SECOND % 60,
+        "f": rest % US_PER_SECOND,
+    }
+
+
+def _wall_epochs(values: list) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Converte datas em microssegundos pelo horário de parede, com um caminho
+    rápido para listas só de datetimes sem fuso horário.
+    """
+    n = len(values)
+    epochs = datetimes_to_us(values, utc=False)
+    if epochs is not None:
+        return epochs, np.ones(n, dtype=bool)
+    epochs = np.zeros(n, dtype=np.int64)
+    valid = np.zeros(n, dtype=bool)
+    for i, value in enumerate(values):
+        if isinstance(value, datetime):
+            epochs[i] = datetime_to_us(value.replace(tzinfo=None))
+        elif isinstance(value, date):
+            epochs[i] = datetime_to_us(value)
+        else:
+            continue
+        valid[i] = True
+    return epochs, valid
+
+
+def _write_rows(fields: Dict[str, np.ndarray], writers, width: int) -> str:
+    """
+    Escreve todas as linhas em um único buffer de bytes, coluna a coluna,
+    com uma quebra de linha ao final de cada uma.
+    """
+    n = len(fields["Y"])
+    buffer = np.empty((n, width + 1), dtype=np.uint8)
+    buffer[:, width] = 10
+    for writer, position, size in writers:
+        if isinstance(writer, bytes):
+            buffer[:, position:position + size] = np.frombuffer(
+                writer, dtype=np.uint8
+            )
+            continue
+        value = fields[writer]
+        for offset in range(size - 1, -1, -1):
+            value, digit = np.divmod(value, 10)
+            buffer[:, position + offset] = digit + 48
+    return buffer.tobytes().decode("utf-8")
+
+
+def _format_objects(values: list, fmt: str) -> List[str]:
+    """Formata valor a valor, com strftime/isoformat (caminho genérico)."""
+    rows = []
+    for value in values:
+        if isinstance(value, date) and not isinstance(value, datetime):
+            value = datetime.combine(value, datetime.min.time())
+        if not isinstance(value, datetime):
+            rows.append("")
+        elif fmt == ISO_FORMAT:
+            rows.append(value.isoformat())
+        else:
+            rows.append(value.strftime(fmt))
+    return rows
+
+
+def _format_epochs(epochs: np.ndarray, valid: np.ndarray, fmt: str):
+    """
+    Formata um bloco de microssegundos. Devolve o texto com uma linha por
+    valor, quando todas as linhas usam o mesmo layout, ou a lista de
+    strings.
+    """
+    if fmt == ISO_FORMAT:
+        # isoformat omite a fração de segundos quando ela é zero
+        fraction = epochs % US_PER_SECOND != 0
+        layouts = [(_ISO_SECONDS, ~fraction), (_ISO_SECONDS + ".%f", fraction)]
+    else:
+        layouts = [(fmt, np.ones(len(epochs), dtype=bool))]
+
+    fields = _epoch_fields(epochs)
+    # strftime não completa com zeros anos menores que 1000 em %Y
+    slow = ~valid | ((fields["Y"] < 1000) & (fmt != ISO_FORMAT))
+    for layout, rows in layouts:
+        if rows.all() and not slow.any():
+            writers, width = _compile_writers(layout)
+            return _write_rows(fields, writers, width)
+
+    result = [""] * len(epochs)
+    for layout, rows in layouts:
+        index = np.flatnonzero(rows & ~slow)
+        if len(index):
+            writers, width = _compile_writers(layout)
+            subset = {name: value[index] for name, value in fields.items()}
+            text = _write_rows(subset, writers, width)
+            for i, row in zip(index.tolist(), text.split("\n")):
+                result[i] = row
+    for i in np.flatnonzero(slow & valid).tolist():
+        value = EPOCH + timedelta(microseconds=int(epochs[i]))
+        result[i] = value.strftime(fmt)
+    return result
+
+
+def format_many(
+    values: Union[Iterable[Union[date, datetime]], np.ndarray],
+    fmt: str = ISO_FORMAT,
+    out: Optional[IO] = None
+) -> Union[List[str], int]:
+    """
+    Formata muitas datas de uma vez.
+
+    O formato é compilado (e guardado em cache) em uma sequência de
+    escritores de campo: para formatos numéricos (`%Y`, `%y`, `%m`, `%d`,
+    `%j`, `%H`, `%M`, `%S`, `%f` e literais) e para "iso", os campos são
+    calculados com NumPy e escritos coluna a coluna em um buffer de bytes,
+    sem chamar `strftime` por valor. Os demais formatos e as datas com fuso
+    horário no modo "iso" usam `strftime`/`isoformat` valor a valor. Datas
+    com fuso horário são formatadas pelo horário de parede, como no
+    `strftime`. Valores inválidos (None, NaT) viram strings vazias.
+
+    Args:
+        values (Union[Iterable[Union[date, datetime]], np.ndarray]): Datas,
+            array datetime64 ou array de inteiros em microssegundos desde a
+            época Unix (UTC)
+        fmt (str): Formato strftime ou "iso" (mesmo resultado de
+            `format_iso`)
+        out (Optional[IO]): Arquivo ou buffer (texto ou binário) onde as
+            strings são escritas, uma por linha
+
+    Returns:
+        Union[List[str], int]: Lista de strings formatadas ou, com `out`,
+        a quantidade de linhas escritas
+    """
+    vectorized = fmt == ISO_FORMAT or _compile_writers(fmt) is not None
+    binary = out is not None and not isinstance(out, io.TextIOBase)
+    if isinstance(values, np.ndarray) and values.dtype != object:
+        chunks = (
+            values[i:i + _FORMAT_CHUNK_SIZE]
+            for i in range(0, len(values), _FORMAT_CHUNK_SIZE)
+        )
+    else:
+        iterator = iter(values)
+        chunks = iter(lambda: list(islice(iterator, _FORMAT_CHUNK_SIZE)), [])
+
+    result, written = [], 0
+    for chunk in chunks:
+        if isinstance(chunk, list) and (not vectorized or (
+            fmt == ISO_FORMAT
+            and any(getattr(value, "tzinfo", None) is not None
+                    for value in chunk)
+        )):
+            rows = _format_objects(chunk, fmt)
+        elif isinstance(chunk, np.ndarray) and not vectorized:
+            epochs, valid = parse_epochs(chunk)
+            rows = _format_objects([
+                EPOCH + timedelta(microseconds=int(us)) if ok else None
+                for us, ok in zip(epochs.tolist(), valid.tolist())
+            ], fmt)
+        else:
+            if isinstance(chunk, list):
+                epochs, valid = _wall_epochs(chunk)
+            else:
+                epochs, valid = parse_epochs(chunk)
+            rows = _format_epochs(epochs, valid, fmt)
+
+        if isinstance(rows, str):
+            text = rows
+            if out is None:
+                rows = text.split("\n")
+                rows.pop()
+        elif out is not None:
+            text = "".join(row + "\n" for row in rows)
+        if out is None:
+            result.extend(rows)
+            continue
+        out.write(text.encode("utf-8") if binary else text)
+        written += len(chunk)
+    return result if out is None else written
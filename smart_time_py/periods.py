@@ -1,11 +1,21 @@
 """
 Módulo de períodos e intervalos de tempo
 """
+import heapq
 from datetime import datetime, date, timedelta
-from typing import Optional, Union, List, Dict
+from itertools import islice
+from typing import Optional, Union, List, Dict, Iterable, Iterator, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
+import numpy as np
+
+from smart_time_py.core.epoch import EPOCH, datetime_to_us
+from smart_time_py.core.parsing import parse_epochs
+
+# Quantidade de timestamps lidos por bloco no caminho de streaming
+_GAP_CHUNK_SIZE = 65_536
+
 
 class PeriodType(Enum):
     """Tipos de períodos temporais"""
@@ -237,4 +247,253 @@ def get_overlapping_periods(
     if current_overlap:
         overlapping.append(current_overlap)
     
-    return overlapping 
\ No newline at end of file
+    return overlapping 
+
+
+def _gap_periods(
+    epochs: np.ndarray,
+    max_gap_us: int
+) -> List[TimePeriod]:
+    """Encontra os intervalos maiores que `max_gap_us` em epochs ordenados."""
+    found = np.flatnonzero(np.diff(epochs) > max_gap_us)
+    one_us = timedelta(microseconds=1)
+    return [
+        TimePeriod(start=EPOCH + int(epochs[i]) * one_us,
+                   end=EPOCH + int(epochs[i + 1]) * one_us)
+        for i in found.tolist()
+    ]
+
+
+def find_gaps(
+    timestamps: Union[Iterable[Union[datetime, str]], np.ndarray],
+    max_gap: timedelta,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None
+) -> List[TimePeriod]:
+    """
+    Encontra os períodos sem eventos maiores que `max_gap`.
+
+    Útil para detectar falhas em fluxos de heartbeat: para uma cadência
+    esperada de um evento por minuto, `max_gap=timedelta(minutes=3)` aponta
+    os trechos em que três ou mais batidas seguidas se perderam. Listas e
+    arrays NumPy são processados de uma vez com `np.diff`; outros iteráveis
+    (geradores, arquivos) são lidos em blocos, sem materializar o fluxo.
+
+    Args:
+        timestamps: Datas (datetime, strings ISO 8601 ou array NumPy de
+            datetime64/microssegundos)
+        max_gap (timedelta): Maior intervalo aceito entre eventos
+        start (datetime): Início da observação; um intervalo entre ele e o
+            primeiro evento também conta e eventos anteriores são ignorados
+            (opcional)
+        end (datetime): Fim da observação; o intervalo entre o último evento
+            e ele também conta e eventos posteriores são ignorados
+            (opcional)
+
+    Returns:
+        List[TimePeriod]: Períodos sem eventos, em UTC e em ordem
+        cronológica
+
+    Raises:
+        ValueError: Se `max_gap` não for positivo ou se um fluxo não
+        estiver em ordem cronológica
+    """
+    if max_gap <= timedelta(0):
+        raise ValueError("O intervalo máximo deve ser positivo")
+    max_gap_us = max_gap // timedelta(microseconds=1)
+    head = [] if start is None else [datetime_to_us(start)]
+    tail = [] if end is None else [datetime_to_us(end)]
+    # Eventos fora de [start, end] são trazidos para as bordas, então não
+    # geram intervalos fora da janela de observação
+    low = head[0] if head else None
+    high = tail[0] if tail else None
+
+    if isinstance(timestamps, (list, tuple, np.ndarray)):
+        epochs, valid = parse_epochs(timestamps)
+        epochs = epochs[valid]
+        if low is not None or high is not None:
+            epochs = np.clip(epochs, low, high)
+        epochs = np.sort(epochs)
+        return _gap_periods(np.r_[head, epochs, tail].astype(np.int64),
+                            max_gap_us)
+
+    gaps = []
+    iterator = iter(timestamps)
+    previous = head
+    while True:
+        chunk = list(islice(iterator, _GAP_CHUNK_SIZE))
+        if not chunk:
+            break
+        epochs, valid = parse_epochs(chunk)
+        epochs = epochs[valid]
+        if low is not None or high is not None:
+            epochs = np.clip(epochs, low, high)
+        epochs = np.r_[previous, epochs].astype(np.int64)
+        if len(epochs) and (np.diff(epochs) < 0).any():
+            raise ValueError("As datas devem estar em ordem cronológica")
+        gaps.extend(_gap_periods(epochs, max_gap_us))
+        previous = epochs[-1:]
+
+    gaps.extend(_gap_periods(np.r_[previous, tail].astype(np.int64),
+                             max_gap_us))
+    return gaps
+
+
+def _period_epochs(
+    periods: Union[List[TimePeriod], Tuple[np.ndarray, np.ndarray]]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Converte períodos (ou um par de arrays início/fim) em microssegundos."""
+    if isinstance(periods, tuple):
+        starts, ends = (parse_epochs(np.asarray(values))[0]
+                        for values in periods)
+        return starts, ends
+    starts = np.fromiter((datetime_to_us(p.start) for p in periods),
+                         dtype=np.int64, count=len(periods))
+    ends = np.fromiter((datetime_to_us(p.end) for p in periods),
+                       dtype=np.int64, count=len(periods))
+    return starts, ends
+
+
+def utilization(
+    periods: Union[List[TimePeriod], Tuple[np.ndarray, np.ndarray]],
+    bucket: timedelta,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Calcula a ocupação ao longo do tempo de um conjunto de períodos.
+
+    Em vez de testar cada período contra cada intervalo, os inícios (+1) e
+    fins (-1) são ordenados junto com as bordas dos intervalos e a
+    concorrência é acumulada em uma única varredura (`np.cumsum`). Os
+    períodos são tratados como semiabertos: uma reserva que termina às 10h
+    não concorre com outra que começa às 10h.
+
+    Args:
+        periods: Lista de TimePeriod ou um par (inícios, fins) de arrays
+            NumPy datetime64/microssegundos
+        bucket (timedelta): Largura de cada intervalo
+        start (datetime): Início da linha do tempo (padrão: primeiro início)
+        end (datetime): Fim da linha do tempo (padrão: último fim)
+
+    Returns:
+        Dict[str, np.ndarray]: Arrays com o início de cada intervalo
+        ('start', datetime64[us] em UTC), o tempo coberto por ao menos um
+        período ('covered', timedelta64[us]), a concorrência máxima
+        ('peak') e a concorrência média ('average')
+
+    Raises:
+        ValueError: Se a largura dos intervalos não for positiva
+    """
+    if bucket <= timedelta(0):
+        raise ValueError("A largura dos intervalos deve ser positiva")
+    width = bucket // timedelta(microseconds=1)
+    starts, ends = _period_epochs(periods)
+
+    low = int(starts.min()) if start is None and len(starts) else None
+    high = int(ends.max()) if end is None and len(ends) else None
+    low = datetime_to_us(start) if start is not None else low
+    high = datetime_to_us(end) if end is not None else high
+    if low is None or high is None or high <= low:
+        return {
+            "start": np.array([], dtype="datetime64[us]"),
+            "covered": np.array([], dtype="timedelta64[us]"),
+            "peak": np.array([], dtype=np.int64),
+            "average": np.array([], dtype=np.float64),
+        }
+
+    # Recorta os períodos na linha do tempo, alinhada à grade dos intervalos
+    origin = low // width * width
+    size = -(-(high - origin) // width)
+    starts = np.clip(starts, low, high)
+    ends = np.clip(ends, low, high)
+    keep = ends > starts
+    starts, ends = starts[keep], ends[keep]
+
+    # Eventos: +1 nos inícios, -1 nos fins e 0 nas bordas dos intervalos.
+    # No mesmo instante os fins vêm antes dos inícios (semiaberto)
+    borders = origin + width * np.arange(size + 1, dtype=np.int64)
+    times = np.concatenate([ends, starts, borders])
+    deltas = np.concatenate([
+        np.full(len(ends), -1, dtype=np.int64),
+        np.ones(len(starts), dtype=np.int64),
+        np.zeros(len(borders), dtype=np.int64),
+    ])
+    order = np.lexsort((deltas, times))
+    times, level = times[order], np.cumsum(deltas[order])
+
+    # Cada trecho entre eventos consecutivos tem concorrência constante e
+    # fica inteiro dentro de um intervalo
+    lengths = np.diff(times)
+    level = level[:-1]
+    segment = lengths > 0
+    lengths, level = lengths[segment], level[segment]
+    index = (times[:-1][segment] - origin) // width
+
+    covered = np.bincount(index, weights=lengths * (level > 0),
+                          minlength=size)
+    busy = np.bincount(index, weights=lengths * level, minlength=size)
+    peak = np.zeros(size, dtype=np.int64)
+    np.maximum.at(peak, index, level)
+
+    return {
+        "start": borders[:-1].astype("datetime64[us]"),
+        "covered": covered.astype(np.int64).astype("timedelta64[us]"),
+        "peak": peak,
+        "average": busy / width,
+    }
+
+
+def join_periods(
+    left: Union[List[TimePeriod], Tuple[np.ndarray, np.ndarray]],
+    right: Union[List[TimePeriod], Tuple[np.ndarray, np.ndarray]]
+) -> Iterator[Tuple[int, int, timedelta]]:
+    """
+    Encontra todos os pares de períodos sobrepostos entre dois conjuntos.
+
+    Os inícios dos dois lados são percorridos em ordem; cada lado mantém os
+    períodos ainda ativos em um heap pelo fim, e cada período que começa é
+    pareado apenas com os ativos do outro lado. O custo é
+    O((n + m) log(n + m) + k) para k pares, em vez de comparar todos com
+    todos, e os pares são gerados sob demanda. Como em
+    `TimePeriod.overlaps`, períodos que apenas se tocam também contam.
+
+    Args:
+        left: Lista de TimePeriod ou par (inícios, fins) de arrays NumPy
+        right: Lista de TimePeriod ou par (inícios, fins) de arrays NumPy
+
+    Returns:
+        Iterador de tuplas (índice em left, índice em right, duração da
+        sobreposição), na ordem em que os pares são encontrados
+    """
+    sides = [_period_epochs(left), _period_epochs(right)]
+    starts = np.concatenate([sides[0][0], sides[1][0]])
+    side = np.repeat([0, 1], [len(sides[0][0]), len(sides[1][0])])
+    index = np.concatenate([np.arange(len(sides[0][0])),
+                            np.arange(len(sides[1][0]))])
+    order = np.argsort(starts, kind="stable")
+
+    ends = [sides[0][1].tolist(), sides[1][1].tolist()]
+    begins = [sides[0][0].tolist(), sides[1][0].tolist()]
+    # Por lado: períodos ativos (índice -> fim) e heap (fim, índice)
+    active: List[Dict[int, int]] = [{}, {}]
+    heaps: List[List[Tuple[int, int]]] = [[], []]
+    one_us = timedelta(microseconds=1)
+
+    for position in order.tolist():
+        current, i = int(side[position]), int(index[position])
+        other = 1 - current
+        start, end = begins[current][i], ends[current][i]
+
+        # Descarta do outro lado os períodos que terminaram antes deste
+        other_heap, other_active = heaps[other], active[other]
+        while other_heap and other_heap[0][0] < start:
+            del other_active[heapq.heappop(other_heap)[1]]
+
+        for j, other_end in other_active.items():
+            overlap = (min(end, other_end)
+                       - max(start, begins[other][j])) * one_us
+            yield (i, j, overlap) if current == 0 else (j, i, overlap)
+
+        active[current][i] = end
+        heapq.heappush(heaps[current], (end, i))
@@ -2,10 +2,14 @@
 Módulo de manipulação de fusos horários
 """
 from datetime import datetime
-from typing import Optional, Dict, List
+from functools import lru_cache
+from typing import Optional, Dict, List, Tuple
+import numpy as np
 import pytz
 from dateutil import tz
 
+from smart_time_py.core.epoch import datetime_to_us
+
 
 def get_timezone_info(timezone_str: str) -> Dict:
     """
@@ -151,4 +155,124 @@ def get_timezone_utc_offset(timezone_str: str) -> Optional[float]:
         tz_info = pytz.timezone(timezone_str)
         return datetime.now(tz_info).utcoffset().total_seconds() / 3600
     except pytz.exceptions.UnknownTimeZoneError:
-        return None 
\ No newline at end of file
+        return None 
+
+
+@lru_cache(maxsize=64)
+def _transition_table(
+    timezone_str: str
+) -> Tuple[np.ndarray, np.ndarray, List]:
+    """
+    Retorna a tabela de transições UTC de um fuso horário.
+
+    Para cada trecho da tabela: o instante (em microssegundos UTC) em que ele
+    começa, o offset válido nele (também em microssegundos) e o `tzinfo` do
+    pytz correspondente. A tabela vem da base do pytz e fica em cache.
+    """
+    try:
+        tz_info = pytz.timezone(timezone_str)
+    except pytz.exceptions.UnknownTimeZoneError:
+        raise ValueError(f"Fuso horário '{timezone_str}' desconhecido")
+
+    transitions = getattr(tz_info, "_utc_transition_times", None)
+    if not transitions:
+        # Fusos de offset fixo (UTC, Etc/GMT+3, ...)
+        offsets = [tz_info.utcoffset(datetime(2000, 1, 1))]
+        starts = [np.iinfo(np.int64).min]
+        tzinfos = [tz_info]
+    else:
+        offsets = [info[0] for info in tz_info._transition_info]
+        starts = [datetime_to_us(moment) for moment in transitions]
+        starts[0] = np.iinfo(np.int64).min
+        tzinfos = [tz_info._tzinfos[info] for info in tz_info._transition_info]
+
+    offsets = [datetime_to_us(datetime(1970, 1, 1) + offset)
+               for offset in offsets]
+    return (np.array(starts, dtype=np.int64),
+            np.array(offsets, dtype=np.int64), tzinfos)
+
+
+def _local_segments(
+    epochs: np.ndarray,
+    timezone_str: str
+) -> Tuple[np.ndarray, np.ndarray, List]:
+    """Retorna o horário local, o trecho da tabela e os tzinfos do fuso."""
+    starts, offsets, tzinfos = _transition_table(timezone_str)
+    epochs = np.asarray(epochs, dtype=np.int64)
+    index = np.searchsorted(starts, epochs, side="right") - 1
+    return epochs + offsets[index], index, tzinfos
+
+
+def to_local_epochs(epochs: np.ndarray, timezone_str: str) -> np.ndarray:
+    """
+    Converte timestamps UTC em horário de parede de um fuso horário.
+
+    Em vez de converter cada data, o offset de cada timestamp é encontrado
+    na tabela de transições do fuso com `np.searchsorted`, respeitando o
+    horário de verão de cada época.
+
+    Args:
+        epochs (np.ndarray): Microssegundos UTC desde a época Unix
+        timezone_str (str): Nome do fuso horário (ex: "America/Sao_Paulo")
+
+    Returns:
+        np.ndarray: Microssegundos do horário local desde a época Unix
+
+    Raises:
+        ValueError: Se o fuso horário não existir
+    """
+    return _local_segments(epochs, timezone_str)[0]
+
+
+def from_local_epochs(epochs: np.ndarray, timezone_str: str) -> np.ndarray:
+    """
+    Converte horários de parede de um fuso horário em timestamps UTC.
+
+    Inverso de `to_local_epochs`, também com `np.searchsorted` na tabela de
+    transições. Como `fold=0` do `datetime`, horários ambíguos (no fim do
+    horário de verão) ficam com o primeiro instante e horários inexistentes
+    (no início) usam o offset anterior à transição.
+
+    Args:
+        epochs (np.ndarray): Microssegundos do horário local desde a época
+        timezone_str (str): Nome do fuso horário (ex: "America/Sao_Paulo")
+
+    Returns:
+        np.ndarray: Microssegundos UTC desde a época Unix
+
+    Raises:
+        ValueError: Se o fuso horário não existir
+    """
+    starts, offsets, _ = _transition_table(timezone_str)
+    epochs = np.asarray(epochs, dtype=np.int64)
+    # Fim de cada trecho no horário local; o maior dos dois offsets faz os
+    # horários inexistentes ficarem no trecho anterior à transição
+    ends = starts[1:] + np.maximum(offsets[:-1], offsets[1:])
+    index = np.searchsorted(ends, epochs, side="right")
+    return epochs - offsets[index]
+
+
+def epochs_to_datetimes(
+    epochs: np.ndarray,
+    timezone_str: str
+) -> List[datetime]:
+    """
+    Converte timestamps UTC em datetimes no fuso horário informado.
+
+    Equivale a `astimezone` em cada data, mas o offset vem da tabela de
+    transições do fuso e só o objeto final é criado em Python.
+
+    Args:
+        epochs (np.ndarray): Microssegundos UTC desde a época Unix
+        timezone_str (str): Nome do fuso horário (ex: "America/Sao_Paulo")
+
+    Returns:
+        List[datetime]: Datas com o `tzinfo` do pytz de cada época
+
+    Raises:
+        ValueError: Se o fuso horário não existir
+    """
+    local, index, tzinfos = _local_segments(epochs, timezone_str)
+    local = local.astype("datetime64[us]").astype(object).tolist()
+    return [dt.replace(tzinfo=tzinfos[i])
+            for dt, i in zip(local, index.tolist())]
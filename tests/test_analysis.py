@@ -1,12 +1,25 @@
 """Testes para o módulo de análise temporal."""
 
-from datetime import date, datetime
+import time
+from datetime import date, datetime, timedelta, timezone
 
+import numpy as np
 import pytest
 
-from smart_time_py.analysis import (TimeGroup, analyze_seasonality,
+from smart_time_py.analysis import (CountMinSketch, EWMADetector,
+                                    HeavyHitters, HyperLogLog, RollingWindow,
+                                    TimeGroup, aggregate, analyze_seasonality,
                                     calculate_temporal_stats,
-                                    detect_temporal_patterns, group_dates)
+                                    detect_temporal_patterns,
+                                    distinct_per_bucket, group_dates,
+                                    iter_timestamps, merge_distinct,
+                                    resample, rolling_counts,
+                                    rollup_distinct, sessionize,
+                                    sessionize_arrays, stream_group_counts,
+                                    stream_seasonality,
+                                    stream_temporal_patterns,
+                                    stream_temporal_stats, top_buckets)
+from smart_time_py.core.parsing import extract_timestamps
 
 
 @pytest.fixture
@@ -80,6 +93,27 @@ def test_calculate_temporal_stats(sample_dates):
     assert "std_dev" in stats["2025-01-01"]
 
 
+def test_temporal_stats_ignore_local_timezone(sample_dates, monkeypatch):
+    """Testa que as estatísticas não dependem do fuso horário do sistema."""
+    monkeypatch.setenv("TZ", "Asia/Tokyo")
+    time.tzset()
+    try:
+        stats = calculate_temporal_stats(sample_dates, TimeGroup.MONTHLY)
+    finally:
+        monkeypatch.undo()
+        time.tzset()
+    january = stats["2025-01"]
+    assert january["min"] == datetime(2025, 1, 1, 10, 0)
+    assert january["median"] == datetime(2025, 1, 5, 22, 0)
+    assert january["mean"] == datetime(2025, 1, 5, 22, 0)
+
+    epochs = np.array(sample_dates, dtype="datetime64[us]")
+    assert calculate_temporal_stats(epochs, TimeGroup.MONTHLY) == stats
+    assert stream_temporal_stats(epochs, TimeGroup.MONTHLY,
+                                 chunk_size=2)["2025-01"]["mean"] == \
+        january["mean"]
+
+
 def test_detect_temporal_patterns():
     """Testa detecção de padrões temporais."""
     # Criar datas com padrão diário
@@ -106,6 +140,34 @@ def test_analyze_seasonality(sample_dates):
     assert len(seasonality["daily"]) > 0
 
 
+def test_analyze_seasonality_integer_keys(sample_dates):
+    """Testa as chaves inteiras e a matriz dia da semana x hora."""
+    seasonality = analyze_seasonality(sample_dates)
+    assert list(seasonality["monthly"]) == list(range(1, 13))
+    assert seasonality["monthly"][1] == 6
+    assert seasonality["monthly"][2] == 3
+    assert list(seasonality["weekly"]) == list(range(7))
+    # 2025-01-01 foi uma quarta-feira (2) e 2025-02-02 um domingo (6)
+    assert seasonality["weekly"][2] == 2
+    assert seasonality["weekly"][6] == 1
+    assert seasonality["daily"][10] == 9
+
+    heatmap = seasonality["weekday_hour"]
+    assert heatmap.shape == (7, 24)
+    assert heatmap.sum() == len(sample_dates)
+    assert heatmap[2, 10] == 2
+
+
+def test_analyze_seasonality_wall_clock():
+    """Testa que cada data usa o próprio horário de parede."""
+    seasonality = analyze_seasonality([
+        "2025-03-01T23:30:00-03:00",
+        datetime(2025, 3, 1, 23, 30, tzinfo=timezone.utc),
+    ])
+    assert seasonality["daily"][23] == 2
+    assert seasonality["weekly"][5] == 2
+
+
 def test_empty_dates():
     """Testa comportamento com lista vazia de datas."""
     empty_dates = []
@@ -121,7 +183,7 @@ def test_single_date():
     assert len(group_dates(single_date)) == 1
     assert len(calculate_temporal_stats(single_date)) == 1
     assert detect_temporal_patterns(single_date) == []
-    assert len(analyze_seasonality(single_date)) == 3
+    assert len(analyze_seasonality(single_date)) == 4
 
 
 def test_mixed_date_types():
@@ -135,4 +197,588 @@ def test_mixed_date_types():
     assert len(groups) == 3
     assert "2025-01-01" in groups
     assert "2025-01-02" in groups
-    assert "2025-01-03" in groups 
\ No newline at end of file
+    assert "2025-01-03" in groups
+
+
+def test_stream_group_counts(sample_dates):
+    """Testa contagem em streaming equivalente ao group_dates."""
+    groups = group_dates(sample_dates, TimeGroup.WEEKLY)
+    counts = stream_group_counts(iter(sample_dates), TimeGroup.WEEKLY,
+                                 chunk_size=2)
+    assert counts == {key: len(value) for key, value in groups.items()}
+
+
+def test_stream_temporal_stats(sample_dates):
+    """Testa estatísticas em streaming combinando blocos."""
+    expected = calculate_temporal_stats(sample_dates, TimeGroup.MONTHLY)
+    stats = stream_temporal_stats(iter(sample_dates), TimeGroup.MONTHLY,
+                                  chunk_size=2)
+    assert stats.keys() == expected.keys()
+    for key, group_stats in stats.items():
+        for name in ("count", "mean", "min", "max"):
+            assert group_stats[name] == expected[key][name]
+        diff = group_stats["std_dev"] - expected[key]["std_dev"]
+        assert abs(diff.total_seconds()) < 1e-3
+
+
+def test_stream_temporal_patterns():
+    """Testa detecção de padrões em um fluxo ordenado."""
+    dates = (datetime(2025, 1, day, 10, 0) for day in range(1, 5))
+    patterns = list(stream_temporal_patterns(dates))
+    assert len(patterns) == 1
+    assert patterns[0]["occurrences"] == 4
+
+    with pytest.raises(ValueError):
+        list(stream_temporal_patterns(
+            [datetime(2025, 1, 2), datetime(2025, 1, 1)]
+        ))
+
+
+def test_stream_seasonality(sample_dates):
+    """Testa sazonalidade em streaming."""
+    expected = analyze_seasonality(sample_dates)
+    seasonality = stream_seasonality(iter(sample_dates), chunk_size=4)
+    for key in ("monthly", "weekly", "daily"):
+        assert seasonality[key] == expected[key]
+    assert (seasonality["weekday_hour"] == expected["weekday_hour"]).all()
+    assert stream_seasonality(iter([])) == {}
+
+
+def test_iter_timestamps(tmp_path):
+    """Testa leitura de timestamps de texto, CSV e JSONL."""
+    lines = tmp_path / "dates.txt"
+    lines.write_text("2025-01-01T10:00:00Z\n\n2025-01-02T10:00:00Z\n")
+    assert list(iter_timestamps(lines)) == [
+        "2025-01-01T10:00:00Z", "2025-01-02T10:00:00Z"
+    ]
+
+    csv_file = tmp_path / "dates.csv"
+    csv_file.write_text("id,ts\n1,2025-01-01T10:00:00\n2,2025-01-02\n")
+    assert list(iter_timestamps(csv_file, column="ts")) == [
+        "2025-01-01T10:00:00", "2025-01-02"
+    ]
+
+    jsonl_file = tmp_path / "dates.jsonl"
+    jsonl_file.write_text('{"ts": "2025-01-01"}\n{"other": 1}\n')
+    assert list(iter_timestamps(jsonl_file, field="ts")) == ["2025-01-01"]
+
+    counts = stream_group_counts(iter_timestamps(csv_file, column=1))
+    assert counts == {"2025-01-01": 1, "2025-01-02": 1}
+
+
+def test_detect_temporal_patterns_tolerance():
+    """Testa a tolerância configurável do método por sequências."""
+    dates = [
+        datetime(2025, 1, 1, 10, 0),
+        datetime(2025, 1, 1, 10, 10),
+        datetime(2025, 1, 1, 10, 22),
+        datetime(2025, 1, 1, 10, 32),
+    ]
+    assert detect_temporal_patterns(dates, tolerance=timedelta(minutes=1)) \
+        == []
+    patterns = detect_temporal_patterns(dates,
+                                        tolerance=timedelta(minutes=3))
+    assert patterns[0]["occurrences"] == 4
+
+
+def test_detect_temporal_patterns_spectral_jitter():
+    """Testa a detecção espectral de uma cadência com jitter."""
+    base = datetime(2025, 1, 1)
+    jitter = [0, 17, -12, 25, -20, 8]
+    dates = [
+        base + timedelta(seconds=300 * i + jitter[i % len(jitter)])
+        for i in range(300)
+    ]
+    patterns = detect_temporal_patterns(dates, method="spectral")
+    assert len(patterns) == 1
+    assert abs(patterns[0]["interval"] - 300) <= 60
+    assert patterns[0]["occurrences"] == 300
+    assert 0 < patterns[0]["confidence"] <= 1
+
+
+def test_detect_temporal_patterns_spectral_interleaved():
+    """Testa a detecção de duas fontes periódicas intercaladas."""
+    base = datetime(2025, 1, 1)
+    hourly = [base + timedelta(hours=i, seconds=17) for i in range(200)]
+    slower = [base + timedelta(minutes=90 * i, seconds=1234)
+              for i in range(130)]
+    patterns = detect_temporal_patterns(hourly + slower, method="spectral")
+    intervals = sorted(p["interval"] for p in patterns)
+    assert intervals == [3600, 5400]
+
+    limited = detect_temporal_patterns(hourly + slower, method="spectral",
+                                       max_interval=timedelta(hours=1))
+    assert [p["interval"] for p in limited] == [3600]
+
+
+def test_detect_temporal_patterns_spectral_jittered_sources():
+    """Testa fontes intercaladas com jitter na detecção espectral."""
+    base = datetime(2025, 1, 1)
+    rng = np.random.default_rng(7)
+
+    def source(period, jitter, count, offset):
+        seconds = period * np.arange(count) + offset
+        seconds = seconds + rng.uniform(-jitter, jitter, count)
+        return [base + timedelta(seconds=float(s)) for s in seconds]
+
+    five = source(300, 10, 1000, 0)
+    hourly = source(3600, 0, 80, 1234)
+    patterns = detect_temporal_patterns(five + hourly, method="spectral")
+    assert [round(p["interval"]) for p in patterns] == [300]
+    assert patterns[0]["occurrences"] >= 1000
+
+    five = source(300, 20, 1000, 0)
+    seven = source(420, 10, 700, 200)
+    patterns = detect_temporal_patterns(five + seven, method="spectral")
+    intervals = sorted(p["interval"] for p in patterns)
+    assert len(intervals) == 2
+    assert abs(intervals[0] - 300) <= 1 and abs(intervals[1] - 420) <= 1
+    assert all(p["confidence"] >= 0.3 for p in patterns)
+
+
+def test_detect_temporal_patterns_invalid_method(sample_dates):
+    """Testa a validação do método de detecção."""
+    with pytest.raises(ValueError):
+        detect_temporal_patterns(sample_dates, method="wavelet")
+
+
+def test_rolling_window():
+    """Testa a janela deslizante incremental."""
+    base = datetime(2025, 1, 1)
+    window = RollingWindow(timedelta(minutes=5))
+    counts = [window.add(base + timedelta(minutes=m)) for m in [0, 1, 2, 6, 7]]
+    assert counts == [1, 2, 3, 2, 2]
+    assert len(window) == 2
+    assert window.rate(per=timedelta(minutes=5)) == 2
+    assert window.count(base + timedelta(minutes=20)) == 0
+
+    window.add(base + timedelta(minutes=20), count=3)
+    assert window.add("2025-01-01T00:20:00") == 4
+    with pytest.raises(ValueError):
+        window.add(base)
+    with pytest.raises(ValueError):
+        RollingWindow(timedelta(0))
+
+
+def test_rolling_counts():
+    """Testa as contagens vetorizadas em janelas deslizantes."""
+    base = datetime(2025, 1, 1)
+    dates = [base + timedelta(minutes=m) for m in [7, 0, 1, 2, 6]]
+    ends, counts = rolling_counts(dates, timedelta(minutes=5),
+                                  timedelta(minutes=1))
+    assert ends[0] == np.datetime64("2025-01-01T00:00")
+    assert len(ends) == 8
+    assert counts.tolist() == [1, 2, 3, 3, 3, 2, 2, 2]
+
+    window = RollingWindow(timedelta(minutes=5))
+    for date_obj in sorted(dates):
+        window.add(date_obj)
+    assert counts[-1] == window.count()
+
+    ends, counts = rolling_counts([], timedelta(minutes=5),
+                                  timedelta(minutes=1))
+    assert len(ends) == 0 and len(counts) == 0
+    with pytest.raises(ValueError):
+        rolling_counts(dates, timedelta(minutes=5), timedelta(0))
+
+
+def test_group_dates_hourly():
+    """Testa o agrupamento por hora."""
+    dates = [datetime(2025, 1, 1, 10, 5), datetime(2025, 1, 1, 10, 55),
+             datetime(2025, 1, 1, 11, 0)]
+    groups = group_dates(dates, TimeGroup.HOURLY)
+    assert list(groups) == ["2025-01-01 10:00", "2025-01-01 11:00"]
+    assert len(groups["2025-01-01 10:00"]) == 2
+
+
+def test_ewma_detector_seasonal():
+    """Testa o detector EWMA com um ciclo diário de atividade."""
+    detector = EWMADetector(warmup=2)
+    base = datetime(2025, 1, 6)
+    anomalies = []
+    for hour in range(24 * 21):
+        count = 50 if 9 <= hour % 24 < 17 else 5
+        if hour == 24 * 20 + 3:
+            count = 60
+        if hour == 24 * 20 + 12:
+            count = 0
+        if count:
+            anomalies += detector.add(base + timedelta(hours=hour),
+                                      series="api", count=count)
+    anomalies += detector.flush()
+
+    # Depois do aquecimento o ciclo diário deixa de ser anômalo
+    late = [a for a in anomalies if a["start"] >= base + timedelta(days=7)]
+    assert [(a["start"], a["count"]) for a in late] == [
+        (datetime(2025, 1, 26, 3), 60),
+        (datetime(2025, 1, 26, 12), 0),
+    ]
+    assert late[0]["score"] > 3 and late[1]["score"] < -3
+    assert late[0]["expected"] == pytest.approx(5)
+
+
+def test_ewma_detector_series():
+    """Testa séries independentes, silêncio e ordem cronológica."""
+    detector = EWMADetector(seasonal=False, warmup=3)
+    base = datetime(2025, 1, 1)
+    for hour in range(12):
+        for minute in range(0, 60, 6):
+            detector.add(base + timedelta(hours=hour, minutes=minute), "a")
+        assert detector.add(base + timedelta(hours=hour), "b") == []
+    assert len(detector) == 2
+
+    anomalies = detector.flush(base + timedelta(hours=14))
+    assert [(a["series"], a["count"]) for a in anomalies] == [("a", 0)] * 2
+    assert [a["start"].hour for a in anomalies] == [12, 13]
+
+    with pytest.raises(ValueError):
+        detector.add(base, "a")
+    with pytest.raises(ValueError):
+        EWMADetector(alpha=0)
+
+
+def test_group_dates_timezone():
+    """Testa o agrupamento pelo horário local de um fuso."""
+    dates = [
+        "2025-01-02T01:00:00Z",
+        datetime(2025, 1, 2, 4, 0),
+        datetime(2025, 1, 2, 2, 0, tzinfo=timezone(timedelta(hours=1))),
+    ]
+    groups = group_dates(dates, TimeGroup.DAILY, tz="America/Sao_Paulo")
+    assert sorted(groups) == ["2025-01-01", "2025-01-02"]
+    assert len(groups["2025-01-01"]) == 2
+    assert groups["2025-01-02"][0].hour == 1
+    assert groups["2025-01-02"][0].utcoffset() == timedelta(hours=-3)
+
+    # Dias locais mudam de tamanho na troca para o horário de verão
+    epochs = np.arange(
+        np.datetime64("2025-03-29T00:00"), np.datetime64("2025-04-01T00:00"),
+        np.timedelta64(1, "h")
+    )
+    groups = group_dates(epochs, TimeGroup.DAILY, tz="Europe/London")
+    assert [len(v) for v in groups.values()] == [24, 23, 24, 1]
+
+    stats = calculate_temporal_stats(epochs, TimeGroup.DAILY,
+                                     tz="Europe/London")
+    assert stats["2025-03-30"]["count"] == 23
+
+
+def test_group_dates_timezone_matches_scalar(sample_dates):
+    """Testa que o caminho vetorizado gera as mesmas chaves do original."""
+    for group_type in TimeGroup:
+        expected = group_dates(sample_dates, group_type)
+        result = group_dates(sample_dates, group_type, tz="UTC")
+        assert sorted(result) == sorted(expected)
+        assert {k: len(v) for k, v in result.items()} == \
+            {k: len(v) for k, v in expected.items()}
+
+
+def test_resample():
+    """Testa a série densa de contagens por período."""
+    dates = [datetime(2025, 1, 1, 10), "2025-01-01T11:00:00",
+             datetime(2025, 1, 4, 9), datetime(2025, 3, 2)]
+    starts, counts = resample(dates, TimeGroup.MONTHLY,
+                              start=datetime(2024, 12, 15))
+    assert starts.tolist() == [datetime(2024, 12, 1), datetime(2025, 1, 1),
+                               datetime(2025, 2, 1), datetime(2025, 3, 1)]
+    assert counts.tolist() == [0, 3, 0, 1]
+
+    starts, counts = resample(dates, TimeGroup.DAILY,
+                              end=datetime(2025, 1, 5), fill_value=np.nan)
+    assert len(starts) == 5
+    assert counts[0] == 2 and counts[3] == 1
+    assert np.isnan(counts[[1, 2, 4]]).all()
+
+    starts, counts = resample(dates[:3], timedelta(hours=12))
+    assert counts.tolist() == [2, 0, 0, 0, 0, 0, 1]
+    assert starts[-1] == np.datetime64("2025-01-04T00:00")
+
+    # Os períodos densos batem com os grupos não vazios de group_dates
+    groups = group_dates(dates, TimeGroup.WEEKLY)
+    counts = resample(dates, TimeGroup.WEEKLY)[1]
+    assert counts[counts > 0].tolist() == [len(v) for v in groups.values()]
+
+
+def test_resample_empty_and_invalid():
+    """Testa intervalos sem eventos e parâmetros inválidos."""
+    starts, counts = resample([], TimeGroup.WEEKLY)
+    assert len(starts) == 0 and len(counts) == 0
+
+    starts, counts = resample([], TimeGroup.WEEKLY, start=datetime(2025, 1, 1),
+                              end=datetime(2025, 1, 20))
+    assert starts[0] == np.datetime64("2024-12-30")
+    assert counts.tolist() == [0, 0, 0, 0]
+
+    with pytest.raises(ValueError):
+        resample([datetime(2025, 1, 1)], agg="median")
+    with pytest.raises(ValueError):
+        resample([datetime(2025, 1, 1)], timedelta(0))
+
+
+def test_resample_dst_fall_back_window():
+    """Testa start/end com fuso na volta do horário de verão."""
+    # 01:10 UTC de 26/10/2025 é 01:10 GMT, antes de 00:30 UTC (01:30 BST)
+    starts, sums = resample([datetime(2025, 10, 26, 1, 10)],
+                            timedelta(minutes=15),
+                            start=datetime(2025, 10, 26, 0, 30),
+                            tz="Europe/London", agg="sum", values=[5.0])
+    assert starts.tolist() == [datetime(2025, 10, 26, 1, 0)]
+    assert sums.tolist() == [5.0]
+
+    events = [datetime(2025, 10, 25, 23, 50) + timedelta(minutes=20 * i)
+              for i in range(8)]
+    starts, counts = resample(events, timedelta(hours=1),
+                              start=datetime(2025, 10, 26, 0, 0),
+                              end=datetime(2025, 10, 26, 1, 30),
+                              tz="Europe/London")
+    # Os eventos de 00:10 a 01:30 UTC caem todos entre 01:00 e 02:00 locais
+    assert starts.tolist() == [datetime(2025, 10, 26, 1, 0)]
+    assert counts.tolist() == [5]
+
+
+def test_aggregate():
+    """Testa a agregação de valores por período."""
+    dates = ["2025-01-03T08:00:00", "2025-01-01T10:00:00", "inválida",
+             "2025-01-01T12:00:00", "2025-01-03T09:00:00"]
+    values = [4.0, 1.0, 100.0, 3.0, 6.0]
+    starts, result = aggregate(dates, values, TimeGroup.DAILY,
+                               aggs=["count", "sum", "mean", "min", "max",
+                                     "std"])
+    assert starts.tolist() == [datetime(2025, 1, 1), datetime(2025, 1, 3)]
+    assert result["count"].tolist() == [2, 2]
+    assert result["sum"].tolist() == [4.0, 10.0]
+    assert result["mean"].tolist() == [2.0, 5.0]
+    assert result["min"].tolist() == [1.0, 4.0]
+    assert result["max"].tolist() == [3.0, 6.0]
+    assert result["std"] == pytest.approx([2 ** 0.5, 2 ** 0.5])
+
+    # Várias colunas de uma vez
+    columns = np.array([[1, 10], [2, 20], [3, 30]])
+    epochs = np.array(["2025-01-01", "2025-02-10", "2025-01-20"],
+                      dtype="datetime64[us]")
+    starts, result = aggregate(epochs, columns, TimeGroup.MONTHLY,
+                               aggs=["sum"])
+    assert result["sum"].tolist() == [[4, 40], [2, 20]]
+
+
+def test_aggregate_unsorted_matches_sorted():
+    """Testa que dados fora de ordem dão o mesmo resultado."""
+    rng = np.random.default_rng(7)
+    epochs = rng.integers(1_700_000_000_000_000, 1_710_000_000_000_000, 500)
+    values = rng.random(500)
+    order = np.argsort(epochs, kind="stable")
+    expected = aggregate(epochs[order], values[order],
+                         aggs=["count", "sum", "mean"])
+    result = aggregate(epochs, values, aggs=["count", "sum", "mean"])
+    assert (result[0] == expected[0]).all()
+    for agg in ("count", "sum", "mean"):
+        assert result[1][agg] == pytest.approx(expected[1][agg])
+
+    # Inteiros continuam exatos (e int64) com os dados fora de ordem
+    epochs = np.array(["2025-01-01T10", "2025-01-01T08", "2025-01-01T09"],
+                      dtype="datetime64[us]")
+    values = np.array([2 ** 53 + 1, 1, 1])
+    unsorted = aggregate(epochs, values, aggs=["sum"])[1]["sum"]
+    ordered = aggregate(np.sort(epochs), values, aggs=["sum"])[1]["sum"]
+    assert unsorted.dtype == ordered.dtype == np.int64
+    assert unsorted.tolist() == ordered.tolist() == [2 ** 53 + 3]
+
+
+def test_aggregate_invalid():
+    """Testa a validação dos parâmetros de agregação."""
+    with pytest.raises(ValueError):
+        aggregate([datetime(2025, 1, 1)], [1, 2])
+    with pytest.raises(ValueError):
+        aggregate([datetime(2025, 1, 1)], [1], aggs=["median"])
+
+
+def test_resample_values():
+    """Testa a série densa de valores agregados."""
+    dates = [datetime(2025, 1, 1, 10), datetime(2025, 1, 1, 11),
+             datetime(2025, 1, 3)]
+    starts, sums = resample(dates, values=[1.5, 2.5, 2], agg="sum",
+                            fill_value=np.nan)
+    assert len(starts) == 3
+    assert sums[0] == 4.0 and sums[2] == 2.0 and np.isnan(sums[1])
+
+    starts, maxima = resample(dates, values=[1, 5, 2], agg="max",
+                              start=datetime(2025, 1, 2))
+    assert maxima.tolist() == [0, 2]
+    with pytest.raises(ValueError):
+        resample(dates, agg="sum")
+
+
+def test_count_min_sketch():
+    """Testa as estimativas e a combinação de sketches."""
+    sketch = CountMinSketch(width=64, depth=4)
+    for i in range(1000):
+        sketch.add(("cliente", i % 50))
+    assert sketch.total == 1000
+    estimates = [sketch.estimate(("cliente", i)) for i in range(50)]
+    assert min(estimates) >= 20
+    assert sketch.estimate("ausente") <= sketch.total
+
+    other = CountMinSketch(width=64, depth=4)
+    other.add(("cliente", 0), 5)
+    before = sketch.estimate(("cliente", 0))
+    assert sketch.merge(other).estimate(("cliente", 0)) >= before + 5
+
+    with pytest.raises(ValueError):
+        sketch.merge(CountMinSketch(width=32, depth=4))
+
+
+def test_heavy_hitters_merge():
+    """Testa o top-k em memória fixa combinado entre workers."""
+    first, second = HeavyHitters(k=2), HeavyHitters(k=2)
+    for i in range(3000):
+        first.add(f"ruído-{i}")
+        second.add(f"ruído-{i + 3000}")
+    for _ in range(200):
+        first.add("a")
+        second.add("b")
+    first.add("b", 150)
+
+    assert [key for key, _ in first.top()] == ["a", "b"]
+    merged = first.merge(second)
+    assert [key for key, _ in merged.top()] == ["b", "a"]
+    assert merged.top()[0][1] >= 350
+
+
+def test_top_buckets():
+    """Testa os períodos mais movimentados de um fluxo."""
+    base = datetime(2025, 1, 1)
+    dates = [base + timedelta(hours=i % 24, minutes=i % 60)
+             for i in range(2400)]
+    dates += [base + timedelta(hours=5, seconds=i) for i in range(500)]
+    keys = ["outros"] * 2400 + ["loja"] * 500
+
+    top = top_buckets(iter(dates), TimeGroup.HOURLY, k=2)
+    assert top[0] == ("2025-01-01 05:00", 600)
+    assert len(top) == 2
+
+    top = top_buckets(dates, TimeGroup.DAILY, k=1, keys=keys,
+                      chunk_size=100)
+    assert top == [(("outros", "2025-01-01"), 2400)]
+
+
+def test_hyperloglog():
+    """Testa a estimativa e a combinação de contadores de distintos."""
+    sketch = HyperLogLog(precision=12)
+    sketch.add_many(range(50_000))
+    assert len(sketch) == pytest.approx(50_000, rel=0.05)
+
+    small = HyperLogLog()
+    for user in ["ana", "bia", "ana", np.int64(7), 7]:
+        small.add(user)
+    assert len(small) == 3
+
+    other = HyperLogLog(precision=12)
+    other.add_many(range(25_000, 75_000))
+    assert len(sketch.copy().merge(other)) == pytest.approx(75_000, rel=0.05)
+    with pytest.raises(ValueError):
+        sketch.merge(HyperLogLog(precision=10))
+
+
+def test_distinct_per_bucket_rollup():
+    """Testa distintos por dia, a agregação mensal e a combinação."""
+    base = datetime(2025, 1, 30)
+    dates = [base + timedelta(hours=i % 96) for i in range(4000)]
+    users = [i % 500 for i in range(4000)]
+
+    daily = distinct_per_bucket(iter(dates), iter(users), chunk_size=700)
+    assert list(daily) == ["2025-01-30", "2025-01-31", "2025-02-01",
+                           "2025-02-02"]
+    assert all(len(sketch) == pytest.approx(500, rel=0.05)
+               for sketch in daily.values())
+
+    monthly = rollup_distinct(daily, TimeGroup.DAILY, TimeGroup.MONTHLY)
+    direct = distinct_per_bucket(dates, users, TimeGroup.MONTHLY)
+    assert list(monthly) == ["2025-01", "2025-02"]
+    for key in monthly:
+        assert (monthly[key].registers == direct[key].registers).all()
+
+    merged = merge_distinct(distinct_per_bucket(dates[:1500], users[:1500]),
+                            distinct_per_bucket(dates[1500:], users[1500:]))
+    assert all((merged[k].registers == daily[k].registers).all()
+               for k in daily)
+
+    with pytest.raises(ValueError):
+        rollup_distinct(daily, TimeGroup.WEEKLY, TimeGroup.MONTHLY)
+
+
+def test_sessionize():
+    """Testa a divisão de um fluxo em sessões por inatividade."""
+    events = ["2025-01-01T00:00:00", "2025-01-01T00:10:00",
+              "inválida", "2025-01-01T02:00:00"]
+    sessions = list(sessionize(iter(events), timedelta(minutes=30)))
+    assert [(key, count) for key, _, count in sessions] == [(None, 2),
+                                                            (None, 1)]
+    assert sessions[0][1].start == datetime(2025, 1, 1, 0, 0)
+    assert sessions[0][1].end == datetime(2025, 1, 1, 0, 10)
+    assert sessions[1][1].duration == timedelta(0)
+
+
+def test_sessionize_keys():
+    """Testa sessões por chave em fluxos por horário e agrupados."""
+    base = datetime(2025, 1, 1)
+    minutes = [0, 1, 5, 20, 50, 52, 130]
+    users = ["ana", "bia", "ana", "bia", "ana", "bia", "ana"]
+    dates = [base + timedelta(minutes=m) for m in minutes]
+    gap = timedelta(minutes=30)
+
+    by_time = sorted(
+        (key, period.start, period.end, count)
+        for key, period, count in sessionize(dates, gap, keys=users)
+    )
+    grouped = sorted(zip(users, dates))
+    by_key = sorted(
+        (key, period.start, period.end, count)
+        for key, period, count in sessionize(
+            [d for _, d in grouped], gap, keys=[u for u, _ in grouped],
+            order="key"
+        )
+    )
+    assert by_time == by_key
+    assert [(key, count) for key, _, _, count in by_time] == [
+        ("ana", 2), ("ana", 1), ("ana", 1), ("bia", 2), ("bia", 1)
+    ]
+
+    starts, ends, counts, keys = sessionize_arrays(
+        np.array(dates[::-1], dtype="datetime64[us]"), gap, keys=users[::-1]
+    )
+    assert keys.tolist() == ["ana", "ana", "ana", "bia", "bia"]
+    assert counts.tolist() == [2, 1, 1, 2, 1]
+    assert ends[3] == np.datetime64("2025-01-01T00:20")
+
+    with pytest.raises(ValueError):
+        list(sessionize(dates[::-1], gap, keys=users[::-1]))
+    with pytest.raises(ValueError):
+        list(sessionize(dates, gap, order="user"))
+
+
+def test_analysis_accepts_epoch_arrays():
+    """Testa as funções de análise com arrays de timestamps extraídos."""
+    dates = [datetime(2025, 1, 1) + timedelta(hours=3 * i) for i in range(16)]
+    log = "".join(f"{d.isoformat()}Z GET /\n" for d in dates).encode()
+    epochs, valid = extract_timestamps(log)
+    assert valid.all()
+    epochs = epochs[valid]
+
+    assert detect_temporal_patterns(epochs) == detect_temporal_patterns(dates)
+    assert list(stream_temporal_patterns(epochs)) == list(
+        stream_temporal_patterns(dates)
+    )
+    assert stream_group_counts(epochs, chunk_size=5) == stream_group_counts(
+        dates
+    )
+    seasonality = stream_seasonality(epochs)
+    assert seasonality["daily"] == stream_seasonality(dates)["daily"]
+    assert seasonality["weekday_hour"].sum() == 16
+    assert top_buckets(epochs, TimeGroup.DAILY) == [("2025-01-01", 8),
+                                                    ("2025-01-02", 8)]
+    distinct = distinct_per_bucket(epochs, keys=range(16))
+    assert {key: len(sketch) for key, sketch in distinct.items()} == {
+        "2025-01-01": 8, "2025-01-02": 8
+    }
+    with pytest.raises(ValueError):
+        list(stream_temporal_patterns(epochs[::-1]))
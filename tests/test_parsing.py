@@ -0,0 +1,342 @@
+"""Testes para o módulo de parsing rápido de datas."""
+
+import mmap
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from itertools import count
+
+import numpy as np
+import pytest
+
+from smart_time_py.converter import (convert_with_timezone,
+                                     string_to_datetime, validate_date_string)
+from smart_time_py.core.converter import (_map_bounded,
+                                          string_to_datetime_many)
+from smart_time_py.core.epoch import (civil_from_days, datetime_to_us,
+                                      days_from_civil, from_epoch, to_epoch)
+from smart_time_py.core.parsing import (compile_format, disable_parse_cache,
+                                        enable_parse_cache,
+                                        extract_timestamps, infer_format,
+                                        parse_auto_many, parse_cache_info,
+                                        parse_format_many, parse_iso,
+                                        parse_iso_many)
+
+
+def test_days_from_civil_roundtrip():
+    """Testa a conversão entre datas civis e dias desde a época."""
+    assert days_from_civil(1970, 1, 1) == 0
+    assert days_from_civil(2000, 3, 1) == 11017
+    assert civil_from_days(-1) == (1969, 12, 31)
+
+    days = np.arange(-800000, 800000, 997)
+    year, month, day = civil_from_days(days)
+    assert (days_from_civil(year, month, day) == days).all()
+
+
+def test_to_epoch_from_epoch():
+    """Testa conversões de época em várias unidades, fusos e arrays."""
+    moment = datetime(2025, 3, 9, 12, 30, 0, 250)
+    assert to_epoch(moment) == 1741523400
+    assert to_epoch(moment, "ms") == 1741523400000
+    assert to_epoch(moment, "ns") == 1741523400000250000
+    assert to_epoch(date(1969, 12, 31), "s") == -86400
+    assert from_epoch(1741523400000250, "us") == moment
+    assert from_epoch(1741523400.5) == moment.replace(microsecond=500000)
+
+    # Datas sem fuso horário são lidas no fuso informado; no horário
+    # inexistente da troca para o horário de verão vale o offset anterior
+    assert to_epoch(datetime(2025, 1, 1), tz="America/Sao_Paulo") == \
+        to_epoch(datetime(2025, 1, 1, 3))
+    assert to_epoch(datetime(2025, 3, 9, 2, 30), tz="America/New_York") == \
+        to_epoch(datetime(2025, 3, 9, 7, 30))
+    aware = datetime(2025, 1, 1, tzinfo=timezone(timedelta(hours=-3)))
+    assert to_epoch(aware, tz="Asia/Tokyo") == to_epoch(aware)
+
+    local = from_epoch(0, tz="America/Sao_Paulo")
+    assert (local.hour, local.utcoffset()) == (21, timedelta(hours=-3))
+
+    dates = [datetime(2025, 1, 1) + timedelta(hours=7 * i)
+             for i in range(1000)]
+    epochs = to_epoch(dates, "us", tz="Europe/London")
+    assert epochs.tolist() == [to_epoch(d, "us", tz="Europe/London")
+                               for d in dates]
+    assert (to_epoch(np.array(dates, dtype="datetime64[us]"), "ms") ==
+            to_epoch(dates + [aware], "ms")[:-1]).all()
+    assert from_epoch(to_epoch(dates, "ms"), "ms").tolist() == dates
+    converted = from_epoch(epochs, "us", tz="Europe/London")
+    assert [d.replace(tzinfo=None) for d in converted] == dates
+
+    for invalid in (["2025-01-01"], np.array([1, 2]), "2025-01-01"):
+        with pytest.raises(ValueError):
+            to_epoch(invalid)
+    with pytest.raises(ValueError):
+        to_epoch(moment, "h")
+    with pytest.raises(ValueError):
+        from_epoch(["x"])
+
+
+def test_parse_iso():
+    """Testa o parsing de strings ISO 8601 individuais."""
+    assert parse_iso("2025-01-01T10:00:00") == datetime(2025, 1, 1, 10)
+    assert parse_iso("2025-01-01T10:00:00Z") == datetime(
+        2025, 1, 1, 10, tzinfo=timezone.utc
+    )
+    assert parse_iso("2025-02-30") is None
+    assert parse_iso("não é data") is None
+
+    # Mesma gramática do modo em lote em qualquer versão do Python
+    assert parse_iso("2025-01-01T10:00:00.5Z") == datetime(
+        2025, 1, 1, 10, 0, 0, 500000, tzinfo=timezone.utc
+    )
+    assert parse_iso("2025-01-01 10:00:00,123456789-0300") == datetime(
+        2025, 1, 1, 10, 0, 0, 123456, tzinfo=timezone(timedelta(hours=-3))
+    )
+    assert parse_iso("2025-01-01T10:00:00+05:99") is None
+    assert parse_iso("2025-01-01T10:00:00+24:00") is None
+
+
+def test_parse_iso_many_matches_scalar():
+    """Testa que o modo em lote concorda com o parsing individual."""
+    values = [
+        "2025-01-01",
+        "2025-01-01 10:00:00",
+        "2025-01-01T10:00:00.5Z",
+        "2024-02-29T23:59:59.123456789+05:30",
+        "2025-01-01T10:00:00-0300",
+        "2025-01-01 10:00:00,25+0130",
+        "2025-01-01T10:00:00+05:99",
+        "2025-01-01T10:00",
+        "2025-W01-1",
+        "2025-13-01",
+        "2025-01-01T25:00:00",
+        "2025-01-01T10:00:00.",
+        "lixo",
+        datetime(2025, 1, 1, tzinfo=timezone(timedelta(hours=-3))),
+        date(2025, 1, 2),
+        None,
+    ]
+    epochs, valid = parse_iso_many(values)
+    assert epochs.dtype == np.int64
+    for value, epoch, ok in zip(values, epochs, valid):
+        expected = parse_iso(value) if isinstance(value, str) else value
+        if expected is None:
+            assert not ok and epoch == 0
+        else:
+            assert ok and epoch == datetime_to_us(expected)
+
+
+def test_parse_iso_many_units():
+    """Testa as unidades de saída do modo em lote."""
+    values = ["1970-01-01T00:00:01.5Z", "1969-12-31T23:59:59Z"]
+    assert parse_iso_many(values, unit="s")[0].tolist() == [1, -1]
+    assert parse_iso_many(values, unit="ms")[0].tolist() == [1500, -1000]
+    assert parse_iso_many(values, unit="ns")[0].tolist() == [
+        1_500_000_000, -1_000_000_000
+    ]
+    assert parse_iso_many([])[0].shape == (0,)
+    with pytest.raises(ValueError):
+        parse_iso_many(values, unit="h")
+
+
+def test_string_to_datetime_iso():
+    """Testa o formato especial 'iso' em string_to_datetime."""
+    result = string_to_datetime("2025-02-24T14:30:00+00:00", "iso")
+    assert result == datetime(2025, 2, 24, 14, 30, tzinfo=timezone.utc)
+    with pytest.raises(ValueError):
+        string_to_datetime("24/02/2025", "iso")
+
+
+def test_parse_iso_many_wall_clock():
+    """Testa o modo que mantém o horário de parede de cada valor."""
+    values = ["2025-01-01T10:00:00-03:00", "2025-01-01T10:00:00.5+0530"]
+    epochs, valid = parse_iso_many(values, unit="ms", utc=False)
+    assert valid.all()
+    wall = datetime_to_us(datetime(2025, 1, 1, 10)) // 1000
+    assert epochs.tolist() == [wall, wall + 500]
+
+
+@pytest.mark.parametrize("fmt, values", [
+    ("%Y-%m-%d %H:%M:%S", ["2025-02-24 14:30:05", "2025-2-4 1:3:5",
+                           "2025-02-24  14:30:05", "2025-02-24 24:00:00",
+                           "2025-02-30 10:00:00", "2025-02-24 14:30:60",
+                           "2025-02-24 14:30:05.1", "2025-02-24"]),
+    ("%d/%m/%y %H:%M", ["24/02/25 14:30", "24/02/69 14:30", " 4/2/68 0:0",
+                        "24/2/2025 14:30"]),
+    ("%Y%m%d%H%M%S", ["20250224143005", "2025224143005", "2025022414300"]),
+    ("%Y-%m-%dT%H:%M:%S.%f", ["2025-02-24T14:30:05.5",
+                              "2025-02-24t14:30:05.123456",
+                              "2025-02-24T14:30:05.1234567"]),
+    ("%H:%M", ["14:30", "7:05", "25:00"]),
+    ("100%% %Y", ["100% 2025", "100 2025"]),
+    ("%d %b %Y", ["24 Feb 2025", "24 Fev 2025"]),
+])
+def test_compile_format_matches_strptime(fmt, values):
+    """Testa se o parser compilado aceita e rejeita o mesmo que o strptime."""
+    parse = compile_format(fmt)
+    for value in values:
+        try:
+            expected = datetime.strptime(value, fmt)
+        except ValueError:
+            expected = None
+        assert parse(value) == expected, value
+
+
+def test_compile_format_cache_and_errors():
+    """Testa o cache por formato e as mensagens de erro dos conversores."""
+    assert compile_format("%Y-%m-%d") is compile_format("%Y-%m-%d")
+    assert validate_date_string("2025-02-24", "%Y-%m-%d")
+    assert not validate_date_string("2025-02-30", "%Y-%m-%d")
+    with pytest.raises(ValueError, match="day is out of range for month"):
+        string_to_datetime("2025-02-30", "%Y-%m-%d")
+    with pytest.raises(ValueError, match="does not match format"):
+        string_to_datetime("24/02/2025", "%Y-%m-%d")
+
+
+def test_parse_format_many_matches_strptime():
+    """Testa o caminho vetorizado e o fallback contra o strptime."""
+    fmt = "%Y-%m-%d %H:%M:%S.%f"
+    values = ["2025-02-24 14:30:05.123456", "2025-02-24 14:30:05.5",
+              "2025-2-4 14:30:05.25", "2025-02-29 10:00:00.000",
+              "2025-02-24 14:30:60.1", "2025-02-24  14:30:05.1",
+              "2025-02-24T14:30:05.1", None, ""]
+    epochs, valid = parse_format_many(values, fmt)
+    for value, epoch, ok in zip(values, epochs.tolist(), valid.tolist()):
+        try:
+            expected = datetime_to_us(datetime.strptime(value, fmt))
+        except (TypeError, ValueError):
+            expected = None
+        assert (epoch if ok else None) == expected, value
+
+    epochs, valid = parse_format_many(["24/02/25", "01/01/70"], "%d/%m/%y",
+                                      unit="s")
+    assert valid.all()
+    assert epochs.tolist() == [1740355200, 0]
+
+
+def test_string_to_datetime_many_modes():
+    """Testa os modos 'mask', 'coerce' e 'raise' e o uso de processos."""
+    values = ["2025-02-24 14:30:00", "inválida", "2025-02-24 15:00:00"]
+    fmt = "%Y-%m-%d %H:%M:%S"
+
+    epochs, valid = string_to_datetime_many(values, fmt, unit="s")
+    assert valid.tolist() == [True, False, True]
+    assert epochs[2] - epochs[0] == 1800
+
+    assert string_to_datetime_many(values, fmt, errors="coerce") == [
+        datetime(2025, 2, 24, 14, 30), None, datetime(2025, 2, 24, 15)
+    ]
+    with pytest.raises(ValueError, match="linha 1"):
+        string_to_datetime_many(values, fmt, errors="raise", chunk_size=1)
+    with pytest.raises(ValueError):
+        string_to_datetime_many(values, fmt, errors="ignore")
+
+    pooled, pooled_valid = string_to_datetime_many(
+        values * 10, fmt, unit="s", chunk_size=4, workers=2
+    )
+    assert pooled.tolist() == epochs.tolist() * 10
+    assert pooled_valid.tolist() == valid.tolist() * 10
+    assert string_to_datetime_many([], fmt)[0].shape == (0,)
+
+
+def test_map_bounded_reads_ahead_lazily():
+    """Testa que os blocos enviados aos workers ficam limitados."""
+    pulled = []
+
+    def chunks():
+        for i in range(100):
+            pulled.append(i)
+            yield [i]
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = _map_bounded(executor, lambda offset, chunk: chunk[0] * 2,
+                               count(), chunks(), window=4)
+        assert next(results) == 0
+        assert len(pulled) == 5
+        assert list(results) == [i * 2 for i in range(1, 100)]
+
+
+def test_infer_format():
+    """Testa a detecção do formato a partir de uma amostra."""
+    assert infer_format(["2025-02-24 14:30:05", "2025-02-25 01:00:00"]) == (
+        "%Y-%m-%d %H:%M:%S"
+    )
+    assert infer_format(["01/02/2025"]) == "%m/%d/%Y"
+    assert infer_format(["01/02/2025"], dayfirst=True) == "%d/%m/%Y"
+    assert infer_format(["01/02/2025", "13/02/2025"]) == "%d/%m/%Y"
+    assert infer_format(["2025-02-24T14:30:05Z",
+                         "2025-02-24T14:30:05-03:00"]) == "iso"
+    assert infer_format(["sem data", ""]) is None
+
+
+def test_parse_auto_many_with_fallback():
+    """Testa o formato inferido com fallback para o dateutil."""
+    values = ["24/02/2025 14:30", "25/02/2025 09:00", "March 3, 2025 10:00",
+              "não é data", None]
+    epochs, valid = parse_auto_many(values, dayfirst=True, sample_size=2)
+    assert valid.tolist() == [True, True, True, False, False]
+    expected = [datetime(2025, 2, 24, 14, 30), datetime(2025, 2, 25, 9),
+                datetime(2025, 3, 3, 10)]
+    assert epochs[:3].tolist() == [datetime_to_us(d) for d in expected]
+
+
+def test_parse_cache():
+    """Testa o cache LRU opcional de parsing e seus contadores."""
+    assert not parse_cache_info()["enabled"]
+    enable_parse_cache(maxsize=2)
+    try:
+        fmt = "%d/%m/%Y"
+        first = string_to_datetime("24/02/2025", fmt)
+        assert string_to_datetime("24/02/2025", fmt) is first
+        with pytest.raises(ValueError, match="does not match format"):
+            string_to_datetime("inválida", fmt)
+        with pytest.raises(ValueError, match="does not match format"):
+            string_to_datetime("inválida", fmt)
+        local = convert_with_timezone("2025-02-24 14:30+00:00",
+                                      "America/Sao_Paulo")
+        assert local.hour == 11
+        info = parse_cache_info()
+        assert (info["hits"], info["misses"]) == (2, 3)
+        # A entrada mais antiga é descartada ao ultrapassar o limite
+        assert info["size"] == info["maxsize"] == 2
+        string_to_datetime("24/02/2025", fmt)
+        assert parse_cache_info()["misses"] == 4
+        with pytest.raises(ValueError):
+            enable_parse_cache(maxsize=0)
+    finally:
+        disable_parse_cache()
+    assert parse_cache_info()["size"] == 0
+
+
+def test_extract_timestamps(tmp_path):
+    """Testa a extração de timestamps de buffers de bytes e de mmap."""
+    log = (b"2025-02-24T14:30:05Z GET /a 200\n"
+           b"2025-02-24T14:30:06.5+01:00 GET /b\r\n"
+           b"sem data\n\n"
+           b"2025-02-24T14:30:07 GET /c")
+    epochs, valid = extract_timestamps(memoryview(log), unit="ms",
+                                       chunk_size=8)
+    assert valid.tolist() == [True, True, False, False, True]
+    base = datetime_to_us(datetime(2025, 2, 24, 14, 30, 5)) // 1000
+    assert epochs[valid].tolist() == [base, base - 3_598_500, base + 2000]
+
+    csv = b"1,2025-02-24 14:30:05,3\n2,24/02/2025,4\n3,2025-2-4 1:02:03,5\n"
+    epochs, valid = extract_timestamps(csv, "%Y-%m-%d %H:%M:%S", field=1,
+                                       delimiter=",")
+    assert valid.tolist() == [True, False, True]
+    assert epochs[2] == datetime_to_us(datetime(2025, 2, 4, 1, 2, 3))
+
+    path = tmp_path / "app.log"
+    path.write_bytes(b"2025-02-24 14:30:05,123 INFO a\n"
+                     b"2025-02-24 14:30:06,999 WARN b\n")
+    with open(path, "rb") as handle, \
+            mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        epochs, valid = extract_timestamps(data, "%Y-%m-%d %H:%M:%S,%f",
+                                           width=23)
+        assert valid.all()
+        assert np.diff(epochs).tolist() == [1_876_000]
+        seconds, _ = extract_timestamps(data, "%Y-%m-%d %H:%M:%S", unit="s")
+        assert np.diff(seconds).tolist() == [1]
+
+    assert extract_timestamps(b"")[0].shape == (0,)
+    with pytest.raises(ValueError):
+        extract_timestamps(log, delimiter=", ")
@@ -1,7 +1,11 @@
 """
 Testes para o módulo smart_time_py
 """
+import io
+
+import numpy as np
 import pytest
+import pytz
 from datetime import datetime, date, timedelta
 from smart_time_py.core.converter import (
     string_to_datetime,
@@ -11,15 +15,19 @@ from smart_time_py.core.converter import (
 )
 from smart_time_py.core.time_operations import (
     add_time,
+    add_time_many,
     subtract_time,
+    subtract_time_many,
     calculate_difference,
+    calculate_difference_many,
     is_leap_year,
     get_days_in_month
 )
 from smart_time_py.core.validation import (
     is_valid_date,
     auto_validate_date,
-    validate_date_range
+    validate_date_range,
+    validate_many
 )
 from smart_time_py.holidays import (
     is_holiday,
@@ -30,17 +38,25 @@ from smart_time_py.holidays import (
 from smart_time_py.periods import (
     TimePeriod,
     DateRange,
-    get_overlapping_periods
+    get_overlapping_periods,
+    find_gaps,
+    utilization,
+    join_periods
 )
 from smart_time_py.formatters import (
     format_relative,
     format_natural,
-    format_iso
+    format_iso,
+    format_seasonality,
+    format_many
 )
+from smart_time_py.analysis import analyze_seasonality
 from smart_time_py.timezone import (
     get_timezone_info,
     convert_timezone,
-    get_timezone_abbreviation
+    get_timezone_abbreviation,
+    to_local_epochs,
+    epochs_to_datetimes
 )
 
 
@@ -96,6 +112,37 @@ def test_subtract_time():
     assert result == datetime(2024, 2, 20)
 
 
+def test_add_time_many():
+    """Testa a aritmética de calendário vetorizada"""
+    dates = [datetime(2024, 1, 31, 10, 30), datetime(2023, 3, 31),
+             datetime(2024, 2, 29, 23, 59, 59, 5)]
+    for kwargs in ({"months": 1}, {"years": 1, "days": 2},
+                   {"months": -13, "hours": 25, "seconds": 61},
+                   {"minutes": -90}):
+        assert add_time_many(dates, **kwargs) == \
+            [add_time(d, **kwargs) for d in dates]
+        assert subtract_time_many(dates, **kwargs) == \
+            [subtract_time(d, **kwargs) for d in dates]
+
+    # Limite no fim do mês, deslocamentos por data e NaT preservado
+    array = np.array(["2024-01-31", "2024-03-31", "NaT"],
+                     dtype="datetime64[D]")
+    result = add_time_many(array, months=np.array([1, -1, 1]))
+    assert result.astype(str).tolist() == [
+        "2024-02-29T00:00:00.000000", "2024-02-29T00:00:00.000000", "NaT"
+    ]
+    epochs = array[:2].astype("datetime64[us]").astype(np.int64)
+    assert (add_time_many(epochs, years=1) ==
+            add_time_many(array[:2], years=1).astype(np.int64)).all()
+
+    # Objetos date continuam date, como no relativedelta
+    assert add_time_many([date(2024, 1, 31)], months=1) == [date(2024, 2, 29)]
+    with pytest.raises(ValueError):
+        add_time_many([datetime(9999, 12, 1)], months=1)
+    with pytest.raises(ValueError):
+        add_time_many(["2024-01-01"], days=1)
+
+
 def test_calculate_difference():
     """Testa o cálculo de diferença entre datas"""
     date1 = datetime(2024, 2, 25)
@@ -104,6 +151,71 @@ def test_calculate_difference():
     assert result == 5
 
 
+def test_calculate_difference_calendar_months():
+    """Testa meses e anos como diferenças exatas de calendário"""
+    assert calculate_difference(datetime(2024, 1, 31),
+                                datetime(2024, 2, 28), "months") == 0
+    assert calculate_difference(datetime(2023, 1, 31),
+                                datetime(2023, 2, 28), "months") == 1
+    assert calculate_difference(datetime(2025, 3, 1),
+                                datetime(2024, 3, 1, 1), "years") == 0
+    assert calculate_difference(datetime(2025, 3, 1, 1),
+                                datetime(2024, 3, 1), "years") == 1
+
+    # O resultado não tem sinal: a ordem das datas não importa
+    for unit in ("months", "years"):
+        assert calculate_difference(datetime(2020, 1, 15),
+                                    datetime(2023, 6, 14), unit) == \
+            calculate_difference(datetime(2023, 6, 14),
+                                 datetime(2020, 1, 15), unit)
+    assert calculate_difference(datetime(2023, 6, 14),
+                                datetime(2020, 1, 15), "months") == 40
+
+
+def test_calculate_difference_many():
+    """Testa a diferença vetorizada entre pares de datas"""
+    starts = [datetime(2024, 1, 31), datetime(2023, 1, 31, 12),
+              datetime(2024, 2, 29), datetime(2020, 5, 17, 8, 30)]
+    ends = [datetime(2024, 2, 28), datetime(2023, 2, 28, 11),
+            datetime(2025, 2, 28), datetime(2019, 1, 1)]
+    for unit in ("days", "seconds", "minutes", "hours", "weeks", "months",
+                 "years"):
+        result = calculate_difference_many(starts, ends, unit)
+        assert result.tolist() == [calculate_difference(a, b, unit)
+                                   for a, b in zip(starts, ends)]
+
+    array = np.array(starts, dtype="datetime64[us]")
+    months = calculate_difference_many(array, datetime(2025, 1, 31),
+                                       "months")
+    assert months.dtype == np.int64
+    assert months.tolist() == [12, 23, 11, 56]
+    epochs = array.astype(np.int64)
+    assert (calculate_difference_many(epochs, epochs + 86_400_000_000) ==
+            1).all()
+
+    # Meses em datas com fuso são contados no relógio local
+    new_york = pytz.timezone("America/New_York")
+    start = new_york.localize(datetime(2024, 2, 29, 20))
+    end = new_york.localize(datetime(2024, 3, 29, 22))
+    assert calculate_difference(start, end, "months") == 1
+    assert calculate_difference_many([start], [end],
+                                     "months").tolist() == [1]
+
+    # NaT propaga como NaN, assim como em add_time_many
+    left = np.array(["2024-01-31", "NaT", "2024-03-01"],
+                    dtype="datetime64[us]")
+    right = np.array(["2024-03-01", "2024-03-01", "NaT"],
+                     dtype="datetime64[us]")
+    for unit, first in (("days", 30), ("months", 1)):
+        result = calculate_difference_many(left, right, unit)
+        assert result.dtype == np.float64
+        assert result[0] == first
+        assert np.isnan(result[1:]).all()
+
+    with pytest.raises(ValueError):
+        calculate_difference_many(array, array, "fortnights")
+
+
 def test_is_leap_year():
     """Testa a verificação de ano bissexto"""
     assert is_leap_year(2024) is True
@@ -137,6 +249,32 @@ def test_validate_date_range():
     assert validate_date_range(end, start) is False
 
 
+def test_validate_many():
+    """Testa a validação em lote com bitmap e motivos dos erros"""
+    values = ["2024-02-25", "2024-02-30", "25/02/2024", None,
+              "2024-12-31"] * 5
+    report = validate_many(iter(values), "%Y-%m-%d", max_errors=4,
+                           chunk_size=3)
+    assert (report.total, report.valid, report.invalid) == (25, 10, 15)
+    assert report.bitmap.nbytes == 4
+    assert report.mask().tolist() == \
+        [is_valid_date(v, "%Y-%m-%d") if v else False for v in values]
+    assert report.invalid_positions().tolist()[:4] == [1, 2, 3, 6]
+    assert report.errors == [
+        (1, "Data ou hora inexistente"),
+        (2, "Não corresponde ao formato '%Y-%m-%d'"),
+        (3, "Valor do tipo 'NoneType' não é uma string"),
+        (6, "Data ou hora inexistente"),
+    ]
+
+    report = validate_many(["2024-02-25T10:00:00Z", "ontem"], "iso",
+                           reasons=False)
+    assert report.errors == [(1, None)]
+    assert validate_many([]).bitmap.nbytes == 0
+    with pytest.raises(ValueError):
+        validate_many(values, chunk_size=0)
+
+
 def test_holiday_functions():
     """Testa as funções de feriado"""
     # Testa feriado existente
@@ -179,6 +317,115 @@ def test_date_range():
     assert len(date_range.to_list()) == 5
 
 
+def test_find_gaps():
+    """Testa a detecção de falhas em um fluxo de heartbeat"""
+    base = datetime(2024, 2, 25)
+    beats = [base + timedelta(minutes=m) for m in range(60)
+             if not 10 <= m < 20 and m != 40]
+
+    gaps = find_gaps(beats, timedelta(minutes=3))
+    assert gaps == [TimePeriod(start=base + timedelta(minutes=9),
+                               end=base + timedelta(minutes=20))]
+
+    # Caminho em streaming, contando as bordas da observação
+    gaps = find_gaps(iter(beats), timedelta(minutes=3),
+                     start=base - timedelta(minutes=10),
+                     end=base + timedelta(hours=2))
+    assert [g.duration for g in gaps] == [timedelta(minutes=10),
+                                          timedelta(minutes=11),
+                                          timedelta(minutes=61)]
+
+    array = np.array(beats[::-1], dtype="datetime64[us]")
+    assert len(find_gaps(array, timedelta(seconds=90))) == 2
+    assert find_gaps(iter([]), timedelta(minutes=1), start=base,
+                     end=base + timedelta(hours=1))[0].days == 0
+
+    with pytest.raises(ValueError):
+        find_gaps(iter(beats[::-1]), timedelta(minutes=3))
+
+
+def test_find_gaps_events_outside_window():
+    """Testa que eventos fora da janela [start, end] são ignorados"""
+    base = datetime(2024, 2, 25)
+    events = [base, base + timedelta(minutes=30), base + timedelta(hours=1),
+              base + timedelta(hours=3), base + timedelta(hours=6)]
+    window = {"start": base + timedelta(minutes=50),
+              "end": base + timedelta(hours=4)}
+    expected = [
+        TimePeriod(start=base + timedelta(hours=1),
+                   end=base + timedelta(hours=3)),
+        TimePeriod(start=base + timedelta(hours=3),
+                   end=base + timedelta(hours=4)),
+    ]
+    assert find_gaps(events, timedelta(minutes=45), **window) == expected
+    assert find_gaps(iter(events), timedelta(minutes=45), **window) == \
+        expected
+
+
+def test_utilization():
+    """Testa a linha do tempo de ocupação de vários períodos"""
+    base = datetime(2024, 2, 25)
+    periods = [
+        TimePeriod(start=base + timedelta(hours=9),
+                   end=base + timedelta(hours=10)),
+        TimePeriod(start=base + timedelta(hours=10),
+                   end=base + timedelta(hours=11, minutes=30)),
+        TimePeriod(start=base + timedelta(hours=9, minutes=30),
+                   end=base + timedelta(hours=12)),
+    ]
+    result = utilization(periods, timedelta(hours=1))
+    assert result["start"][0] == np.datetime64("2024-02-25T09:00")
+    assert result["peak"].tolist() == [2, 2, 2]
+    assert result["average"].tolist() == [1.5, 2.0, 1.5]
+    assert (result["covered"] == np.timedelta64(1, "h")).all()
+
+    # Intervalos vazios e arrays de início/fim
+    starts = np.array(["2024-02-25T00:00", "2024-02-25T03:30"],
+                      dtype="datetime64[us]")
+    ends = starts + np.timedelta64(30, "m")
+    result = utilization((starts, ends), timedelta(hours=1),
+                         end=base + timedelta(hours=5))
+    assert result["covered"].astype(int).tolist() == [
+        1_800_000_000, 0, 0, 1_800_000_000, 0
+    ]
+    assert result["peak"].tolist() == [1, 0, 0, 1, 0]
+    assert len(utilization([], timedelta(hours=1))["start"]) == 0
+
+
+def test_join_periods():
+    """Testa a junção de dois conjuntos de períodos sobrepostos"""
+    base = datetime(2024, 2, 25)
+    shifts = [
+        TimePeriod(start=base, end=base + timedelta(hours=8)),
+        TimePeriod(start=base + timedelta(hours=8),
+                   end=base + timedelta(hours=16)),
+    ]
+    incidents = [
+        TimePeriod(start=base + timedelta(hours=7),
+                   end=base + timedelta(hours=9)),
+        TimePeriod(start=base + timedelta(hours=20),
+                   end=base + timedelta(hours=21)),
+        TimePeriod(start=base + timedelta(hours=16),
+                   end=base + timedelta(hours=17)),
+    ]
+    pairs = join_periods(shifts, incidents)
+    assert not isinstance(pairs, list)
+    assert sorted(pairs) == [
+        (0, 0, timedelta(hours=1)),
+        (1, 0, timedelta(hours=1)),
+        (1, 2, timedelta(0)),
+    ]
+
+    # Mesmo resultado do teste par a par com TimePeriod.overlaps
+    expected = sorted(
+        (i, j) for i, shift in enumerate(shifts)
+        for j, incident in enumerate(incidents) if shift.overlaps(incident)
+    )
+    assert sorted((i, j) for i, j, _ in join_periods(shifts, incidents)) \
+        == expected
+    assert list(join_periods([], incidents)) == []
+
+
 def test_format_relative():
     """Testa a formatação relativa"""
     now = datetime.now()
@@ -202,6 +449,47 @@ def test_format_iso():
     assert result == "2024-02-25T14:30:00"
 
 
+def test_format_many():
+    """Testa a formatação em lote contra strftime e isoformat"""
+    values = [datetime(2024, 2, 25, 14, 30),
+              datetime(2024, 2, 25, 14, 30, 0, 5),
+              date(2024, 3, 1), datetime(999, 1, 2), None]
+    fmt = "%d/%m/%Y %H:%M:%S.%f (%j) %%"
+    expected = [value.strftime(fmt) for value in values[:4]] + [""]
+    assert format_many(values, fmt) == expected
+    assert format_many(values) == [
+        format_iso(value) for value in values[:4]
+    ] + [""]
+    assert format_many(values, "%d %b") == [
+        value.strftime("%d %b") for value in values[:4]
+    ] + [""]
+
+    epochs = np.array(["2024-02-25T14:30:00", "NaT"], dtype="datetime64[us]")
+    assert format_many(epochs, "%Y-%m-%d %H:%M") == ["2024-02-25 14:30", ""]
+    assert format_many(epochs.astype(np.int64)[:1]) == ["2024-02-25T14:30:00"]
+
+    buffer = io.BytesIO()
+    assert format_many(values[:2], "%Y-%m-%d", out=buffer) == 2
+    assert buffer.getvalue() == b"2024-02-25\n2024-02-25\n"
+    text = io.StringIO()
+    format_many(values[:1], out=text)
+    assert text.getvalue() == "2024-02-25T14:30:00\n"
+
+
+def test_format_seasonality():
+    """Testa os rótulos localizados da análise de sazonalidade"""
+    seasonality = analyze_seasonality([datetime(2024, 2, 25, 14, 30)])
+    result = format_seasonality(seasonality)
+    assert result["monthly"]["fevereiro"] == 1
+    assert result["weekly"]["domingo"] == 1
+    assert result["daily"]["14:00"] == 1
+    assert result["weekday_hour"]["domingo"]["14:00"] == 1
+
+    result = format_seasonality(seasonality, locale_str="en_US")
+    assert result["monthly"]["February"] == 1
+    assert format_seasonality({}) == {}
+
+
 def test_timezone_functions():
     """Testa as funções de fuso horário"""
     # Testa informações do fuso horário
@@ -222,4 +510,22 @@ def test_timezone_functions():
     
     # Testa abreviação do fuso horário
     abbreviation = get_timezone_abbreviation("America/Sao_Paulo")
-    assert abbreviation is not None 
\ No newline at end of file
+    assert abbreviation is not None
+
+
+def test_local_epochs():
+    """Testa a conversão vetorizada de timestamps UTC para horário local"""
+    utc = [datetime(2025, 3, 30, 0, 30), datetime(2025, 3, 30, 1, 30)]
+    epochs = np.array(utc, dtype="datetime64[us]").astype(np.int64)
+
+    # O horário de verão de Londres começa às 01:00 UTC de 30/03/2025
+    local = to_local_epochs(epochs, "Europe/London")
+    assert (local - epochs).tolist() == [0, 3_600_000_000]
+
+    result = epochs_to_datetimes(epochs, "Europe/London")
+    assert [d.hour for d in result] == [0, 2]
+    assert [d.tzname() for d in result] == ["GMT", "BST"]
+    assert result[1] == convert_timezone(utc[1], "UTC", "Europe/London")
+
+    with pytest.raises(ValueError):
+        to_local_epochs(epochs, "Mars/Olympus_Mons")